@@ -5,6 +5,7 @@ Rule-based agents that respond to events and trigger actions
 
 import logging
 from datetime import datetime, timedelta
+from sqlalchemy import Float, case, func, select
 from sqlalchemy.orm import Session
 from backend.core.event_bus import Event, EventType
 from backend.models.risk import RiskLog
@@ -63,14 +64,7 @@ class AttendanceRiskAgent:
                 )
 
                 if not existing_risk:
-                    risk_log = RiskLog(
-                        student_id=student_id,
-                        risk_type="Attendance",
-                        severity="High" if attendance_ratio < 0.6 else "Medium",
-                        description=f"Low attendance detected. Current: {attendance_ratio*100:.1f}% (Threshold: {AttendanceRiskAgent.ATTENDANCE_THRESHOLD*100:.1f}%)",
-                        action_taken="Flagged for monitoring",
-                    )
-                    db.add(risk_log)
+                    db.add(AttendanceRiskAgent._risk_log(student_id, attendance_ratio))
                     db.commit()
                     logger.info(
                         f"Risk log created for student {student_id} - Attendance: {attendance_ratio*100:.1f}%"
@@ -78,6 +72,67 @@ class AttendanceRiskAgent:
         except Exception as e:
             logger.error(f"Error in AttendanceRiskAgent: {e}")
 
+    @staticmethod
+    def handle_attendance_bulk_marked(event: Event, db: Session):
+        """
+        Handle a class roster submitted in one batch
+        Logic: same threshold as handle_attendance_marked, evaluated for every
+        student in one grouped query and committed once
+        """
+        try:
+            student_ids = set(event.data.get("student_ids", []))
+            if not student_ids:
+                return
+
+            cutoff_date = datetime.utcnow() - timedelta(days=AttendanceRiskAgent.LOOKBACK_DAYS)
+            ratios = db.execute(
+                select(
+                    Attendance.student_id,
+                    func.sum(case((Attendance.status == "Present", 1), else_=0))
+                    / func.count(Attendance.id).cast(Float),
+                )
+                .where(Attendance.student_id.in_(list(student_ids)), Attendance.date >= cutoff_date)
+                .group_by(Attendance.student_id)
+            ).all()
+            at_risk = {
+                student_id: ratio
+                for student_id, ratio in ratios
+                if ratio < AttendanceRiskAgent.ATTENDANCE_THRESHOLD
+            }
+            if not at_risk:
+                return
+
+            already_flagged = set(
+                db.scalars(
+                    select(RiskLog.student_id).where(
+                        RiskLog.student_id.in_(list(at_risk)),
+                        RiskLog.risk_type == "Attendance",
+                        RiskLog.resolved == 0,
+                    )
+                )
+            )
+            new_logs = [
+                AttendanceRiskAgent._risk_log(student_id, ratio)
+                for student_id, ratio in at_risk.items()
+                if student_id not in already_flagged
+            ]
+            if new_logs:
+                db.add_all(new_logs)
+                db.commit()
+                logger.info(f"Risk logs created for {len(new_logs)} students from bulk attendance")
+        except Exception as e:
+            logger.error(f"Error in AttendanceRiskAgent (bulk): {e}")
+
+    @staticmethod
+    def _risk_log(student_id: int, attendance_ratio: float) -> RiskLog:
+        return RiskLog(
+            student_id=student_id,
+            risk_type="Attendance",
+            severity="High" if attendance_ratio < 0.6 else "Medium",
+            description=f"Low attendance detected. Current: {attendance_ratio*100:.1f}% (Threshold: {AttendanceRiskAgent.ATTENDANCE_THRESHOLD*100:.1f}%)",
+            action_taken="Flagged for monitoring",
+        )
+
 
 class ComplaintTriageAgent:
     """
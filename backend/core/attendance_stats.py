@@ -0,0 +1,288 @@
+"""
+Subject Attendance Statistics
+Attended/held counters behind the student QR dashboard
+
+A session counts once it is closed (inactive, expired or past qr_expires_at)
+and not cancelled. Counting it adds one to its cohort's `held` row
+(branch, semester, section, subject) and one `attended` to each student who
+has a record in it, then stamps stats_finalized_at. Reopening a counted
+session (regenerate, reactivate, cancel) subtracts the same amounts and clears
+the stamp, so the next close counts it again with any new records. Dashboards
+read O(subjects) counter rows instead of counting sessions and records.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.core.rosters import ABSENT_STATUS
+from backend.database import dialect_insert
+from backend.models.qr_attendance import (
+    QRAttendanceRecord,
+    QRAttendanceSession,
+    QRStudentSubjectStats,
+    QRSubjectSessionsHeld,
+)
+
+logger = get_logger("attendance_stats")
+
+
+def counted_session_condition(now: datetime):
+    """SQL condition for sessions that count toward held/attended"""
+    session = QRAttendanceSession
+    return and_(
+        session.is_cancelled.is_(False),
+        or_(
+            session.is_active.is_(False),
+            session.is_expired.is_(True),
+            session.qr_expires_at < now,
+        ),
+    )
+
+
+def bump_sessions_held(conn, session, delta: int):
+    """Add delta to the session's cohort/subject held counter"""
+    table = QRSubjectSessionsHeld.__table__
+    stmt = dialect_insert(conn, table).values(
+        branch=session.branch,
+        semester=session.semester,
+        section=session.section or "",
+        subject_code=session.subject_code,
+        subject_name=session.subject_name,
+        held=delta,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["branch", "semester", "section", "subject_code"],
+        set_={"held": table.c.held + stmt.excluded.held},
+    )
+    conn.execute(stmt)
+
+
+def bump_student_stats(conn, session, attendees: Sequence, delta: int):
+    """Add delta attended (and late) for each (student_id, is_late_entry) in attendees"""
+    if not attendees:
+        return
+    table = QRStudentSubjectStats.__table__
+    stmt = dialect_insert(conn, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["student_id", "subject_code"],
+        set_={
+            "attended": table.c.attended + stmt.excluded.attended,
+            "late": table.c.late + stmt.excluded.late,
+        },
+    )
+    conn.execute(
+        stmt,
+        [
+            {
+                "student_id": student_id,
+                "subject_code": session.subject_code,
+                "subject_name": session.subject_name,
+                "attended": delta,
+                "late": delta if is_late else 0,
+            }
+            for student_id, is_late in attendees
+        ],
+    )
+
+
+def _attendees(conn, session_pk: int) -> List:
+    return conn.execute(
+        select(QRAttendanceRecord.student_id, QRAttendanceRecord.is_late_entry).where(
+            QRAttendanceRecord.session_id == session_pk,
+            QRAttendanceRecord.attendance_status != ABSENT_STATUS,
+        )
+    ).all()
+
+
+def finalize_session_stats(conn, session_pk: int, now: datetime) -> bool:
+    """Count a closed session once; False if it is open, cancelled or already counted"""
+    session = QRAttendanceSession
+    stamped = conn.execute(
+        update(session)
+        .where(
+            session.id == session_pk,
+            session.stats_finalized_at.is_(None),
+            counted_session_condition(now),
+        )
+        .values(stats_finalized_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not stamped:
+        return False
+
+    row = conn.execute(
+        select(
+            session.branch,
+            session.semester,
+            session.section,
+            session.subject_code,
+            session.subject_name,
+        ).where(session.id == session_pk)
+    ).one()
+    bump_sessions_held(conn, row, 1)
+    bump_student_stats(conn, row, _attendees(conn, session_pk), 1)
+    return True
+
+
+def reopen_session_stats(conn, session) -> bool:
+    """
+    Take a counted session back out of the counters
+    The caller clears session.stats_finalized_at in the same transaction
+    """
+    if session.stats_finalized_at is None:
+        return False
+    bump_sessions_held(conn, session, -1)
+    bump_student_stats(conn, session, _attendees(conn, session.id), -1)
+    return True
+
+
+def rebuild_attendance_stats(db) -> Dict[str, int]:
+    """
+    Recompute both counter tables from sessions and records and re-stamp sessions
+    Works on a Session or Connection; the caller commits
+    """
+    now = datetime.now(timezone.utc)
+    session, record = QRAttendanceSession, QRAttendanceRecord
+    counted = counted_session_condition(now)
+
+    section = func.coalesce(session.section, "")
+    held_rows = db.execute(
+        select(
+            session.branch,
+            session.semester,
+            section,
+            session.subject_code,
+            func.max(session.subject_name),
+            func.count(session.id),
+        )
+        .where(counted)
+        .group_by(session.branch, session.semester, section, session.subject_code)
+    ).all()
+    student_rows = db.execute(
+        select(
+            record.student_id,
+            session.subject_code,
+            func.max(session.subject_name),
+            func.count(record.id),
+            func.sum(case((record.is_late_entry.is_(True), 1), else_=0)),
+        )
+        .join(session, record.session_id == session.id)
+        .where(counted, record.attendance_status != ABSENT_STATUS)
+        .group_by(record.student_id, session.subject_code)
+    ).all()
+
+    db.execute(delete(QRSubjectSessionsHeld))
+    db.execute(delete(QRStudentSubjectStats))
+    if held_rows:
+        db.execute(
+            insert(QRSubjectSessionsHeld),
+            [
+                {
+                    "branch": branch,
+                    "semester": semester,
+                    "section": section_name,
+                    "subject_code": subject_code,
+                    "subject_name": subject_name,
+                    "held": held,
+                }
+                for branch, semester, section_name, subject_code, subject_name, held in held_rows
+            ],
+        )
+    if student_rows:
+        db.execute(
+            insert(QRStudentSubjectStats),
+            [
+                {
+                    "student_id": student_id,
+                    "subject_code": subject_code,
+                    "subject_name": subject_name,
+                    "attended": attended,
+                    "late": late or 0,
+                }
+                for student_id, subject_code, subject_name, attended, late in student_rows
+            ],
+        )
+
+    db.execute(
+        update(session)
+        .values(stats_finalized_at=case((counted, now), else_=None))
+        .execution_options(synchronize_session=False)
+    )
+    return {
+        "sessions_counted": sum(row[-1] for row in held_rows),
+        "cohort_subjects": len(held_rows),
+        "student_subjects": len(student_rows),
+    }
+
+
+class SessionStatsFinalizer:
+    """Scheduled job that counts newly closed sessions into the subject counters"""
+
+    def __init__(self, batch_size: int = 200, bind=None):
+        self.batch_size = batch_size
+        self._bind = bind
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.sessions_finalized = 0
+        self.failures = 0
+
+    @property
+    def bind(self):
+        if self._bind is None:
+            from backend.database import engine
+
+            return engine
+        return self._bind
+
+    def run(self) -> int:
+        """Finalize one batch of closed sessions; returns how many were counted"""
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            now = datetime.now(timezone.utc)
+            session = QRAttendanceSession
+            with self.bind.connect() as conn:
+                session_pks = list(
+                    conn.execute(
+                        select(session.id)
+                        .where(session.stats_finalized_at.is_(None), counted_session_condition(now))
+                        .order_by(session.id)
+                        .limit(self.batch_size)
+                    ).scalars()
+                )
+
+            finalized = 0
+            for session_pk in session_pks:
+                try:
+                    with self.bind.begin() as conn:
+                        finalized += finalize_session_stats(conn, session_pk, now)
+                except Exception as e:
+                    self.failures += 1
+                    logger.log_error("session_stats_finalize_failed", e, session_id=session_pk)
+
+            self.runs += 1
+            self.sessions_finalized += finalized
+            return finalized
+        finally:
+            self._lock.release()
+
+    async def run_async(self) -> int:
+        return await run_in_threadpool(self.run)
+
+    def metrics(self) -> dict:
+        return {
+            "runs": self.runs,
+            "sessions_finalized": self.sessions_finalized,
+            "failures": self.failures,
+        }
+
+
+# Global subject attendance counter maintenance
+session_stats = SessionStatsFinalizer(batch_size=settings.STATS_FINALIZE_BATCH)
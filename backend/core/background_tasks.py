@@ -285,12 +285,14 @@ class ScheduledTask:
     async def execute(self):
         """Execute the task"""
         try:
-            logger.log_event("scheduled_task_started", level="INFO", task_name=self.name)
+            # Flush and heartbeat jobs run every second or two: runs that did no
+            # work (falsy result) are logged at DEBUG only
+            logger.log_event("scheduled_task_started", level="DEBUG", task_name=self.name)
 
             if asyncio.iscoroutinefunction(self.func):
-                await self.func()
+                result = await self.func()
             else:
-                self.func()
+                result = self.func()
 
             self.last_run = datetime.utcnow()
             self.next_run = datetime.utcnow() + timedelta(seconds=self.interval)
@@ -298,9 +300,10 @@ class ScheduledTask:
 
             logger.log_event(
                 "scheduled_task_completed",
-                level="INFO",
+                level="INFO" if result else "DEBUG",
                 task_name=self.name,
                 run_count=self.run_count,
+                result=result,
             )
 
         except Exception as e:
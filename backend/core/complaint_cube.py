@@ -0,0 +1,116 @@
+"""
+Complaint Heatmap Cube
+Answers heatmap queries from the pre-aggregated (date, hour, category) cube
+"""
+
+from collections import Counter
+from datetime import date
+from typing import Any, Dict, List
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from backend.models.complaint import Complaint, ComplaintHeatmapCell
+
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TOP_TIMES_LIMIT = 5
+
+
+class ComplaintHeatmap:
+    """Day-of-week x hour grid plus category totals for a date window"""
+
+    def __init__(self, grid: np.ndarray, category_counts: Dict[str, int]):
+        self.grid = grid  # shape (7, 24), rows Monday..Sunday
+        self.category_counts = category_counts
+
+    @property
+    def total(self) -> int:
+        return int(self.grid.sum())
+
+    def cells(self) -> List[Dict[str, Any]]:
+        """Flatten the grid into heatmap cells with intensity relative to the busiest cell"""
+        max_count = int(self.grid.max()) or 1
+        intensity = np.round(self.grid / max_count, 2)
+        return [
+            {
+                "day_of_week": DAYS_OF_WEEK[day],
+                "hour": hour,
+                "count": int(self.grid[day, hour]),
+                "intensity": float(intensity[day, hour]),
+            }
+            for day in range(7)
+            for hour in range(24)
+        ]
+
+    def top_times(self, limit: int = TOP_TIMES_LIMIT) -> List[Dict[str, Any]]:
+        """Busiest (day, hour) slots, ties broken by day then hour"""
+        flat = self.grid.ravel()
+        order = np.argsort(-flat, kind="stable")[:limit]
+        return [
+            {"time": f"{DAYS_OF_WEEK[i // 24]} {i % 24}:00", "count": int(flat[i])}
+            for i in order
+            if flat[i] > 0
+        ]
+
+    def top_categories(self) -> Dict[str, int]:
+        return dict(sorted(self.category_counts.items(), key=lambda x: x[1], reverse=True))
+
+
+def load_heatmap(db: Session, since: date) -> ComplaintHeatmap:
+    """Sum cube cells from `since` (inclusive) into a 7x24 grid"""
+    rows = db.execute(
+        select(
+            ComplaintHeatmapCell.day_of_week,
+            ComplaintHeatmapCell.hour,
+            ComplaintHeatmapCell.category,
+            func.sum(ComplaintHeatmapCell.count),
+        )
+        .where(ComplaintHeatmapCell.bucket_date >= since)
+        .group_by(
+            ComplaintHeatmapCell.day_of_week,
+            ComplaintHeatmapCell.hour,
+            ComplaintHeatmapCell.category,
+        )
+    ).all()
+
+    grid = np.zeros((7, 24), dtype=np.int64)
+    category_counts: Dict[str, int] = Counter()
+    if rows:
+        days, hours, categories, counts = zip(*rows)
+        np.add.at(grid, (np.array(days), np.array(hours)), np.array(counts, dtype=np.int64))
+        for category, count in zip(categories, counts):
+            category_counts[category] += int(count)
+
+    return ComplaintHeatmap(grid, {k: v for k, v in category_counts.items() if v > 0})
+
+
+def rebuild_complaint_cube(db: Session, batch_size: int = 5000) -> int:
+    """
+    Recompute the cube from the complaints table; returns the number of cells written
+    Works on a Session or Connection; the caller commits
+    """
+    cells: Counter = Counter()
+    rows = db.execute(
+        select(Complaint.created_at, Complaint.category).execution_options(yield_per=batch_size)
+    )
+    for created_at, category in rows:
+        if created_at is not None:
+            cells[(created_at.date(), created_at.hour, category)] += 1
+
+    db.execute(delete(ComplaintHeatmapCell))
+    if cells:
+        db.execute(
+            insert(ComplaintHeatmapCell),
+            [
+                {
+                    "bucket_date": bucket_date,
+                    "day_of_week": bucket_date.weekday(),
+                    "hour": hour,
+                    "category": category,
+                    "count": count,
+                }
+                for (bucket_date, hour, category), count in cells.items()
+            ],
+        )
+    return len(cells)
@@ -35,6 +35,22 @@ class Settings(BaseSettings):
     DB_ECHO: bool = Field(default=False, env="DB_ECHO")
     DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
     DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: int = Field(default=30, env="DB_POOL_TIMEOUT")  # seconds
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")  # seconds
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=30000, env="DB_STATEMENT_TIMEOUT_MS")
+
+    # Read replicas (comma-separated URLs; empty = all reads go to the primary)
+    DATABASE_REPLICA_URLS: str = Field(default="", env="DATABASE_REPLICA_URLS")
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=10.0, env="REPLICA_MAX_LAG_SECONDS")
+    REPLICA_LAG_CHECK_INTERVAL: int = Field(default=5, env="REPLICA_LAG_CHECK_INTERVAL")
+    REPLICA_HEARTBEAT_INTERVAL: int = Field(default=2, env="REPLICA_HEARTBEAT_INTERVAL")
+
+    # SQLite tuning (applied on every new connection)
+    SQLITE_JOURNAL_MODE: str = Field(default="WAL", env="SQLITE_JOURNAL_MODE")
+    SQLITE_SYNCHRONOUS: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    SQLITE_MMAP_SIZE: int = Field(default=268435456, env="SQLITE_MMAP_SIZE")  # bytes
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
 
     # Authentication
     SECRET_KEY: str = Field(default="your-secret-key-change-in-production", env="SECRET_KEY")
@@ -57,6 +73,7 @@ class Settings(BaseSettings):
     # Caching (Redis)
     REDIS_URL: Optional[str] = Field(default=None, env="REDIS_URL")
     CACHE_TTL: int = Field(default=300, env="CACHE_TTL")  # seconds
+    DASHBOARD_CACHE_TTL: int = Field(default=60, env="DASHBOARD_CACHE_TTL")  # seconds
 
     # Background jobs
     CELERY_BROKER_URL: Optional[str] = Field(default=None, env="CELERY_BROKER_URL")
@@ -84,6 +101,45 @@ class Settings(BaseSettings):
     MAX_POOL_SIZE: int = Field(default=10, env="MAX_POOL_SIZE")
     WORKER_THREADS: int = Field(default=4, env="WORKER_THREADS")
     REQUEST_TIMEOUT: int = Field(default=30, env="REQUEST_TIMEOUT")
+    EXPORT_BATCH_SIZE: int = Field(default=2000, env="EXPORT_BATCH_SIZE")  # rows per chunk
+
+    # QR scan audit log write-behind buffer
+    SCAN_LOG_BUFFER_CAPACITY: int = Field(default=10000, env="SCAN_LOG_BUFFER_CAPACITY")
+    SCAN_LOG_FLUSH_SIZE: int = Field(default=200, env="SCAN_LOG_FLUSH_SIZE")
+    SCAN_LOG_FLUSH_INTERVAL: int = Field(default=1, env="SCAN_LOG_FLUSH_INTERVAL")  # seconds
+
+    # QR session snapshots for the scan path (process-local tier + shared cache layer)
+    QR_SESSION_LOCAL_TTL: int = Field(default=5, env="QR_SESSION_LOCAL_TTL")  # seconds
+    QR_SESSION_LOCAL_MAX_ENTRIES: int = Field(default=1000, env="QR_SESSION_LOCAL_MAX_ENTRIES")
+    QR_SESSION_CACHE_TTL: int = Field(default=300, env="QR_SESSION_CACHE_TTL")  # seconds
+    # How often buffered present/late counts are written to the session rows
+    SESSION_COUNTER_FLUSH_INTERVAL: int = Field(default=1, env="SESSION_COUNTER_FLUSH_INTERVAL")
+    # Sessions whose marked students are remembered in memory for duplicate-scan rejection
+    SCAN_DEDUP_MAX_SESSIONS: int = Field(default=1000, env="SCAN_DEDUP_MAX_SESSIONS")
+    # Device ownership cache and batched device usage statistics
+    DEVICE_CACHE_TTL: int = Field(default=60, env="DEVICE_CACHE_TTL")  # seconds
+    DEVICE_CACHE_MAX_ENTRIES: int = Field(default=50000, env="DEVICE_CACHE_MAX_ENTRIES")
+    DEVICE_STATS_FLUSH_INTERVAL: int = Field(default=5, env="DEVICE_STATS_FLUSH_INTERVAL")
+    # Live attendance feed (SSE / WebSocket)
+    LIVE_FEED_QUEUE_SIZE: int = Field(default=100, env="LIVE_FEED_QUEUE_SIZE")  # per subscriber
+    LIVE_FEED_KEEPALIVE: int = Field(default=15, env="LIVE_FEED_KEEPALIVE")  # seconds
+    # Rotating QR tokens (HMAC over session + time step, validated by recomputation)
+    QR_TOKEN_STEP_SECONDS: int = Field(default=15, env="QR_TOKEN_STEP_SECONDS")
+    QR_TOKEN_SKEW_STEPS: int = Field(default=1, env="QR_TOKEN_SKEW_STEPS")
+    # Set True to also accept the static session hash (shared screenshots of it stay valid)
+    QR_ACCEPT_STATIC_HASH: bool = Field(default=False, env="QR_ACCEPT_STATIC_HASH")
+    # Proxy-pattern analysis of closed sessions (same IP + grid cell + time window)
+    PROXY_GRID_METERS: float = Field(default=3.0, env="PROXY_GRID_METERS")
+    PROXY_TIME_WINDOW_SECONDS: int = Field(default=15, env="PROXY_TIME_WINDOW_SECONDS")
+    PROXY_MIN_CLUSTER: int = Field(default=3, env="PROXY_MIN_CLUSTER")  # distinct students
+    PROXY_ANALYSIS_INTERVAL: int = Field(default=60, env="PROXY_ANALYSIS_INTERVAL")  # seconds
+    PROXY_ANALYSIS_BATCH: int = Field(default=50, env="PROXY_ANALYSIS_BATCH")  # sessions per run
+    # Attended/held subject counters, updated as QR sessions close
+    STATS_FINALIZE_INTERVAL: int = Field(default=60, env="STATS_FINALIZE_INTERVAL")  # seconds
+    STATS_FINALIZE_BATCH: int = Field(default=200, env="STATS_FINALIZE_BATCH")  # sessions per run
+    # Bulk expiry of active sessions past qr_expires_at
+    SESSION_SWEEP_INTERVAL: int = Field(default=30, env="SESSION_SWEEP_INTERVAL")  # seconds
+    SESSION_SWEEP_BATCH: int = Field(default=500, env="SESSION_SWEEP_BATCH")  # sessions per run
 
     # Monitoring
     ENABLE_METRICS: bool = Field(default=True, env="ENABLE_METRICS")
@@ -115,6 +171,11 @@ class Settings(BaseSettings):
             return ["*"]
         return [h.strip() for h in self.ALLOWED_HEADERS.split(",")]
 
+    @property
+    def REPLICA_URLS(self) -> list:
+        """Get read replica URLs as list"""
+        return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
     @property
     def is_production(self) -> bool:
         """Check if running in production"""
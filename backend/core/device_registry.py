@@ -0,0 +1,201 @@
+"""
+Device Registry
+Cached device ownership for scan verification with batched usage statistics
+
+Verification needs only who owns a device and whether it is blocked; those are
+cached per process for DEVICE_CACHE_TTL seconds, so a returning device costs
+no query. Per-scan statistics (total_scans, last_used, student_name) are summed
+in memory and written by a scheduled executemany UPDATE instead of touching the
+device row inside every scan transaction. Blocking a device outside this
+process takes effect once its cache entry expires (or after invalidate()).
+
+Registration of a first-time device is not done here: the scan route inserts
+it in the scan transaction, so a device is bound to a student only by a scan
+that marks attendance. A failed scan rolls the registration back.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, select, update
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.qr_attendance import DeviceFingerprint
+
+logger = get_logger("device_registry")
+
+
+class DeviceEntry:
+    """Ownership and block status of one registered device"""
+
+    __slots__ = ("device_id", "student_id", "is_blocked", "block_reason")
+
+    def __init__(self, device_id: str, student_id: str, is_blocked: bool, block_reason: str):
+        self.device_id = device_id
+        self.student_id = student_id
+        self.is_blocked = bool(is_blocked)
+        self.block_reason = block_reason
+
+
+class DeviceRegistry:
+    """TTL/LRU cache of DeviceEntry plus a write-behind buffer of usage stats"""
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 50000, bind=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._bind = bind
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._usage: Dict[str, list] = {}  # device_id -> [scans, last_used, student_name]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+        self.devices_updated = 0
+        self.flush_failures = 0
+
+    @property
+    def bind(self):
+        if self._bind is None:
+            from backend.database import engine
+
+            return engine
+        return self._bind
+
+    def _cached(self, device_id: str) -> Optional[DeviceEntry]:
+        with self._lock:
+            item = self._entries.get(device_id)
+            if item is None:
+                return None
+            if time.monotonic() >= item[0]:
+                del self._entries[device_id]
+                return None
+            self._entries.move_to_end(device_id)
+            return item[1]
+
+    def remember(self, entry: DeviceEntry):
+        with self._lock:
+            self._entries[entry.device_id] = (time.monotonic() + self.ttl, entry)
+            self._entries.move_to_end(entry.device_id)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, device_id: str):
+        with self._lock:
+            self._entries.pop(device_id, None)
+
+    async def lookup(self, db, device_id: str, use_cache: bool = True) -> Optional[DeviceEntry]:
+        """Cached entry, or one column-only SELECT; None for unregistered devices"""
+        if use_cache:
+            entry = self._cached(device_id)
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+        self.misses += 1
+        row = (
+            await db.execute(
+                select(
+                    DeviceFingerprint.device_id,
+                    DeviceFingerprint.student_id,
+                    DeviceFingerprint.is_blocked,
+                    DeviceFingerprint.block_reason,
+                ).where(DeviceFingerprint.device_id == device_id)
+            )
+        ).first()
+        if row is None:
+            return None
+        entry = DeviceEntry(*row)
+        self.remember(entry)
+        return entry
+
+    def record_use(self, device_id: str, student_name: str, used_at: Optional[datetime] = None):
+        """Queue one scan's worth of usage statistics for the device"""
+        used_at = used_at or datetime.utcnow()
+        with self._lock:
+            usage = self._usage.get(device_id)
+            if usage is None:
+                self._usage[device_id] = [1, used_at, student_name]
+            else:
+                usage[0] += 1
+                usage[1] = max(usage[1], used_at)
+                usage[2] = student_name
+
+    def _merge_back(self, usage: Dict[str, list]):
+        with self._lock:
+            for device_id, (scans, used_at, student_name) in usage.items():
+                current = self._usage.get(device_id)
+                if current is None:
+                    self._usage[device_id] = [scans, used_at, student_name]
+                else:
+                    current[0] += scans
+                    current[1] = max(current[1], used_at)
+
+    def flush(self) -> int:
+        """Write queued usage statistics in one executemany UPDATE; returns devices updated"""
+        with self._flush_lock:
+            with self._lock:
+                usage, self._usage = self._usage, {}
+            if not usage:
+                return 0
+
+            table = DeviceFingerprint.__table__
+            stmt = (
+                update(table)
+                .where(table.c.device_id == bindparam("b_device_id"))
+                .values(
+                    total_scans=table.c.total_scans + bindparam("b_scans"),
+                    last_used=bindparam("b_last_used"),
+                    student_name=bindparam("b_student_name"),
+                )
+            )
+            params = [
+                {
+                    "b_device_id": device_id,
+                    "b_scans": scans,
+                    "b_last_used": used_at,
+                    "b_student_name": student_name,
+                }
+                for device_id, (scans, used_at, student_name) in usage.items()
+            ]
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(stmt, params)
+            except Exception as e:
+                self.flush_failures += 1
+                self._merge_back(usage)
+                logger.log_error("device_stats_flush_failed", e, devices=len(usage))
+                return 0
+
+            self.flushes += 1
+            self.devices_updated += len(usage)
+            return len(usage)
+
+    async def flush_async(self) -> int:
+        return await run_in_threadpool(self.flush)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached_devices": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "pending_devices": len(self._usage),
+            "flushes": self.flushes,
+            "devices_updated": self.devices_updated,
+            "flush_failures": self.flush_failures,
+        }
+
+
+# Global device registry for the scan path
+device_registry = DeviceRegistry(
+    ttl=settings.DEVICE_CACHE_TTL, max_entries=settings.DEVICE_CACHE_MAX_ENTRIES
+)
@@ -14,9 +14,11 @@ class EventType(str, Enum):
     """Enumeration of all possible events"""
 
     ATTENDANCE_MARKED = "attendance.marked"
+    ATTENDANCE_BULK_MARKED = "attendance.bulk_marked"
     COMPLAINT_FILED = "complaint.filed"
     SCHEDULE_UPDATED = "schedule.updated"
     COMPLAINT_UPDATED = "complaint.updated"
+    QR_SESSION_CLOSED = "qr_session.closed"
 
 
 class Event:
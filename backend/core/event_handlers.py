@@ -29,6 +29,17 @@ def register_agents(db: Session = None):
             if not db:
                 session.close()
 
+    def attendance_bulk_handler(event: Event):
+        """Wrapper to pass db to agent"""
+        from backend.database import SessionLocal
+
+        session = db or SessionLocal()
+        try:
+            AttendanceRiskAgent.handle_attendance_bulk_marked(event, session)
+        finally:
+            if not db:
+                session.close()
+
     def complaint_handler(event: Event):
         """Wrapper to pass db to agent"""
         from backend.database import SessionLocal
@@ -53,6 +64,7 @@ def register_agents(db: Session = None):
 
     # Subscribe agents to their respective events
     event_bus.subscribe(EventType.ATTENDANCE_MARKED, attendance_handler)
+    event_bus.subscribe(EventType.ATTENDANCE_BULK_MARKED, attendance_bulk_handler)
     event_bus.subscribe(EventType.COMPLAINT_FILED, complaint_handler)
     event_bus.subscribe(EventType.SCHEDULE_UPDATED, schedule_handler)
 
@@ -0,0 +1,156 @@
+"""
+Live Attendance Feed
+In-process pub/sub of QR session updates for SSE / WebSocket subscribers
+
+Scans publish small messages (the newly marked student plus counter deltas)
+per session_id. Each subscriber gets a bounded queue; a slow consumer loses its
+oldest messages rather than holding memory or blocking the scan path. With
+REDIS_URL configured every message is also published to Redis and workers
+re-deliver messages from other workers to their own subscribers.
+"""
+
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+
+logger = get_logger("live_feed")
+
+CHANNEL_PREFIX = "qr_live:"
+
+
+class LiveFeedHub:
+    """Per-session fan-out to subscriber queues, bridged across workers via Redis"""
+
+    def __init__(self, queue_size: int = 100, redis_url: Optional[str] = None):
+        self.queue_size = queue_size
+        self.redis_url = redis_url
+        self.worker_id = uuid.uuid4().hex
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self._pending_publishes: Set[asyncio.Task] = set()
+
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.remote_received = 0
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[session_id].add(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[session_id]
+
+    def _deliver(self, session_id: str, message: Dict[str, Any]):
+        for queue in self._subscribers.get(session_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+            self.delivered += 1
+
+    def publish(self, session_id: str, event: str, data: Dict[str, Any]):
+        """Send one event to this worker's subscribers now and to other workers via Redis"""
+        message = {"event": event, "data": data}
+        self.published += 1
+        self._deliver(session_id, message)
+
+        if self._redis is not None:
+            payload = json.dumps(
+                {"origin": self.worker_id, "session_id": session_id, "message": message},
+                default=str,
+            )
+            task = asyncio.get_running_loop().create_task(
+                self._publish_remote(CHANNEL_PREFIX + session_id, payload)
+            )
+            self._pending_publishes.add(task)
+            task.add_done_callback(self._pending_publishes.discard)
+
+    async def _publish_remote(self, channel: str, payload: str):
+        try:
+            await self._redis.publish(channel, payload)
+        except Exception as e:
+            logger.log_error("live_feed_publish_failed", e, channel=channel)
+
+    def _handle_remote(self, raw: str):
+        payload = json.loads(raw)
+        if payload["origin"] == self.worker_id:
+            return  # already delivered locally by publish()
+        self.remote_received += 1
+        self._deliver(payload["session_id"], payload["message"])
+
+    async def _listen(self):
+        """Re-deliver messages published by other workers"""
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+                async for item in pubsub.listen():
+                    if item["type"] == "pmessage":
+                        self._handle_remote(item["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.log_error("live_feed_listener_failed", e)
+                await asyncio.sleep(1)
+
+    async def start(self):
+        """Connect the Redis bridge (no-op without REDIS_URL)"""
+        if not self.redis_url or self._redis is not None:
+            return
+        try:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(self.redis_url, decode_responses=True)
+            await self._redis.ping()
+        except Exception as e:
+            self._redis = None
+            logger.log_error("live_feed_redis_unavailable", e)
+            return
+        self._listener = asyncio.create_task(self._listen())
+        logger.log_event("live_feed_redis_connected", level="INFO", worker_id=self.worker_id)
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def metrics(self) -> dict:
+        return {
+            "sessions": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "redis_bridge": self._redis is not None,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "remote_received": self.remote_received,
+        }
+
+
+def _redis_url() -> Optional[str]:
+    # Same "redis://" placeholder rule as the cache layer
+    if settings.REDIS_URL and settings.REDIS_URL != "redis://":
+        return settings.REDIS_URL
+    return None
+
+
+# Global live attendance feed
+live_feed = LiveFeedHub(queue_size=settings.LIVE_FEED_QUEUE_SIZE, redis_url=_redis_url())
@@ -0,0 +1,197 @@
+"""
+Keyset (Cursor) Pagination
+Pages list endpoints by seeking past the last row's (sort keys..., id) instead of OFFSET
+
+Cursors are opaque url-safe base64 tokens. Response bodies stay plain lists;
+the cursor for the next page is returned in the X-Next-Cursor header (absent on
+the last page) and, when requested, the row count in X-Total-Count.
+
+`skip` is still accepted for clients written against the old OFFSET listings:
+it pages by OFFSET from the start of the listing and the response carries an
+X-Next-Cursor like any other page. Listings are capped at `limit` rows
+(DEFAULT_PAGE_SIZE unless given) either way.
+
+Nullable sort keys rank NULL above every value (NULLS LAST ascending, NULLS
+FIRST descending, PostgreSQL's native order) on every dialect, and the seek
+predicate handles NULL cursor values explicitly so no row is skipped.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import and_, false, func, literal, or_, select, text
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class CursorParams:
+    """Query parameters shared by every cursor-paginated endpoint"""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        count: Optional[str] = Query(
+            None, pattern="^(exact|estimate)$", description="Return X-Total-Count"
+        ),
+        skip: Optional[int] = Query(
+            None, ge=0, deprecated=True, description="OFFSET paging; use cursor instead"
+        ),
+    ):
+        if cursor and skip:
+            raise HTTPException(status_code=400, detail="Pass either cursor or skip, not both")
+        self.cursor = cursor
+        self.limit = limit
+        self.count = count
+        self.skip = skip
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, width: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != width:
+            raise ValueError("cursor does not match this listing")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {str(e)}")
+
+
+def _nullable(key) -> bool:
+    return bool(key.nullable) and not key.primary_key
+
+
+def _after(key, value, descending: bool):
+    """Rows whose `key` comes strictly after `value` (NULL ranks highest)"""
+    if value is not None:
+        # Bound as the column's type: Boolean keys reject comparisons with a raw True/False
+        value = literal(value, key.type)
+    if not _nullable(key):
+        return key < value if descending else key > value
+    if value is None:
+        return key.isnot(None) if descending else false()
+    return key < value if descending else or_(key > value, key.is_(None))
+
+
+def _tie(key, value):
+    return key.is_(None) if value is None else key == value
+
+
+def _seek(keys: Sequence, values: Sequence, descending: bool):
+    """(k1, k2, ..., id) strictly after `values` in the page order"""
+    clauses = []
+    for i, key in enumerate(keys):
+        tie = [_tie(keys[j], values[j]) for j in range(i)]
+        clauses.append(and_(*tie, _after(key, values[i], descending)))
+    return or_(*clauses)
+
+
+def _order_by(key, descending: bool):
+    if not _nullable(key):
+        return key.desc() if descending else key
+    return key.desc().nulls_first() if descending else key.asc().nulls_last()
+
+
+def _page_stmt(stmt, keys: Sequence, params: CursorParams, descending: bool):
+    if params.cursor:
+        stmt = stmt.where(_seek(keys, decode_cursor(params.cursor, len(keys)), descending))
+    elif params.skip:
+        stmt = stmt.offset(params.skip)
+    return stmt.order_by(*[_order_by(key, descending) for key in keys]).limit(params.limit + 1)
+
+
+def _count_stmt(stmt):
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def _estimate_sql(bind, stmt) -> Optional[str]:
+    """EXPLAIN-based row estimate (PostgreSQL only)"""
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = stmt.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    return f"EXPLAIN (FORMAT JSON) {compiled}"
+
+
+def _finish(rows: list, keys: Sequence, params: CursorParams, response: Response) -> list:
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, key.key) for key in keys]
+        )
+    return rows
+
+
+def _set_total(response: Response, total: int, estimated: bool):
+    response.headers[TOTAL_COUNT_HEADER] = str(int(total))
+    if estimated:
+        response.headers[TOTAL_ESTIMATED_HEADER] = "true"
+
+
+def paginate(
+    db, stmt, keys: Sequence, params: CursorParams, response: Response, descending: bool = False
+) -> list:
+    """
+    Run one page of a select(Model) statement on a sync Session
+
+    `keys` are model columns ending with the primary key, e.g.
+    (Event.event_start_date, Event.id); the same column order should be indexed.
+    """
+    rows = db.scalars(_page_stmt(stmt, keys, params, descending)).all()
+
+    if params.count:
+        sql = _estimate_sql(db.get_bind(), stmt) if params.count == "estimate" else None
+        if sql:
+            plan = db.execute(text(sql)).scalar()
+            _set_total(response, plan[0]["Plan"]["Plan Rows"], estimated=True)
+        else:
+            _set_total(response, db.scalar(_count_stmt(stmt)), estimated=False)
+
+    return _finish(list(rows), keys, params, response)
+
+
+async def paginate_async(
+    db, stmt, keys: Sequence, params: CursorParams, response: Response, descending: bool = False
+) -> list:
+    """AsyncSession variant of paginate()"""
+    rows = (await db.scalars(_page_stmt(stmt, keys, params, descending))).all()
+
+    if params.count:
+        sql = _estimate_sql(db.bind, stmt) if params.count == "estimate" else None
+        if sql:
+            plan = (await db.execute(text(sql))).scalar()
+            _set_total(response, plan[0]["Plan"]["Plan Rows"], estimated=True)
+        else:
+            _set_total(response, await db.scalar(_count_stmt(stmt)), estimated=False)
+
+    return _finish(list(rows), keys, params, response)
@@ -0,0 +1,246 @@
+"""
+Proxy Detection
+Background analysis of closed QR sessions for proxy-attendance patterns
+
+One phone marking attendance for several students leaves a tell-tale cluster:
+near-identical coordinates, the same IP address and scans seconds apart. Each
+record is hashed into a (ip, x cell, y cell, time bucket) grid key, so a record
+is only compared with records in the neighbouring cells rather than with every
+other record in the session. Clusters with at least PROXY_MIN_CLUSTER distinct
+students get is_proxy_suspected set in one bulk UPDATE. Sessions are analyzed
+once after they close and stamped with proxy_analyzed_at; regenerating a
+session's QR clears the stamp so new scans are analyzed too.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import product
+from math import floor
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, select, update
+
+from backend.core.config import settings
+from backend.core.geo import EARTH_RADIUS_M
+from backend.core.logging import get_logger
+from backend.models.qr_attendance import QRAttendanceRecord, QRAttendanceSession
+
+logger = get_logger("proxy_detection")
+
+NEIGHBOUR_OFFSETS = list(product((-1, 0, 1), repeat=3))
+
+
+def find_proxy_clusters(
+    rows: Sequence,
+    grid_meters: float,
+    window_seconds: float,
+    min_cluster: int,
+) -> List[List[int]]:
+    """
+    Record ids grouped into suspected proxy clusters
+
+    `rows` carry id, student_id, ip_address, student_latitude, student_longitude
+    and marked_at. Records are linked when they share an IP and lie within
+    grid_meters and window_seconds of each other; linked groups spanning at least
+    min_cluster students are returned.
+    """
+    rows = [r for r in rows if r.ip_address and r.marked_at is not None]
+    if len(rows) < min_cluster:
+        return []
+
+    lat0 = np.radians(rows[0].student_latitude)
+    lats = np.radians([r.student_latitude for r in rows])
+    lons = np.radians([r.student_longitude for r in rows])
+    # Local planar coordinates in meters (equirectangular around the first record)
+    xs = EARTH_RADIUS_M * (lons - lons[0]) * np.cos(lat0)
+    ys = EARTH_RADIUS_M * (lats - lat0)
+    base = rows[0].marked_at
+    ts = np.array([(r.marked_at - base).total_seconds() for r in rows])
+
+    cells: Dict[Tuple, List[int]] = defaultdict(list)
+    keys = []
+    for i, row in enumerate(rows):
+        key = (
+            row.ip_address,
+            floor(xs[i] / grid_meters),
+            floor(ys[i] / grid_meters),
+            floor(ts[i] / window_seconds),
+        )
+        keys.append(key)
+        cells[key].append(i)
+
+    parent = list(range(len(rows)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    limit = grid_meters * grid_meters
+    for i, (ip, cx, cy, ct) in enumerate(keys):
+        for dx, dy, dt in NEIGHBOUR_OFFSETS:
+            for j in cells.get((ip, cx + dx, cy + dy, ct + dt), ()):
+                if j <= i or root(i) == root(j):
+                    continue
+                close = (xs[i] - xs[j]) ** 2 + (ys[i] - ys[j]) ** 2 <= limit
+                if close and abs(ts[i] - ts[j]) <= window_seconds:
+                    parent[root(j)] = root(i)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(rows)):
+        groups[root(i)].append(i)
+
+    return [
+        [rows[i].id for i in members]
+        for members in groups.values()
+        if len({rows[i].student_id for i in members}) >= min_cluster
+    ]
+
+
+class ProxyDetector:
+    """Runs find_proxy_clusters over closed, not yet analyzed sessions"""
+
+    def __init__(
+        self,
+        grid_meters: float = 3.0,
+        window_seconds: float = 15.0,
+        min_cluster: int = 3,
+        batch_size: int = 50,
+        bind=None,
+    ):
+        self.grid_meters = grid_meters
+        self.window_seconds = window_seconds
+        self.min_cluster = min_cluster
+        self.batch_size = batch_size
+        self._bind = bind
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.sessions_analyzed = 0
+        self.clusters_found = 0
+        self.records_flagged = 0
+        self.failures = 0
+
+    @property
+    def bind(self):
+        if self._bind is None:
+            from backend.database import engine
+
+            return engine
+        return self._bind
+
+    def pending_sessions(self, conn, now: datetime) -> List[int]:
+        """Ids of closed sessions that have not been analyzed yet"""
+        session = QRAttendanceSession
+        return list(
+            conn.execute(
+                select(session.id)
+                .where(
+                    session.proxy_analyzed_at.is_(None),
+                    or_(
+                        session.is_active.is_(False),
+                        session.is_expired.is_(True),
+                        session.is_cancelled.is_(True),
+                        session.qr_expires_at < now,
+                    ),
+                )
+                .order_by(session.id)
+                .limit(self.batch_size)
+            ).scalars()
+        )
+
+    def analyze_session(self, conn, session_pk: int) -> int:
+        """Flag the session's clustered records; returns how many were flagged"""
+        record = QRAttendanceRecord
+        rows = conn.execute(
+            select(
+                record.id,
+                record.student_id,
+                record.ip_address,
+                record.student_latitude,
+                record.student_longitude,
+                record.marked_at,
+            )
+            .where(record.session_id == session_pk)
+            .order_by(record.marked_at, record.id)
+        ).all()
+
+        clusters = find_proxy_clusters(
+            rows, self.grid_meters, self.window_seconds, self.min_cluster
+        )
+        flagged = [record_id for cluster in clusters for record_id in cluster]
+        if flagged:
+            conn.execute(
+                update(record)
+                .where(record.id.in_(flagged))
+                .values(is_proxy_suspected=True)
+                .execution_options(synchronize_session=False)
+            )
+            logger.log_event(
+                "proxy_clusters_detected",
+                level="WARNING",
+                session_id=session_pk,
+                clusters=len(clusters),
+                records=len(flagged),
+            )
+
+        conn.execute(
+            update(QRAttendanceSession)
+            .where(QRAttendanceSession.id == session_pk)
+            .values(proxy_analyzed_at=datetime.now(timezone.utc))
+        )
+        self.clusters_found += len(clusters)
+        return len(flagged)
+
+    def run(self) -> int:
+        """Analyze one batch of closed sessions; returns records flagged"""
+        if not self._lock.acquire(blocking=False):
+            return 0  # previous run still in progress
+        try:
+            with self.bind.connect() as conn:
+                session_pks = self.pending_sessions(conn, datetime.now(timezone.utc))
+
+            flagged = 0
+            for session_pk in session_pks:
+                try:
+                    with self.bind.begin() as conn:
+                        flagged += self.analyze_session(conn, session_pk)
+                except Exception as e:
+                    self.failures += 1
+                    logger.log_error("proxy_analysis_failed", e, session_id=session_pk)
+                    continue
+                self.sessions_analyzed += 1
+
+            self.runs += 1
+            self.records_flagged += flagged
+            return flagged
+        finally:
+            self._lock.release()
+
+    async def run_async(self) -> int:
+        return await run_in_threadpool(self.run)
+
+    def metrics(self) -> dict:
+        return {
+            "grid_meters": self.grid_meters,
+            "window_seconds": self.window_seconds,
+            "min_cluster": self.min_cluster,
+            "runs": self.runs,
+            "sessions_analyzed": self.sessions_analyzed,
+            "clusters_found": self.clusters_found,
+            "records_flagged": self.records_flagged,
+            "failures": self.failures,
+        }
+
+
+# Global proxy-pattern detector
+proxy_detector = ProxyDetector(
+    grid_meters=settings.PROXY_GRID_METERS,
+    window_seconds=settings.PROXY_TIME_WINDOW_SECONDS,
+    min_cluster=settings.PROXY_MIN_CLUSTER,
+    batch_size=settings.PROXY_ANALYSIS_BATCH,
+)
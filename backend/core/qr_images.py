@@ -0,0 +1,112 @@
+"""
+QR Code Images
+Renders session QR codes once per qr_code_hash and serves them until expiry
+
+A session's QR content only changes when it is regenerated, which also changes
+qr_code_hash, so (hash, format) identifies an image and doubles as its ETag.
+Rendering is CPU-bound pure Python and runs in the threadpool; SVG output
+skips Pillow entirely.
+"""
+
+import base64
+import io
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import qrcode
+import qrcode.image.svg
+from fastapi.concurrency import run_in_threadpool
+
+
+def render_qr_image(data: str, fmt: str = "png") -> bytes:
+    """Encode `data` as a QR code image (PNG via Pillow, or Pillow-free SVG)"""
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def image_etag(qr_code_hash: str, fmt: str) -> str:
+    return f'"{qr_code_hash[:32]}-{fmt}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, list and * forms)"""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    tags = [t[2:] if t.startswith("W/") else t for t in tags]
+    return "*" in tags or etag in tags
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class QRImageCache:
+    """Base64 images keyed by (qr_code_hash, format), dropped once the QR expires"""
+
+    def __init__(self, max_entries: int = 500):
+        self.max_entries = max_entries
+        self._images: Dict[Tuple[str, str], Tuple[datetime, str]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.renders = 0
+
+    def _purge_expired(self, now: datetime):
+        for key in [k for k, (expires_at, _) in self._images.items() if expires_at <= now]:
+            del self._images[key]
+
+    def get(self, qr_code_hash: str, fmt: str) -> Optional[str]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._images.get((qr_code_hash, fmt))
+            if entry is None or entry[0] <= now:
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, qr_code_hash: str, fmt: str, expires_at: datetime, image_base64: str):
+        now, expires_at = datetime.now(timezone.utc), _as_utc(expires_at)
+        if expires_at <= now:
+            return
+        with self._lock:
+            self._purge_expired(now)
+            if len(self._images) >= self.max_entries:
+                # Soonest-expiring images are the least useful to keep
+                del self._images[min(self._images, key=lambda k: self._images[k][0])]
+            self._images[(qr_code_hash, fmt)] = (expires_at, image_base64)
+
+    async def get_or_render(
+        self, qr_code_hash: str, qr_code_data: str, fmt: str, expires_at: datetime
+    ) -> str:
+        """Base64 image for the session QR, rendering it in the threadpool on a miss"""
+        image_base64 = self.get(qr_code_hash, fmt)
+        if image_base64 is not None:
+            return image_base64
+
+        image = await run_in_threadpool(render_qr_image, qr_code_data, fmt)
+        image_base64 = base64.b64encode(image).decode()
+        self.renders += 1
+        self.put(qr_code_hash, fmt, expires_at, image_base64)
+        return image_base64
+
+    def metrics(self) -> dict:
+        return {
+            "cached_images": len(self._images),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "renders": self.renders,
+        }
+
+
+# Global rendered-QR cache
+qr_image_cache = QRImageCache()
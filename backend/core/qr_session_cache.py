@@ -0,0 +1,212 @@
+"""
+QR Session Cache
+Keeps the fields a scan validates against so hot sessions are not re-SELECTed per scan
+
+Snapshots live in two tiers: a small process-local dict with a short TTL, and the
+shared cache layer (Redis when configured, only used when ENABLE_CACHING is on)
+so every worker benefits from one load. Regenerate/update/cancel invalidate both
+tiers for the session; other workers can keep serving their local copy for up to
+QR_SESSION_LOCAL_TTL seconds. Expiry needs no invalidation because qr_expires_at
+is part of the snapshot and re-checked on every scan. The local tier keeps at
+most QR_SESSION_LOCAL_MAX_ENTRIES sessions, evicting the least recently used.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from backend.core.caching import cache_manager
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.qr_attendance import QRAttendanceSession
+
+logger = get_logger("qr_session_cache")
+
+CACHE_KEY_PREFIX = "qr_session"
+
+SNAPSHOT_FIELDS = (
+    "id",
+    "session_id",
+    "qr_code_hash",
+    "qr_expires_at",
+    "is_active",
+    "is_expired",
+    "is_cancelled",
+    "center_latitude",
+    "center_longitude",
+    "geo_fence_radius_meters",
+    "lecture_start_time",
+    "require_device_verification",
+    "subject_name",
+    "faculty_name",
+    "lecture_date",
+)
+DATETIME_FIELDS = ("qr_expires_at", "lecture_start_time", "lecture_date")
+
+
+class CachedQRSession:
+    """Read-only copy of the QRAttendanceSession columns used by scan validation"""
+
+    def __init__(self, **values):
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, values[field])
+
+    # Same validation rules as the model, evaluated against the snapshot
+    is_qr_valid = QRAttendanceSession.is_qr_valid
+    calculate_distance = QRAttendanceSession.calculate_distance
+    is_within_geofence = QRAttendanceSession.is_within_geofence
+    check_geofence = QRAttendanceSession.check_geofence
+
+    @classmethod
+    def from_row(cls, row) -> "CachedQRSession":
+        return cls(**{field: getattr(row, field) for field in SNAPSHOT_FIELDS})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe form for the shared cache"""
+        data = {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+        for field in DATETIME_FIELDS:
+            data[field] = data[field].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedQRSession":
+        values = dict(data)
+        for field in DATETIME_FIELDS:
+            values[field] = datetime.fromisoformat(values[field])
+        return cls(**values)
+
+
+class QRSessionCache:
+    """Two-tier session_id -> CachedQRSession cache"""
+
+    def __init__(self, local_ttl: float = 5.0, shared_ttl: int = 300, max_entries: int = 1000):
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self.max_entries = max_entries
+        self._local: "OrderedDict[str, Tuple[float, CachedQRSession]]" = OrderedDict()
+        # Bumped by invalidate() only while loads of the session are in flight
+        self._generations: Dict[str, int] = {}
+        self._loading: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _key(self, session_id: str) -> str:
+        return cache_manager.generate_key(CACHE_KEY_PREFIX, session_id)
+
+    def _get_local(self, session_id: str) -> Optional[CachedQRSession]:
+        with self._lock:
+            entry = self._local.get(session_id)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                del self._local[session_id]
+                return None
+            self._local.move_to_end(session_id)
+            return entry[1]
+
+    def _put_local(self, snapshot: CachedQRSession, generation: int):
+        with self._lock:
+            # Skip if invalidated while this snapshot was being loaded
+            if self._generations.get(snapshot.session_id, 0) != generation:
+                return
+            self._local[snapshot.session_id] = (time.monotonic() + self.local_ttl, snapshot)
+            self._local.move_to_end(snapshot.session_id)
+            if len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _generation(self, session_id: str) -> int:
+        with self._lock:
+            return self._generations.get(session_id, 0)
+
+    def _begin_load(self, session_id: str) -> int:
+        with self._lock:
+            self._loading[session_id] = self._loading.get(session_id, 0) + 1
+            return self._generations.get(session_id, 0)
+
+    def _end_load(self, session_id: str):
+        with self._lock:
+            self._loading[session_id] -= 1
+            if not self._loading[session_id]:
+                # No load is left to compare against the generation
+                del self._loading[session_id]
+                self._generations.pop(session_id, None)
+
+    async def get(self, db, session_id: str) -> Optional[CachedQRSession]:
+        """Snapshot for session_id, loading it with a column-only SELECT on a miss"""
+        snapshot = self._get_local(session_id)
+        if snapshot is not None:
+            self.local_hits += 1
+            return snapshot
+
+        generation = self._begin_load(session_id)
+        try:
+            return await self._load(db, session_id, generation)
+        finally:
+            self._end_load(session_id)
+
+    async def _load(self, db, session_id: str, generation: int) -> Optional[CachedQRSession]:
+        cached = await cache_manager.get(self._key(session_id))
+        if cached is not None:
+            self.shared_hits += 1
+            snapshot = CachedQRSession.from_dict(cached)
+            self._put_local(snapshot, generation)
+            return snapshot
+
+        self.misses += 1
+        columns = [getattr(QRAttendanceSession, field) for field in SNAPSHOT_FIELDS]
+        row = (
+            await db.execute(select(*columns).where(QRAttendanceSession.session_id == session_id))
+        ).first()
+        if row is None:
+            return None
+
+        snapshot = CachedQRSession.from_row(row)
+        self._put_local(snapshot, generation)
+        if self._generation(session_id) == generation:
+            await cache_manager.set(self._key(session_id), snapshot.to_dict(), ttl=self.shared_ttl)
+        return snapshot
+
+    async def invalidate(self, session_id: str):
+        """Drop the session from both tiers (call after the change is committed)"""
+        with self._lock:
+            self._local.pop(session_id, None)
+            if session_id in self._loading:
+                self._generations[session_id] = self._generations.get(session_id, 0) + 1
+        self.invalidations += 1
+        await cache_manager.delete(self._key(session_id))
+        logger.log_event("qr_session_cache_invalidated", level="DEBUG", session_id=session_id)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._generations.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return {
+            "local_entries": len(self._local),
+            "max_entries": self.max_entries,
+            "local_ttl": self.local_ttl,
+            "shared_ttl": self.shared_ttl,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round((lookups - self.misses) / lookups, 3) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global QR session cache
+qr_session_cache = QRSessionCache(
+    local_ttl=settings.QR_SESSION_LOCAL_TTL,
+    shared_ttl=settings.QR_SESSION_CACHE_TTL,
+    max_entries=settings.QR_SESSION_LOCAL_MAX_ENTRIES,
+)
@@ -0,0 +1,90 @@
+"""
+Rotating QR Tokens
+TOTP-style codes derived from the session, so QR rotation needs no DB writes
+
+token = HMAC-SHA256(SECRET_KEY, "<session_id>:<qr_code_hash>:<time step>")
+
+The display asks for the current token every step; scans are checked by
+recomputing the tokens for the current step +/- the skew window and comparing
+in constant time. Including qr_code_hash means regenerating a session revokes
+every token issued for it. Tokens are 64 hex characters, the same shape as the
+static hash, so they travel in the existing qr_code_hash scan field.
+
+Displays fetch tokens with a per-session display key handed to the faculty
+member when the session is created. The key is never part of a QR payload, so
+a student who scans (or photographs) the QR cannot poll for future tokens.
+"""
+
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from backend.core.config import settings
+
+
+def time_step(at: Optional[float] = None, step_seconds: Optional[int] = None) -> int:
+    step_seconds = step_seconds or settings.QR_TOKEN_STEP_SECONDS
+    return int((time.time() if at is None else at) // step_seconds)
+
+
+def rotating_token(session_id: str, qr_code_hash: str, step: int) -> str:
+    message = f"{session_id}:{qr_code_hash}:{step}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def current_token(session, at: Optional[float] = None) -> Tuple[str, datetime]:
+    """Token for the current step and when that step ends"""
+    step_seconds = settings.QR_TOKEN_STEP_SECONDS
+    step = time_step(at, step_seconds)
+    valid_until = datetime.fromtimestamp((step + 1) * step_seconds, tz=timezone.utc)
+    return rotating_token(session.session_id, session.qr_code_hash, step), valid_until
+
+
+def token_qr_data(session, token: str, valid_until: datetime) -> str:
+    """QR payload for a rotating token (same keys as the static qr_code_data)"""
+    payload = {
+        "session_id": session.session_id,
+        "hash": token,
+        "rotating": True,
+        "expires": valid_until.isoformat().replace("+00:00", "Z"),
+    }
+    return json.dumps(payload)
+
+
+def display_key(session_id: str) -> str:
+    """Secret a classroom display sends to fetch rotating tokens for a session"""
+    message = f"display:{session_id}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify_display_key(session_id: str, key: Optional[str]) -> bool:
+    return bool(key) and _same_code(display_key(session_id), key)
+
+
+def _same_code(expected: str, code: str) -> bool:
+    # Bytes, not str: compare_digest raises TypeError on non-ASCII strings
+    return hmac.compare_digest(expected.encode(), code.encode())
+
+
+def verify_rotating_token(session, token: str, at: Optional[float] = None) -> bool:
+    """True if `token` belongs to a step within QR_TOKEN_SKEW_STEPS of now"""
+    step = time_step(at)
+    skew = settings.QR_TOKEN_SKEW_STEPS
+    valid = False
+    # Check every candidate step so timing does not reveal which one matched
+    for candidate in range(step - skew, step + skew + 1):
+        expected = rotating_token(session.session_id, session.qr_code_hash, candidate)
+        valid |= _same_code(expected, token)
+    return valid
+
+
+def verify_scan_code(session, code: str) -> bool:
+    """Accept a current rotating token, or the static hash when that is allowed"""
+    if not code:
+        return False
+    if settings.QR_ACCEPT_STATIC_HASH and _same_code(session.qr_code_hash, code):
+        return True
+    return verify_rotating_token(session, code)
@@ -0,0 +1,251 @@
+"""
+Read Replica Routing
+Sends read-only request dependencies to lag-checked replicas with primary fallback
+
+The primary writes a heartbeat row every REPLICA_HEARTBEAT_INTERVAL seconds.
+Each replica's copy of that row tells how far behind it is; replicas more than
+REPLICA_MAX_LAG_SECONDS behind (or unreachable) are skipped until they catch up.
+Measured lag includes up to one heartbeat interval, so keep the tolerance above it.
+
+Requests that must see their own writes send `X-Consistency: strong` and are
+served by the primary.
+"""
+
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.database import (
+    SessionLocal,
+    create_async_database_engine,
+    create_database_engine,
+    dialect_insert,
+    engine,
+    get_async_session_factory,
+    get_pool_metrics,
+    normalize_database_url,
+)
+from backend.models.replication import ReplicationHeartbeat
+
+logger = get_logger("read_replicas")
+
+CONSISTENCY_HEADER = "X-Consistency"
+READ_SOURCE_HEADER = "X-Read-Source"
+HEARTBEAT_ID = 1
+
+
+class Replica:
+    """One read replica with its engines and last lag measurement"""
+
+    def __init__(self, url: str):
+        self.url = normalize_database_url(url)
+        self.engine = create_database_engine(self.url)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self._async_engine = None
+        self._async_session_factory = None
+
+        self.lag_seconds: Optional[float] = None
+        self.healthy = False
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None  # time.monotonic()
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def async_session_factory(self) -> async_sessionmaker:
+        if self._async_session_factory is None:
+            self._async_engine = create_async_database_engine(self.url)
+            self._async_session_factory = async_sessionmaker(
+                self._async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        return self._async_session_factory
+
+    async def dispose(self):
+        self.engine.dispose()
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+
+    def status(self) -> dict:
+        return {
+            "url": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": round(self.lag_seconds, 3) if self.lag_seconds is not None else None,
+            "error": self.error,
+            "pool": get_pool_metrics(self.engine),
+        }
+
+
+class ReplicaRouter:
+    """Round-robins reads over replicas within the lag tolerance"""
+
+    def __init__(
+        self,
+        primary_engine,
+        replica_urls: List[str],
+        max_lag_seconds: float = 10.0,
+        check_interval: float = 5.0,
+    ):
+        self.primary_engine = primary_engine
+        self.replicas = [Replica(url) for url in replica_urls]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._round_robin = itertools.count()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def write_heartbeat(self):
+        """Stamp the primary's heartbeat row (scheduled job)"""
+        table = ReplicationHeartbeat.__table__
+        stmt = dialect_insert(self.primary_engine, table).values(
+            id=HEARTBEAT_ID, beat_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id"], set_={"beat_at": stmt.excluded.beat_at}
+        )
+        with self.primary_engine.begin() as conn:
+            conn.execute(stmt)
+
+    async def write_heartbeat_async(self):
+        await run_in_threadpool(self.write_heartbeat)
+
+    def check_lag(self, replica: Replica):
+        """Measure how far the replica's heartbeat trails the wall clock"""
+        try:
+            with replica.engine.connect() as conn:
+                beat_at = conn.execute(
+                    select(ReplicationHeartbeat.beat_at).where(
+                        ReplicationHeartbeat.id == HEARTBEAT_ID
+                    )
+                ).scalar()
+        except Exception as e:
+            replica.lag_seconds, replica.healthy, replica.error = None, False, str(e)
+            logger.log_event("replica_unreachable", level="WARNING", replica=replica.name)
+        else:
+            if beat_at is None:
+                replica.lag_seconds, replica.healthy = None, False
+                replica.error = "no heartbeat replicated yet"
+            else:
+                replica.lag_seconds = max(0.0, (datetime.utcnow() - beat_at).total_seconds())
+                replica.healthy = replica.lag_seconds <= self.max_lag_seconds
+                replica.error = None
+                if not replica.healthy:
+                    logger.log_event(
+                        "replica_lagging",
+                        level="WARNING",
+                        replica=replica.name,
+                        lag_seconds=round(replica.lag_seconds, 3),
+                    )
+        replica.checked_at = time.monotonic()
+
+    def needs_refresh(self) -> bool:
+        now = time.monotonic()
+        return any(
+            r.checked_at is None or now - r.checked_at >= self.check_interval
+            for r in self.replicas
+        )
+
+    def refresh(self, force: bool = False):
+        """Re-measure stale replicas; concurrent callers use the previous measurement"""
+        if not self._refresh_lock.acquire(blocking=force):
+            return
+        try:
+            now = time.monotonic()
+            for replica in self.replicas:
+                if force or replica.checked_at is None or (
+                    now - replica.checked_at >= self.check_interval
+                ):
+                    self.check_lag(replica)
+        finally:
+            self._refresh_lock.release()
+
+    def choose(self) -> Optional[Replica]:
+        """Next healthy replica, or None to read from the primary"""
+        candidates = [r for r in self.replicas if r.healthy]
+        if not candidates:
+            self.primary_fallbacks += 1
+            return None
+        self.replica_reads += 1
+        return candidates[next(self._round_robin) % len(candidates)]
+
+    def pick_replica(self) -> Optional[Replica]:
+        if not self.enabled:
+            return None
+        if self.needs_refresh():
+            self.refresh()
+        return self.choose()
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [r.status() for r in self.replicas],
+        }
+
+
+def wants_primary(request: Request) -> bool:
+    """Write-after-read consistency is opt-in per request"""
+    return request.headers.get(CONSISTENCY_HEADER, "").lower() == "strong"
+
+
+# Global replica router
+read_router = ReplicaRouter(
+    engine,
+    settings.REPLICA_URLS,
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL,
+)
+
+
+def get_read_db(request: Request, response: Response):
+    """Dependency for read-only sessions (replica when fresh enough, else primary)"""
+    replica = None if wants_primary(request) else read_router.pick_replica()
+    response.headers[READ_SOURCE_HEADER] = "replica" if replica else "primary"
+
+    db = (replica.session_factory if replica else SessionLocal)()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request, response: Response):
+    """AsyncSession variant of get_read_db"""
+    replica = None
+    if read_router.enabled and not wants_primary(request):
+        if read_router.needs_refresh():
+            await run_in_threadpool(read_router.refresh)
+        replica = read_router.choose()
+    response.headers[READ_SOURCE_HEADER] = "replica" if replica else "primary"
+
+    factory = replica.async_session_factory() if replica else get_async_session_factory()
+    async with factory() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
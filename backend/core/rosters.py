@@ -0,0 +1,159 @@
+"""
+Class Rosters
+Stored expected-student lists per branch, semester and section
+
+Rosters are loaded in bulk from CSV (one executemany upsert per chunk). Absent
+lists are a single NOT EXISTS anti-join of the session's roster against its
+attendance records, and closing a session materializes the absentees with one
+INSERT ... SELECT over the same anti-join, however many students are missing.
+A session without a section covers every section of its branch and semester.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, exists, false, func, literal, select, true
+
+from backend.database import dialect_insert
+from backend.models.qr_attendance import QRAttendanceRecord, QRClassRoster
+
+ABSENT_STATUS = "absent"
+REQUIRED_COLUMNS = ("roll_number", "student_name")
+UPSERT_CHUNK_SIZE = 1000
+
+
+def parse_roster_csv(text: str) -> Tuple[List[Dict[str, Optional[str]]], List[str]]:
+    """
+    Roster rows and per-line errors from CSV text
+    Columns: roll_number, student_name (required), student_id (defaults to the
+    roll number) and student_email; header names are case-insensitive
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    header = [(name or "").strip().lower() for name in reader.fieldnames or []]
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        return [], [f"Missing column(s): {', '.join(missing)}"]
+    reader.fieldnames = header
+
+    rows, errors, seen = [], [], set()
+    for line, raw in enumerate(reader, start=2):
+        values = {key: (value or "").strip() for key, value in raw.items() if key}
+        roll_number, student_name = values.get("roll_number"), values.get("student_name")
+        if not roll_number or not student_name:
+            errors.append(f"Line {line}: roll_number and student_name are required")
+            continue
+        if roll_number in seen:
+            errors.append(f"Line {line}: duplicate roll_number {roll_number}")
+            continue
+        seen.add(roll_number)
+        rows.append(
+            {
+                "roll_number": roll_number,
+                "student_id": values.get("student_id") or roll_number,
+                "student_name": student_name,
+                "student_email": values.get("student_email") or None,
+            }
+        )
+    return rows, errors
+
+
+def roster_delete_stmt(branch: str, semester: str, section: Optional[str]):
+    """Remove one roster (used to replace it wholesale)"""
+    return delete(QRClassRoster).where(
+        QRClassRoster.branch == branch,
+        QRClassRoster.semester == semester,
+        QRClassRoster.section == (section or ""),
+    )
+
+
+def roster_upsert(bind, branch: str, semester: str, section: Optional[str], rows: List[dict]):
+    """(statement, parameter chunks) that insert or update roster members"""
+    table = QRClassRoster.__table__
+    stmt = dialect_insert(bind, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["branch", "semester", "section", "roll_number"],
+        set_={
+            "student_id": stmt.excluded.student_id,
+            "student_name": stmt.excluded.student_name,
+            "student_email": stmt.excluded.student_email,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    now = datetime.utcnow()
+    params = [
+        dict(row, branch=branch, semester=semester, section=section or "", updated_at=now)
+        for row in rows
+    ]
+    chunks = [
+        params[start : start + UPSERT_CHUNK_SIZE]
+        for start in range(0, len(params), UPSERT_CHUNK_SIZE)
+    ]
+    return stmt, chunks
+
+
+def roster_condition(branch: str, semester: str, section: Optional[str]):
+    """Roster members expected at a session for this class"""
+    return and_(
+        QRClassRoster.branch == branch,
+        QRClassRoster.semester == str(semester),
+        (QRClassRoster.section == section) if section else true(),
+    )
+
+
+def roster_size_stmt(branch: str, semester: str, section: Optional[str]):
+    return select(func.count(QRClassRoster.id)).where(roster_condition(branch, semester, section))
+
+
+def _not_present(session):
+    record = QRAttendanceRecord
+    return ~exists().where(
+        record.session_id == session.id,
+        record.roll_number == QRClassRoster.roll_number,
+        record.attendance_status != ABSENT_STATUS,
+    )
+
+
+def absent_students_stmt(session):
+    """Roster members with no present/late record for the session (one anti-join)"""
+    return (
+        select(QRClassRoster)
+        .where(roster_condition(session.branch, session.semester, session.section))
+        .where(_not_present(session))
+        .order_by(QRClassRoster.roll_number)
+    )
+
+
+def materialize_absentees_stmt(bind, session, marked_at: datetime):
+    """INSERT ... SELECT writing an absent record for every missing roster member"""
+    record = QRAttendanceRecord
+    columns = {
+        "session_id": literal(session.id),
+        "student_id": QRClassRoster.student_id,
+        "roll_number": QRClassRoster.roll_number,
+        "student_name": QRClassRoster.student_name,
+        "student_email": QRClassRoster.student_email,
+        "branch": QRClassRoster.branch,
+        "semester": QRClassRoster.semester,
+        "section": QRClassRoster.section,
+        "marked_at": literal(marked_at, record.marked_at.type),
+        "attendance_status": literal(ABSENT_STATUS),
+        "is_late_entry": false(),
+        "late_by_minutes": literal(0),
+        # Location columns are required; absentees are pinned to the class center
+        "student_latitude": literal(session.center_latitude),
+        "student_longitude": literal(session.center_longitude),
+        "distance_from_center": literal(0.0),
+        "is_within_geofence": false(),
+    }
+    source = (
+        select(*columns.values())
+        .where(roster_condition(session.branch, session.semester, session.section))
+        .where(_not_present(session))
+    )
+    return (
+        dialect_insert(bind, record.__table__)
+        .from_select(list(columns), source)
+        .on_conflict_do_nothing(index_elements=["session_id", "student_id"])
+    )
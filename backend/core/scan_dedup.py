@@ -0,0 +1,89 @@
+"""
+Duplicate Scan Detection
+Per-session sets of students whose scan is in flight or already marked
+
+Repeated taps from the same student are rejected here without touching the
+database. The sets are per process and bounded to the most recently used
+sessions; the unique (session_id, student_id) index on QRAttendanceRecord is
+the authority across workers and restarts, and conflicts it reports are fed
+back into the set. A rejected claim is only reported as "already marked" when
+the student is in the marked set; while the first scan is still in flight it
+may yet fail, so the caller tells the student to retry instead.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Set, Tuple
+
+from backend.core.config import settings
+
+
+class ScanDeduplicator:
+    """Claims one scan per (session, student) until it is marked or released"""
+
+    def __init__(self, max_sessions: int = 1000):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[int, Tuple[Set[str], Set[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.claims = 0
+        self.rejected = 0
+
+    def _entry(self, session_id: int) -> Tuple[Set[str], Set[str]]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            entry = self._sessions[session_id] = (set(), set())
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return entry
+
+    def claim(self, session_id: int, student_id: str) -> bool:
+        """False if the student is already marked or has a scan in flight"""
+        with self._lock:
+            marked, inflight = self._entry(session_id)
+            if student_id in marked or student_id in inflight:
+                self.rejected += 1
+                return False
+            inflight.add(student_id)
+            self.claims += 1
+            return True
+
+    def is_marked(self, session_id: int, student_id: str) -> bool:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return entry is not None and student_id in entry[0]
+
+    def mark(self, session_id: int, student_id: str):
+        """Record that the student's attendance is stored"""
+        with self._lock:
+            marked, inflight = self._entry(session_id)
+            marked.add(student_id)
+            inflight.discard(student_id)
+
+    def release(self, session_id: int, student_id: str):
+        """End an in-flight claim (no-op once marked)"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                entry[1].discard(student_id)
+
+    def forget(self, session_id: int):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "marked": sum(len(marked) for marked, _ in self._sessions.values()),
+                "in_flight": sum(len(inflight) for _, inflight in self._sessions.values()),
+                "claims": self.claims,
+                "rejected": self.rejected,
+            }
+
+
+# Global duplicate-scan filter for the scan path
+scan_dedup = ScanDeduplicator(max_sessions=settings.SCAN_DEDUP_MAX_SESSIONS)
@@ -0,0 +1,136 @@
+"""
+QR Session Sweeper
+Scheduled bulk expiry of QR sessions whose codes have run out
+
+Each run takes up to SESSION_SWEEP_BATCH sessions that are still is_active
+past qr_expires_at (a range scan of ix_qr_attendance_sessions_active_expiry),
+marks them expired in one UPDATE and counts them into the subject attendance
+stats in the same transaction. Afterwards the worker drops their cached
+snapshots and duplicate-scan memory, tells live dashboards, and publishes
+QR_SESSION_CLOSED for downstream aggregation. Regenerating a QR reactivates
+a swept session as before.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import List
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+
+from backend.core.attendance_stats import finalize_session_stats
+from backend.core.config import settings
+from backend.core.event_bus import EventType
+from backend.core.event_handlers import publish_event
+from backend.core.live_feed import live_feed
+from backend.core.logging import get_logger
+from backend.core.qr_session_cache import qr_session_cache
+from backend.core.scan_dedup import scan_dedup
+from backend.models.qr_attendance import QRAttendanceSession
+
+logger = get_logger("session_sweeper")
+
+
+class SessionSweeper:
+    """Expires overdue active sessions in batches and announces them"""
+
+    def __init__(self, batch_size: int = 500, bind=None):
+        self.batch_size = batch_size
+        self._bind = bind
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.sessions_expired = 0
+        self.failures = 0
+
+    @property
+    def bind(self):
+        if self._bind is None:
+            from backend.database import engine
+
+            return engine
+        return self._bind
+
+    def sweep(self, now: datetime = None) -> List[dict]:
+        """Expire one batch of overdue sessions; returns what was closed"""
+        now = now or datetime.now(timezone.utc)
+        session = QRAttendanceSession
+        if not self._lock.acquire(blocking=False):
+            return []
+        try:
+            with self.bind.begin() as conn:
+                overdue = conn.execute(
+                    select(
+                        session.id,
+                        session.session_id,
+                        session.qr_expires_at,
+                        session.subject_code,
+                        session.branch,
+                        session.semester,
+                        session.section,
+                        session.total_students_present,
+                    )
+                    .where(session.is_active.is_(True), session.qr_expires_at <= now)
+                    .order_by(session.qr_expires_at)
+                    .limit(self.batch_size)
+                ).all()
+                if overdue:
+                    # Re-check the predicate: a regenerate may have extended a session since
+                    expired = set(
+                        conn.execute(
+                            update(session)
+                            .where(
+                                session.id.in_([row.id for row in overdue]),
+                                session.is_active.is_(True),
+                                session.qr_expires_at <= now,
+                            )
+                            .values(is_active=False, is_expired=True, closed_at=now)
+                            .returning(session.id)
+                            .execution_options(synchronize_session=False)
+                        ).scalars()
+                    )
+                    overdue = [row for row in overdue if row.id in expired]
+                    for row in overdue:
+                        finalize_session_stats(conn, row.id, now)
+        except Exception as e:
+            self.failures += 1
+            logger.log_error("session_sweep_failed", e)
+            return []
+        finally:
+            self._lock.release()
+
+        self.runs += 1
+        if overdue:
+            self.sessions_expired += len(overdue)
+            logger.log_event("qr_sessions_expired", level="INFO", sessions=len(overdue))
+        return [dict(row._mapping, closed_at=now) for row in overdue]
+
+    async def run_async(self) -> int:
+        """Scheduler entry point: sweep, then notify caches, dashboards and subscribers"""
+        closed = await run_in_threadpool(self.sweep)
+        for session in closed:
+            await qr_session_cache.invalidate(session["session_id"])
+            scan_dedup.forget(session["id"])
+            live_feed.publish(
+                session["session_id"],
+                "session_updated",
+                {
+                    "qr_expires_at": session["qr_expires_at"].isoformat(),
+                    "is_active": False,
+                    "is_cancelled": False,
+                },
+            )
+            publish_event(EventType.QR_SESSION_CLOSED, session)
+        return len(closed)
+
+    def metrics(self) -> dict:
+        return {
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "sessions_expired": self.sessions_expired,
+            "failures": self.failures,
+        }
+
+
+# Global QR session expiry sweeper
+session_sweeper = SessionSweeper(batch_size=settings.SESSION_SWEEP_BATCH)
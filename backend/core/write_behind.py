@@ -0,0 +1,298 @@
+"""
+Write-Behind Buffers
+Collects append-only rows in memory and writes them in bulk INSERTs
+
+Request handlers enqueue plain dicts and return immediately; rows reach the
+database when the buffer hits its flush size, on the scheduler interval, or at
+shutdown. Rows still buffered when the process dies are lost, so this is only
+for audit-style data where that trade-off is acceptable. If the buffer fills
+faster than it can be flushed the oldest rows are dropped and counted.
+
+CounterBuffer does the same for hot counter columns: increments are summed in
+memory per row and applied as `col = col + delta` UPDATEs, so concurrent
+requests never touch (or lock) the counted row themselves.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, insert, update
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.models.qr_attendance import QRAttendanceLog, QRAttendanceSession
+
+logger = get_logger("write_behind")
+
+
+class WriteBehindBuffer:
+    """Bounded in-process ring buffer flushed with executemany INSERTs"""
+
+    def __init__(
+        self,
+        model,
+        capacity: int = 10000,
+        flush_size: int = 200,
+        flush_interval: float = 1.0,
+        bind=None,
+    ):
+        self.model = model
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._bind = bind
+        self._rows: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_scheduled = False
+        # Strong references to size-triggered flushes (the loop only keeps weak ones)
+        self._pending_flushes: Set[asyncio.Task] = set()
+
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def bind(self):
+        if self._bind is None:
+            from backend.database import engine
+
+            return engine
+        return self._bind
+
+    @property
+    def depth(self) -> int:
+        return len(self._rows)
+
+    def enqueue(self, row: Dict[str, Any]):
+        """Buffer one row; schedules a flush once flush_size rows are waiting"""
+        with self._lock:
+            if len(self._rows) == self.capacity:
+                self.dropped += 1
+            self._rows.append(row)
+            self.enqueued += 1
+            should_flush = len(self._rows) >= self.flush_size and not self._flush_scheduled
+            if should_flush:
+                self._flush_scheduled = True
+
+        if should_flush:
+            try:
+                task = asyncio.get_running_loop().create_task(self.flush_async())
+            except RuntimeError:
+                # No event loop (scripts, sync callers): flush inline
+                self.flush()
+            else:
+                self._pending_flushes.add(task)
+                task.add_done_callback(self._pending_flushes.discard)
+
+    def _drain(self) -> list:
+        with self._lock:
+            rows = list(self._rows)
+            self._rows.clear()
+            self._flush_scheduled = False
+        return rows
+
+    def _requeue(self, rows: list):
+        """Put rows from a failed flush back in front of newer ones"""
+        with self._lock:
+            room = self.capacity - len(self._rows)
+            if len(rows) > room:
+                self.dropped += len(rows) - room
+                rows = rows[len(rows) - room :] if room else []
+            self._rows.extendleft(reversed(rows))
+
+    def flush(self) -> int:
+        """Write every buffered row in one transaction; returns the number written"""
+        with self._flush_lock:
+            rows = self._drain()
+            if not rows:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(insert(self.model), rows)
+            except Exception as e:
+                self.flush_failures += 1
+                self._requeue(rows)
+                logger.log_error(
+                    "write_behind_flush_failed", e, table=self.model.__tablename__, rows=len(rows)
+                )
+                return 0
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.flushes += 1
+            self.flushed += len(rows)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            return len(rows)
+
+    async def flush_async(self) -> int:
+        """flush() off the event loop (scheduler job and size-triggered flushes)"""
+        return await run_in_threadpool(self.flush)
+
+    def metrics(self) -> dict:
+        return {
+            "table": self.model.__tablename__,
+            "depth": self.depth,
+            "capacity": self.capacity,
+            "flush_size": self.flush_size,
+            "flush_interval": self.flush_interval,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0,
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
+
+
+class CounterBuffer:
+    """Per-row counter deltas applied with one executemany UPDATE per flush"""
+
+    def __init__(self, model, columns: Sequence[str], flush_interval: float = 1.0, bind=None):
+        self.model = model
+        self.columns = tuple(columns)
+        self.flush_interval = flush_interval
+        self._bind = bind
+        self._pending: Dict[int, Counter] = {}
+        self._inflight: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self.increments = 0
+        self.flushes = 0
+        self.rows_updated = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    bind = WriteBehindBuffer.bind
+
+    def add(self, row_id: int, **deltas: int):
+        """Add to one row's counters, e.g. add(5, total_students_present=1)"""
+        unknown = set(deltas) - set(self.columns)
+        if unknown:
+            raise ValueError(f"Not a buffered counter: {', '.join(sorted(unknown))}")
+        with self._lock:
+            self._pending.setdefault(row_id, Counter()).update(deltas)
+            self.increments += 1
+
+    def pending(self, row_id: int) -> Dict[str, int]:
+        """Deltas not yet visible in the table (queued or being written)"""
+        with self._lock:
+            total = Counter(self._inflight.get(row_id, {}))
+            total.update(self._pending.get(row_id, {}))
+        return {column: total[column] for column in self.columns}
+
+    def _merge_back(self, deltas: Dict[int, Counter]):
+        for row_id, counts in deltas.items():
+            self._pending.setdefault(row_id, Counter()).update(counts)
+
+    def flush(self) -> int:
+        """Apply every queued delta in one transaction; returns the number of rows updated"""
+        with self._flush_lock:
+            with self._lock:
+                self._inflight, self._pending = self._pending, {}
+                deltas = self._inflight
+            if not deltas:
+                return 0
+
+            table = self.model.__table__
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values({c: table.c[c] + bindparam(f"delta_{c}") for c in self.columns})
+            )
+            params = [
+                {"row_id": row_id, **{f"delta_{c}": counts[c] for c in self.columns}}
+                for row_id, counts in deltas.items()
+            ]
+
+            start = time.perf_counter()
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(stmt, params)
+            except Exception as e:
+                self.flush_failures += 1
+                logger.log_error(
+                    "counter_flush_failed", e, table=self.model.__tablename__, rows=len(deltas)
+                )
+                with self._lock:
+                    self._merge_back(deltas)
+                    self._inflight = {}
+                return 0
+
+            with self._lock:
+                self._inflight = {}
+            self.flushes += 1
+            self.rows_updated += len(deltas)
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            return len(deltas)
+
+    async def flush_async(self) -> int:
+        return await run_in_threadpool(self.flush)
+
+    def metrics(self) -> dict:
+        return {
+            "table": self.model.__tablename__,
+            "columns": list(self.columns),
+            "pending_rows": len(self._pending),
+            "flush_interval": self.flush_interval,
+            "increments": self.increments,
+            "flushes": self.flushes,
+            "rows_updated": self.rows_updated,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+        }
+
+
+# Global buffer for QR scan audit logs
+scan_log_buffer = WriteBehindBuffer(
+    QRAttendanceLog,
+    capacity=settings.SCAN_LOG_BUFFER_CAPACITY,
+    flush_size=settings.SCAN_LOG_FLUSH_SIZE,
+    flush_interval=settings.SCAN_LOG_FLUSH_INTERVAL,
+)
+
+
+def scan_log_row(
+    session_id: int,
+    student_id: str,
+    status: str,
+    reason: Optional[str],
+    location,
+    attempted_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """QRAttendanceLog column values for one scan attempt"""
+    attempted_at = attempted_at or datetime.utcnow()
+    return {
+        "session_id": session_id,
+        "student_id": student_id,
+        "attempt_status": status,
+        "failure_reason": reason if status != "success" else None,
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+        "attempt_time": attempted_at,
+        "created_at": attempted_at,
+    }
+
+
+# Present/late counters of QR sessions, bumped by every successful scan
+qr_session_counters = CounterBuffer(
+    QRAttendanceSession,
+    ("total_students_present", "total_late_entries"),
+    flush_interval=settings.SESSION_COUNTER_FLUSH_INTERVAL,
+)
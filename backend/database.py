@@ -1,29 +1,194 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
+import sqlite3
+import threading
+import time
 from dotenv import load_dotenv
 
+from backend.core.config import settings
+
 load_dotenv()
 
 # 1. Database URL fetch karna
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 
-# 2. Render/Postgres Fix: SQLAlchemy 1.4+ ko "postgresql://" chahiye hota hai 
-# Jabki Render "postgres://" provide karta hai.
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# 3. SQLite-specific arguments
-connect_args = {}
-if "sqlite" in DATABASE_URL:
-    connect_args = {"check_same_thread": False}
+def normalize_database_url(url: str) -> str:
+    # 2. Render/Postgres Fix: SQLAlchemy 1.4+ ko "postgresql://" chahiye hota hai
+    # Jabki Render "postgres://" provide karta hai.
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+DATABASE_URL = normalize_database_url(DATABASE_URL)
+
+
+class PoolMetrics:
+    """Checkout wait time and saturation for one connection pool"""
+
+    def __init__(self, max_overflow: int = 0):
+        self._lock = threading.Lock()
+        self.max_overflow = max_overflow  # as configured; negative means unlimited
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+
+    def record_checkout(self, wait: float, checked_out: int):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        capacity = pool.size() + max(self.max_overflow, 0)
+        checked_out = pool.checkedout()
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "max_overflow": self.max_overflow,
+                "checked_out": checked_out,
+                "idle": pool.checkedin(),
+                "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+                "peak_saturation": round(self.peak_checked_out / capacity, 3) if capacity else 0.0,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "avg_checkout_wait_ms": round(self.total_wait / self.checkouts * 1000, 3)
+                if self.checkouts
+                else 0.0,
+                "max_checkout_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class _CheckoutTimingMixin:
+    """Records how long callers wait for a pooled connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 10 is QueuePool's own default when create_engine() passes none
+        self.metrics = PoolMetrics(max_overflow=kwargs.get("max_overflow", 10))
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool with checkout metrics"""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """asyncio-compatible QueuePool with checkout metrics"""
+
+
+# Async drivers used for each backend by the AsyncEngine
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to its asyncio driver (aiosqlite / asyncpg)"""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS[scheme.split('+')[0]]}://{rest}"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    database = url.split("://", 1)[1].split("?", 1)[0]
+    return url.startswith("sqlite") and database.lstrip("/") in ("", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    """create_engine() keyword arguments for the database behind `url`"""
+    options = {"echo": os.getenv("SQL_ECHO", "False").lower() == "true"}
+    is_async = "+aiosqlite" in url or "+asyncpg" in url
+
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if not is_async:
+            options["connect_args"]["check_same_thread"] = False
+        if _is_memory_sqlite(url):
+            return options
+    elif "+asyncpg" in url:
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        }
+    elif url.startswith("postgresql"):
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
 
-# 4. Engine create karna
-engine = create_engine(
-    DATABASE_URL, 
-    connect_args=connect_args, 
-    echo=os.getenv("SQL_ECHO", "False").lower() == "true"
-)
+    # MAX_POOL_SIZE caps pool + overflow connections per worker
+    pool_size = min(settings.DB_POOL_SIZE, settings.MAX_POOL_SIZE)
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max(0, min(settings.DB_MAX_OVERFLOW, settings.MAX_POOL_SIZE - pool_size)),
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """WAL journaling and I/O tuning for each new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    finally:
+        cursor.close()
+
+
+def create_database_engine(url: str):
+    """Engine with the pool/pragma profile for its backend"""
+    engine = create_engine(url, **engine_options(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    return engine
+
+
+def create_async_database_engine(url: str):
+    """AsyncEngine for `url` using the asyncio driver and the same pool/pragma profile"""
+    async_url = async_database_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url))
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return async_engine
+
+
+def get_pool_metrics(bind=None) -> dict:
+    """Pool metrics for the primary engine (or `bind`)"""
+    pool = (bind or engine).pool
+    if isinstance(pool, _CheckoutTimingMixin):
+        return pool.metrics.snapshot(pool)
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+
+# 3. Engine create karna (pool settings and SQLite pragmas per backend)
+engine = create_database_engine(DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -38,4 +203,60 @@ def get_db():
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# 4. Async engine, created on first use so the async drivers stay optional
+_async_engine = None
+_async_session_factory = None
+
+
+def get_async_engine():
+    """Process-wide AsyncEngine for DATABASE_URL"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_database_engine(DATABASE_URL)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def dispose_async_engine():
+    """Close pooled async connections (application shutdown)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_session_factory = None
+
+
+async def get_async_db():
+    """Dependency for an AsyncSession (hot routes that should not use the threadpool)"""
+    async with get_async_session_factory()() as db:
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+def supports_window_functions(bind) -> bool:
+    """Window functions need SQLite 3.25+; every supported server database has them"""
+    if bind.dialect.name == "sqlite":
+        return sqlite3.sqlite_version_info >= (3, 25, 0)
+    return True
+
+
+def dialect_insert(bind, table):
+    """INSERT construct supporting ON CONFLICT clauses for the bound dialect"""
+    if bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
@@ -4,10 +4,10 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 import asyncio
+from datetime import datetime
 from dotenv import load_dotenv
 
-from backend.database import engine
-from backend.models import student
+from backend.database import dispose_async_engine, engine, get_pool_metrics
 from backend.models import attendance, complaint, schedule, risk, club, schedule_feedback, events, qr_attendance
 from backend.routes.students import router as students_router
 from backend.routes.health import router as health_router
@@ -25,11 +25,24 @@ from backend.routes.schedule_feedback import router as schedule_feedback_router
 from backend.routes.events import router as events_router
 from backend.routes.qr_attendance import router as qr_attendance_router
 from backend.routes.gemini import router as gemini_router
+from backend.routes.exports import router as exports_router
 from backend.core.event_handlers import register_agents
 from backend.core.config import settings
 from backend.core.logging import setup_logging, get_logger, RequestLoggingMiddleware
+from backend.core.attendance_stats import session_stats
 from backend.core.background_tasks import task_queue, scheduler
 from backend.core.caching import cache_manager
+from backend.core.device_registry import device_registry
+from backend.core.live_feed import live_feed
+from backend.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER
+from backend.core.proxy_detection import proxy_detector
+from backend.core.qr_images import qr_image_cache
+from backend.core.qr_session_cache import qr_session_cache
+from backend.core.read_replicas import read_router
+from backend.core.scan_dedup import scan_dedup
+from backend.core.session_sweeper import session_sweeper
+from backend.core.write_behind import qr_session_counters, scan_log_buffer
+from backend.migrations import run_migrations
 
 # Load environment variables
 load_dotenv()
@@ -38,8 +51,8 @@ load_dotenv()
 setup_logging()
 logger = get_logger(__name__)
 
-# Create tables
-student.Base.metadata.create_all(bind=engine)
+# Create or upgrade the schema
+run_migrations(engine)
 
 # Create FastAPI app with environment-specific config
 app = FastAPI(
@@ -59,6 +72,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.CORS_METHODS,
     allow_headers=settings.CORS_HEADERS,
+    # Let browser clients read the pagination and caching headers
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER, "ETag"],
 )
 
 app.include_router(health_router)
@@ -74,6 +89,7 @@ app.include_router(risk_router)
 app.include_router(agents_router)
 app.include_router(dashboard_router)
 app.include_router(analytics_router)
+app.include_router(exports_router)
 app.include_router(clubs_router)
 app.include_router(ai_router)
 app.include_router(gemini_router)  # Phase 5: Gemini Chatbot Integration
@@ -102,6 +118,56 @@ async def startup_event():
             "background_tasks_enabled", level="INFO", max_workers=task_queue.max_workers
         )
 
+    # Replicas measure their lag against the primary's heartbeat
+    if read_router.enabled:
+        scheduler.schedule(
+            "replica_heartbeat",
+            read_router.write_heartbeat_async,
+            settings.REPLICA_HEARTBEAT_INTERVAL,
+            "Stamp the replication heartbeat on the primary",
+        )
+
+    # Scan audit logs, session counters and device stats are buffered and written in bulk
+    scheduler.schedule(
+        "scan_log_flush",
+        scan_log_buffer.flush_async,
+        settings.SCAN_LOG_FLUSH_INTERVAL,
+        "Flush buffered QR scan audit logs",
+    )
+    scheduler.schedule(
+        "session_counter_flush",
+        qr_session_counters.flush_async,
+        settings.SESSION_COUNTER_FLUSH_INTERVAL,
+        "Apply buffered QR session present/late counts",
+    )
+    scheduler.schedule(
+        "device_stats_flush",
+        device_registry.flush_async,
+        settings.DEVICE_STATS_FLUSH_INTERVAL,
+        "Write batched device usage statistics",
+    )
+    scheduler.schedule(
+        "qr_session_sweep",
+        session_sweeper.run_async,
+        settings.SESSION_SWEEP_INTERVAL,
+        "Expire QR sessions past qr_expires_at and finalize their stats",
+    )
+    scheduler.schedule(
+        "session_stats_finalize",
+        session_stats.run_async,
+        settings.STATS_FINALIZE_INTERVAL,
+        "Count closed QR sessions into subject attendance stats",
+    )
+    scheduler.schedule(
+        "proxy_pattern_analysis",
+        proxy_detector.run_async,
+        settings.PROXY_ANALYSIS_INTERVAL,
+        "Flag clustered proxy scans in closed QR sessions",
+    )
+
+    # Live attendance feed (cross-worker fan-out when Redis is configured)
+    await live_feed.start()
+
     # Start task scheduler (Phase 5)
     scheduler_task = asyncio.create_task(scheduler.start())
     logger.log_event("scheduler_started", level="INFO", tasks_count=len(scheduler.tasks))
@@ -134,6 +200,18 @@ async def shutdown_event():
     await scheduler.stop()
     logger.log_event("scheduler_stopped", level="INFO")
 
+    # Write out buffered scan audit logs before the engine goes away
+    flushed = await scan_log_buffer.flush_async()
+    logger.log_event("scan_log_buffer_flushed", level="INFO", rows=flushed)
+    flushed = await qr_session_counters.flush_async()
+    logger.log_event("session_counters_flushed", level="INFO", sessions=flushed)
+    flushed = await device_registry.flush_async()
+    logger.log_event("device_stats_flushed", level="INFO", devices=flushed)
+
+    await live_feed.stop()
+    await dispose_async_engine()
+    await read_router.dispose()
+
     logger.log_event("shutdown_complete", level="INFO")
 
 
@@ -192,6 +270,18 @@ def full_health():
         "components": {
             "api": "running",
             "database": "running",
+            "database_pool": get_pool_metrics(),
+            "read_replicas": read_router.status(),
+            "qr_scan_log_buffer": scan_log_buffer.metrics(),
+            "qr_session_cache": qr_session_cache.metrics(),
+            "qr_session_counters": qr_session_counters.metrics(),
+            "qr_scan_dedup": scan_dedup.metrics(),
+            "device_registry": device_registry.metrics(),
+            "qr_image_cache": qr_image_cache.metrics(),
+            "live_feed": live_feed.metrics(),
+            "proxy_detector": proxy_detector.metrics(),
+            "session_stats": session_stats.metrics(),
+            "session_sweeper": session_sweeper.metrics(),
             "event_bus": "running",
             "agents": "running",
             "analytics": "running",
@@ -217,7 +307,6 @@ def full_health():
 
 if __name__ == "__main__":
     import uvicorn
-    from datetime import datetime
 
     logger.log_event(
         "server_starting",
@@ -0,0 +1,130 @@
+"""
+Schema Migrations
+Ordered upgrade steps tracked in the schema_migrations table
+
+Each module in backend.migrations.versions defines a `revision` string and an
+`upgrade(connection)` function. Steps run once, in revision order, each in its
+own transaction, and are written to be safe against databases that were
+previously created with metadata.create_all. Steps spell out their own DDL and
+backfill statements instead of reading the live models, so editing a model
+never changes what an old migration does.
+
+Every worker runs the migrations at startup. On Postgres the whole run holds
+an advisory lock; elsewhere each step records its revision before doing any
+work, so a worker that loses the race finds it claimed and skips the step.
+"""
+
+import importlib
+import pkgutil
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, select, text
+
+from backend.core.logging import get_logger
+from backend.database import dialect_insert
+
+logger = get_logger("migrations")
+
+_migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("revision", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# pg_advisory_lock key shared by every process that runs migrations
+MIGRATION_LOCK_KEY = 7_310_471_022
+
+
+def discover_migrations() -> list:
+    """Migration modules ordered by revision"""
+    from backend.migrations import versions
+
+    modules = [
+        importlib.import_module(f"{versions.__name__}.{name}")
+        for _, name, _ in pkgutil.iter_modules(versions.__path__)
+    ]
+    return sorted(modules, key=lambda module: module.revision)
+
+
+def applied_revisions(engine) -> List[str]:
+    """Revisions already recorded in schema_migrations"""
+    schema_migrations.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return list(conn.execute(select(schema_migrations.c.revision)).scalars())
+
+
+@contextmanager
+def migration_lock(engine):
+    """Hold the Postgres advisory lock for the duration of a migration run"""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+
+def claim_revision(conn, revision: str) -> bool:
+    """Record a revision as applied; False if another worker already recorded it"""
+    stmt = dialect_insert(conn, schema_migrations).values(
+        revision=revision, applied_at=datetime.utcnow()
+    )
+    return conn.execute(stmt.on_conflict_do_nothing(index_elements=["revision"])).rowcount == 1
+
+
+def run_migrations(engine) -> List[str]:
+    """Apply pending migrations and return the revisions that ran"""
+    with migration_lock(engine):
+        done = set(applied_revisions(engine))
+        applied = []
+
+        for migration in discover_migrations():
+            if migration.revision in done:
+                continue
+
+            with engine.begin() as conn:
+                if not claim_revision(conn, migration.revision):
+                    logger.log_event(
+                        "migration_skipped", level="INFO", revision=migration.revision
+                    )
+                    continue
+                migration.upgrade(conn)
+
+            logger.log_event("migration_applied", level="INFO", revision=migration.revision)
+            applied.append(migration.revision)
+
+        return applied
+
+
+# ============== Helpers for migration modules ==============
+
+
+def create_index(conn, name: str, table_name: str, *columns: str, unique: bool = False):
+    """Create an index on plain columns unless one with that name already exists"""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.exec_driver_sql(
+        f"CREATE {kind} IF NOT EXISTS {name} ON {table_name} ({', '.join(columns)})"
+    )
+
+
+def add_column(conn, table_name: str, column: Column):
+    """Add a column to an existing table if it is missing"""
+    existing = {col["name"] for col in inspect(conn).get_columns(table_name)}
+    if column.name in existing:
+        return
+
+    column_type = column.type.compile(dialect=conn.dialect)
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column.name} {column_type}"
+    if column.server_default is not None:
+        default = column.server_default.arg
+        ddl += f" DEFAULT {getattr(default, 'text', default)}"
+    conn.exec_driver_sql(ddl)
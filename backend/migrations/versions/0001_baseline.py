@@ -0,0 +1,465 @@
+"""
+Baseline schema: every table that existed before migrations were introduced
+
+The tables are frozen here as they stood at that point rather than built from
+the live models, so later model changes only ever reach a database through
+their own migrations.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    func,
+)
+
+revision = "0001_baseline"
+
+metadata = MetaData()
+
+Table(
+    "students",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("roll_no", String, nullable=False, unique=True),
+    Column("department", String, nullable=False),
+    Column("semester", Integer),
+    Column("section", String),
+)
+
+Table(
+    "attendance",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("student_id", Integer, ForeignKey("students.id"), nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("status", String, nullable=False),
+    Column("remarks", String),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "complaints",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("student_id", Integer, ForeignKey("students.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("category", String, nullable=False),
+    Column("status", String, nullable=False),
+    Column("priority", String, nullable=False),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "schedules",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("event_type", String, nullable=False),
+    Column("start_date", DateTime, nullable=False),
+    Column("end_date", DateTime, nullable=False),
+    Column("location", String),
+    Column("audience", String),
+    Column("is_active", Integer),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "risk_logs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("student_id", Integer),
+    Column("risk_type", String, nullable=False),
+    Column("severity", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("action_taken", Text),
+    Column("resolved", Integer),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "clubs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False, unique=True),
+    Column("description", Text),
+    Column("category", String, nullable=False),
+    Column("detailed_description", Text),
+    Column("mission_statement", Text),
+    Column("vision_statement", Text),
+    Column("logo_url", String(500)),
+    Column("banner_image", String(500)),
+    Column("cover_image", String(500)),
+    Column("gallery_images", Text),
+    Column("social_media_links", Text),
+    Column("advisor", String, nullable=False),
+    Column("advisor_email", String(200)),
+    Column("president", String),
+    Column("president_email", String(200)),
+    Column("contact_email", String(200)),
+    Column("contact_phone", String(20)),
+    Column("member_count", Integer),
+    Column("total_events", Integer),
+    Column("founding_year", Integer),
+    Column("is_active", Boolean),
+    Column("accepting_members", Boolean),
+    Column("membership_fee", Integer),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "club_activities",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("club_id", Integer, ForeignKey("clubs.id"), nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text),
+    Column("activity_type", String, nullable=False),
+    Column("start_date", DateTime, nullable=False),
+    Column("end_date", DateTime),
+    Column("location", String),
+    Column("expected_participants", Integer),
+    Column("actual_participants", Integer),
+    Column("status", String),
+    Column("remarks", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "club_members",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("club_id", Integer, ForeignKey("clubs.id"), nullable=False),
+    Column("student_id", Integer, ForeignKey("students.id"), nullable=False),
+    Column("position", String),
+    Column("join_date", DateTime),
+    Column("is_active", Boolean),
+)
+
+Table(
+    "club_attendance",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("club_id", Integer, ForeignKey("clubs.id"), nullable=False),
+    Column("student_name", String, nullable=False),
+    Column("roll_number", String),
+    Column("section", String),
+    Column("status", String, nullable=False),
+    Column("attendance_date", DateTime, nullable=False),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "schedule_feedback",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(100), nullable=False),
+    Column("roll_number", String(50), nullable=False),
+    Column("issue_type", String(100), nullable=False),
+    Column("preferred_timing", String(200)),
+    Column("additional_comments", Text),
+    Column("status", String(50)),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("resolved_at", DateTime(timezone=True)),
+)
+
+Table(
+    "announcements",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(200), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("author", String(100), nullable=False),
+    Column("priority", String(20)),
+    Column("target_audience", String(100)),
+    Column("is_active", Integer),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("expires_at", DateTime(timezone=True)),
+)
+
+Table(
+    "events",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(200), nullable=False, index=True),
+    Column("description", Text, nullable=False),
+    Column(
+        "category",
+        Enum(
+            "SPORTS",
+            "TECHNICAL",
+            "CULTURAL",
+            "GAMING",
+            "WORKSHOP",
+            "COMPETITION",
+            name="eventcategory",
+        ),
+        nullable=False,
+        index=True,
+    ),
+    Column("banner_image", String(500)),
+    Column("thumbnail_image", String(500)),
+    Column("gallery_images", Text),
+    Column("registration_start_date", DateTime, nullable=False),
+    Column("registration_end_date", DateTime, nullable=False),
+    Column("event_start_date", DateTime, nullable=False),
+    Column("event_end_date", DateTime, nullable=False),
+    Column("venue", String(300)),
+    Column("max_participants", Integer),
+    Column("current_participants", Integer),
+    Column("entry_fee", Float),
+    Column("organizer_name", String(200), nullable=False),
+    Column("organizer_email", String(200), nullable=False),
+    Column("organizer_phone", String(20)),
+    Column(
+        "status",
+        Enum(
+            "UPCOMING",
+            "REGISTRATION_OPEN",
+            "REGISTRATION_CLOSED",
+            "ONGOING",
+            "COMPLETED",
+            "CANCELLED",
+            name="eventstatus",
+        ),
+    ),
+    Column("requires_approval", Boolean),
+    Column("team_event", Boolean),
+    Column("min_team_size", Integer),
+    Column("max_team_size", Integer),
+    Column("rules", Text),
+    Column("eligibility_criteria", Text),
+    Column("prizes", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("created_by", Integer),
+)
+
+Table(
+    "event_registrations",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("event_id", Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False),
+    Column("student_id", String(50), nullable=False, index=True),
+    Column("student_name", String(200), nullable=False),
+    Column("student_email", String(200), nullable=False),
+    Column("student_phone", String(20), nullable=False),
+    Column("branch", String(100)),
+    Column("year", String(20)),
+    Column("roll_number", String(50)),
+    Column("team_name", String(200)),
+    Column("team_members", Text),
+    Column("team_leader", Boolean),
+    Column("registration_date", DateTime),
+    Column(
+        "status", Enum("PENDING", "APPROVED", "REJECTED", "WAITLISTED", name="registrationstatus")
+    ),
+    Column("payment_status", String(50)),
+    Column("transaction_id", String(100)),
+    Column("previous_experience", Text),
+    Column("expectations", Text),
+    Column("special_requirements", Text),
+    Column("emergency_contact", String(20)),
+    Column("approved_by", Integer),
+    Column("approval_date", DateTime),
+    Column("rejection_reason", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "event_leaderboard",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("event_id", Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False),
+    Column("participant_id", String(50), nullable=False),
+    Column("participant_name", String(200), nullable=False),
+    Column("participant_type", String(20)),
+    Column("score", Float),
+    Column("rank", Integer),
+    Column("points", Integer),
+    Column("matches_played", Integer),
+    Column("matches_won", Integer),
+    Column("matches_lost", Integer),
+    Column("matches_draw", Integer),
+    Column("statistics", Text),
+    Column("position", String(50)),
+    Column("prize_won", String(200)),
+    Column("certificate_url", String(500)),
+    Column("last_updated", DateTime),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "event_announcements",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("event_id", Integer, ForeignKey("events.id", ondelete="CASCADE")),
+    Column("title", String(300), nullable=False),
+    Column("message", Text, nullable=False),
+    Column("announcement_type", String(50)),
+    Column("target_audience", String(100)),
+    Column("is_pinned", Boolean),
+    Column("is_active", Boolean),
+    Column("publish_date", DateTime),
+    Column("expiry_date", DateTime),
+    Column("image_url", String(500)),
+    Column("attachment_url", String(500)),
+    Column("link_url", String(500)),
+    Column("link_text", String(100)),
+    Column("created_by", Integer),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "qr_attendance_sessions",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("session_id", String(100), nullable=False, unique=True, index=True),
+    Column("faculty_id", String(50), nullable=False, index=True),
+    Column("faculty_name", String(200), nullable=False),
+    Column("faculty_email", String(200)),
+    Column("subject_code", String(50), nullable=False),
+    Column("subject_name", String(200), nullable=False),
+    Column("branch", String(100), nullable=False),
+    Column("semester", String(20), nullable=False),
+    Column("section", String(50)),
+    Column("lecture_date", DateTime(timezone=True), nullable=False),
+    Column("lecture_start_time", DateTime(timezone=True), nullable=False),
+    Column("lecture_end_time", DateTime(timezone=True)),
+    Column("lecture_duration_minutes", Integer),
+    Column("qr_code_data", Text, nullable=False),
+    Column("qr_code_hash", String(256), nullable=False),
+    Column("qr_generated_at", DateTime(timezone=True)),
+    Column("qr_expires_at", DateTime(timezone=True), nullable=False),
+    Column("qr_validity_minutes", Integer),
+    Column("center_latitude", Float, nullable=False),
+    Column("center_longitude", Float, nullable=False),
+    Column("geo_fence_radius_meters", Float),
+    Column("location_name", String(300)),
+    Column("is_active", Boolean),
+    Column("is_expired", Boolean),
+    Column("is_cancelled", Boolean),
+    Column("total_students_expected", Integer),
+    Column("total_students_present", Integer),
+    Column("total_students_absent", Integer),
+    Column("total_late_entries", Integer),
+    Column("max_scan_attempts_per_student", Integer),
+    Column("allow_screenshot_scan", Boolean),
+    Column("require_device_verification", Boolean),
+    Column("created_at", DateTime(timezone=True)),
+    Column("closed_at", DateTime(timezone=True)),
+    Column("notes", Text),
+)
+
+Table(
+    "qr_attendance_records",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column(
+        "session_id",
+        Integer,
+        ForeignKey("qr_attendance_sessions.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("student_id", String(50), nullable=False, index=True),
+    Column("roll_number", String(50), nullable=False, index=True),
+    Column("student_name", String(200), nullable=False),
+    Column("student_email", String(200)),
+    Column("branch", String(100), nullable=False),
+    Column("semester", String(20), nullable=False),
+    Column("section", String(50)),
+    Column("marked_at", DateTime(timezone=True)),
+    Column("attendance_status", String(20)),
+    Column("is_late_entry", Boolean),
+    Column("late_by_minutes", Integer),
+    Column("student_latitude", Float, nullable=False),
+    Column("student_longitude", Float, nullable=False),
+    Column("distance_from_center", Float, nullable=False),
+    Column("is_within_geofence", Boolean),
+    Column("location_accuracy", Float),
+    Column("device_id", String(200)),
+    Column("device_model", String(200)),
+    Column("device_os", String(100)),
+    Column("browser", String(200)),
+    Column("ip_address", String(50)),
+    Column("user_agent", Text),
+    Column("scan_attempt_number", Integer),
+    Column("is_screenshot_scan", Boolean),
+    Column("is_duplicate_device", Boolean),
+    Column("is_proxy_suspected", Boolean),
+    Column("qr_validation_passed", Boolean),
+    Column("location_validation_passed", Boolean),
+    Column("device_validation_passed", Boolean),
+    Column("time_validation_passed", Boolean),
+    Column("scan_duration_ms", Integer),
+    Column("remarks", Text),
+    Column("validation_errors", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "qr_attendance_logs",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("session_id", Integer, nullable=False, index=True),
+    Column("student_id", String(50), nullable=False, index=True),
+    Column("attempt_time", DateTime),
+    Column("attempt_status", String(50), nullable=False),
+    Column("failure_reason", String(500)),
+    Column("latitude", Float),
+    Column("longitude", Float),
+    Column("distance_from_center", Float),
+    Column("device_id", String(200)),
+    Column("ip_address", String(50)),
+    Column("qr_valid", Boolean),
+    Column("location_valid", Boolean),
+    Column("device_valid", Boolean),
+    Column("time_valid", Boolean),
+    Column("error_message", Text),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "device_fingerprints",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("device_id", String(200), nullable=False, unique=True, index=True),
+    Column("student_id", String(50), nullable=False, index=True),
+    Column("student_name", String(200), nullable=False),
+    Column("device_model", String(200)),
+    Column("device_os", String(100)),
+    Column("browser", String(200)),
+    Column("screen_resolution", String(50)),
+    Column("first_registered", DateTime),
+    Column("last_used", DateTime),
+    Column("total_scans", Integer),
+    Column("is_active", Boolean),
+    Column("is_blocked", Boolean),
+    Column("block_reason", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,59 @@
+"""
+Composite indexes for hot query paths and one-record-per-scan enforcement
+"""
+
+from sqlalchemy import text
+
+from backend.migrations import create_index
+
+revision = "0002_hot_path_indexes"
+
+
+def upgrade(conn):
+    create_index(conn, "ix_attendance_student_date", "attendance", "student_id", "date")
+    create_index(conn, "ix_complaints_created_at", "complaints", "created_at")
+    create_index(conn, "ix_complaints_status", "complaints", "status")
+    create_index(
+        conn,
+        "ix_risk_logs_resolved_type_severity",
+        "risk_logs",
+        "resolved",
+        "risk_type",
+        "severity",
+    )
+    create_index(
+        conn,
+        "ix_risk_logs_student_resolved_type",
+        "risk_logs",
+        "student_id",
+        "resolved",
+        "risk_type",
+    )
+    create_index(
+        conn,
+        "ix_schedules_location_active_window",
+        "schedules",
+        "location",
+        "is_active",
+        "start_date",
+        "end_date",
+    )
+    create_index(
+        conn, "ix_club_attendance_club_date", "club_attendance", "club_id", "attendance_date"
+    )
+
+    # Keep the earliest record per (session, student) before enforcing uniqueness
+    conn.execute(
+        text(
+            "DELETE FROM qr_attendance_records WHERE id NOT IN ("
+            " SELECT MIN(id) FROM qr_attendance_records GROUP BY session_id, student_id)"
+        )
+    )
+    create_index(
+        conn,
+        "uq_qr_attendance_records_session_student",
+        "qr_attendance_records",
+        "session_id",
+        "student_id",
+        unique=True,
+    )
@@ -0,0 +1,20 @@
+"""
+Heartbeat table used to measure read-replica lag
+"""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table
+
+revision = "0003_replication_heartbeat"
+
+metadata = MetaData()
+
+Table(
+    "replication_heartbeat",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("beat_at", DateTime, nullable=False),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,22 @@
+"""
+Indexes matching the keyset order of cursor-paginated listings
+"""
+
+from backend.migrations import create_index
+
+revision = "0004_keyset_pagination_indexes"
+
+
+def upgrade(conn):
+    create_index(conn, "ix_events_start_date_id", "events", "event_start_date", "id")
+    create_index(conn, "ix_club_activities_club_id", "club_activities", "club_id", "id")
+    create_index(conn, "ix_club_members_club_id", "club_members", "club_id", "id")
+    create_index(
+        conn,
+        "ix_qr_attendance_sessions_faculty_created",
+        "qr_attendance_sessions",
+        "faculty_id",
+        "created_at",
+        "id",
+    )
+    create_index(conn, "ix_complaints_student_id", "complaints", "student_id", "id")
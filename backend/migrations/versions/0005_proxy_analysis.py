@@ -0,0 +1,13 @@
+"""
+Stamp recording when a QR session was analyzed for proxy-attendance patterns
+"""
+
+from sqlalchemy import Column, DateTime
+
+from backend.migrations import add_column
+
+revision = "0005_proxy_analysis"
+
+
+def upgrade(conn):
+    add_column(conn, "qr_attendance_sessions", Column("proxy_analyzed_at", DateTime(timezone=True)))
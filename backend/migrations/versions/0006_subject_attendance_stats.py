@@ -0,0 +1,137 @@
+"""
+Attended/held counters for the student QR dashboard, backfilled from existing sessions
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    and_,
+    case,
+    column,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    table,
+    update,
+)
+
+from backend.migrations import add_column
+
+revision = "0006_subject_attendance_stats"
+
+metadata = MetaData()
+
+sessions_held = Table(
+    "qr_subject_sessions_held",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("branch", String(100), nullable=False),
+    Column("semester", String(20), nullable=False),
+    Column("section", String(50), nullable=False),
+    Column("subject_code", String(50), nullable=False),
+    Column("subject_name", String(200), nullable=False),
+    Column("held", Integer, nullable=False),
+    UniqueConstraint(
+        "branch", "semester", "section", "subject_code", name="uq_qr_subject_sessions_held"
+    ),
+)
+
+student_stats = Table(
+    "qr_student_subject_stats",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("student_id", String(50), nullable=False),
+    Column("subject_code", String(50), nullable=False),
+    Column("subject_name", String(200), nullable=False),
+    Column("attended", Integer, nullable=False),
+    Column("late", Integer, nullable=False),
+    UniqueConstraint("student_id", "subject_code", name="uq_qr_student_subject_stats"),
+)
+
+# The columns the backfill reads, as they stood at this revision
+sessions = table(
+    "qr_attendance_sessions",
+    column("id", Integer),
+    column("branch", String),
+    column("semester", String),
+    column("section", String),
+    column("subject_code", String),
+    column("subject_name", String),
+    column("qr_expires_at", DateTime(timezone=True)),
+    column("is_active", Boolean),
+    column("is_expired", Boolean),
+    column("is_cancelled", Boolean),
+    column("stats_finalized_at", DateTime(timezone=True)),
+)
+
+records = table(
+    "qr_attendance_records",
+    column("id", Integer),
+    column("session_id", Integer),
+    column("student_id", String),
+    column("attendance_status", String),
+    column("is_late_entry", Boolean),
+)
+
+
+def upgrade(conn):
+    add_column(
+        conn, "qr_attendance_sessions", Column("stats_finalized_at", DateTime(timezone=True))
+    )
+    metadata.create_all(conn, checkfirst=True)
+    conn.execute(delete(sessions_held))
+    conn.execute(delete(student_stats))
+
+    # Count every closed, non-cancelled session and stamp it as counted
+    now = datetime.now(timezone.utc)
+    counted = and_(
+        sessions.c.is_cancelled.is_(False),
+        or_(
+            sessions.c.is_active.is_(False),
+            sessions.c.is_expired.is_(True),
+            sessions.c.qr_expires_at < now,
+        ),
+    )
+    section = func.coalesce(sessions.c.section, "")
+
+    conn.execute(
+        insert(sessions_held).from_select(
+            ["branch", "semester", "section", "subject_code", "subject_name", "held"],
+            select(
+                sessions.c.branch,
+                sessions.c.semester,
+                section,
+                sessions.c.subject_code,
+                func.max(sessions.c.subject_name),
+                func.count(sessions.c.id),
+            )
+            .where(counted)
+            .group_by(sessions.c.branch, sessions.c.semester, section, sessions.c.subject_code),
+        )
+    )
+    conn.execute(
+        insert(student_stats).from_select(
+            ["student_id", "subject_code", "subject_name", "attended", "late"],
+            select(
+                records.c.student_id,
+                sessions.c.subject_code,
+                func.max(sessions.c.subject_name),
+                func.count(records.c.id),
+                func.sum(case((records.c.is_late_entry.is_(True), 1), else_=0)),
+            )
+            .join(sessions, records.c.session_id == sessions.c.id)
+            .where(counted, records.c.attendance_status != "absent")
+            .group_by(records.c.student_id, sessions.c.subject_code),
+        )
+    )
+    conn.execute(update(sessions).where(counted).values(stats_finalized_at=now))
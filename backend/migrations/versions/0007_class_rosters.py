@@ -0,0 +1,31 @@
+"""
+Stored class rosters for absent lists and bulk session close
+"""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, UniqueConstraint
+
+revision = "0007_class_rosters"
+
+metadata = MetaData()
+
+Table(
+    "qr_class_rosters",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("branch", String(100), nullable=False),
+    Column("semester", String(20), nullable=False),
+    Column("section", String(50), nullable=False),
+    Column("roll_number", String(50), nullable=False),
+    Column("student_id", String(50), nullable=False),
+    Column("student_name", String(200), nullable=False),
+    Column("student_email", String(200)),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    UniqueConstraint(
+        "branch", "semester", "section", "roll_number", name="uq_qr_class_rosters_member"
+    ),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,17 @@
+"""
+Index for the QR session expiry sweeper
+"""
+
+from backend.migrations import create_index
+
+revision = "0008_session_expiry_index"
+
+
+def upgrade(conn):
+    create_index(
+        conn,
+        "ix_qr_attendance_sessions_active_expiry",
+        "qr_attendance_sessions",
+        "is_active",
+        "qr_expires_at",
+    )
@@ -0,0 +1,69 @@
+"""
+Complaint heatmap cube, backfilled from existing complaints
+"""
+
+from collections import Counter
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    column,
+    delete,
+    insert,
+    select,
+    table,
+)
+
+revision = "0009_complaint_heatmap_cube"
+
+metadata = MetaData()
+
+heatmap_cube = Table(
+    "complaint_heatmap_cube",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("bucket_date", Date, nullable=False),
+    Column("day_of_week", Integer, nullable=False),
+    Column("hour", Integer, nullable=False),
+    Column("category", String, nullable=False),
+    Column("count", Integer, nullable=False),
+    UniqueConstraint("bucket_date", "hour", "category", name="uq_complaint_heatmap_cell"),
+)
+
+complaints = table("complaints", column("created_at", DateTime), column("category", String))
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
+    conn.execute(delete(heatmap_cube))
+
+    # Bucket in Python: date/hour extraction differs between SQLite and Postgres
+    cells = Counter()
+    rows = conn.execute(
+        select(complaints.c.created_at, complaints.c.category)
+        .where(complaints.c.created_at.is_not(None))
+        .execution_options(yield_per=5000)
+    )
+    for created_at, category in rows:
+        cells[(created_at.date(), created_at.hour, category)] += 1
+
+    if cells:
+        conn.execute(
+            insert(heatmap_cube),
+            [
+                {
+                    "bucket_date": bucket_date,
+                    "day_of_week": bucket_date.weekday(),
+                    "hour": hour,
+                    "category": category,
+                    "count": count,
+                }
+                for (bucket_date, hour, category), count in cells.items()
+            ],
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.database import Base
@@ -72,6 +72,8 @@ class ClubActivity(Base):
     # Relationships
     club = relationship("Club", back_populates="activities")
 
+    __table_args__ = (Index("ix_club_activities_club_id", "club_id", "id"),)
+
 
 class ClubMember(Base):
     __tablename__ = "club_members"
@@ -86,6 +88,8 @@ class ClubMember(Base):
     # Relationships
     club = relationship("Club", back_populates="members")
 
+    __table_args__ = (Index("ix_club_members_club_id", "club_id", "id"),)
+
 
 class ClubAttendance(Base):
     __tablename__ = "club_attendance"
@@ -99,5 +103,7 @@ class ClubAttendance(Base):
     attendance_date = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (Index("ix_club_attendance_club_date", "club_id", "attendance_date"),)
+
     # Relationship back to club (optional)
     # club = relationship("Club", back_populates="attendance")
\ No newline at end of file
@@ -1,6 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Date, ForeignKey, Text, UniqueConstraint, Index,
+    case, event, inspect, select, update,
+)
+from sqlalchemy.orm import Session, column_property
+from collections import Counter
 from datetime import datetime
-from backend.database import Base
+from backend.core.logging import get_logger
+from backend.database import Base, dialect_insert
+
+logger = get_logger("complaint_cube")
 
 
 class Complaint(Base):
@@ -10,8 +18,145 @@ class Complaint(Base):
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    category = Column(String, nullable=False)  # Academic, Conduct, Health, Other
+    # active_history keeps the old category for the heatmap cube even when expired
+    category = column_property(
+        Column(String, nullable=False), active_history=True
+    )  # Academic, Conduct, Health, Other
     status = Column(String, default="Pending", nullable=False)  # Pending, Resolved, Closed
     priority = Column(String, default="Normal", nullable=False)  # Low, Normal, High, Urgent
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = column_property(Column(DateTime, default=datetime.utcnow), active_history=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_complaints_created_at", "created_at"),
+        Index("ix_complaints_status", "status"),
+        Index("ix_complaints_student_id", "student_id", "id"),
+    )
+
+
+class ComplaintHeatmapCell(Base):
+    """
+    Pre-aggregated complaint counts per (date, hour, category)
+    Maintained on complaint insert/update/delete, including ORM bulk update()/delete()
+    through a Session, so heatmaps never scan complaints. Core statements run on a
+    Connection are not tracked: after those, run POST /analytics/complaint-heatmap/rebuild
+    """
+
+    __tablename__ = "complaint_heatmap_cube"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_date = Column(Date, nullable=False)
+    day_of_week = Column(Integer, nullable=False)  # 0 = Monday ... 6 = Sunday
+    hour = Column(Integer, nullable=False)  # 0-23, UTC
+    category = Column(String, nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("bucket_date", "hour", "category", name="uq_complaint_heatmap_cell"),
+    )
+
+
+def bump_heatmap_cell(connection, created_at: datetime, category: str, delta: int = 1):
+    """Atomically add delta to the cube cell a complaint falls into, never going below zero"""
+    if created_at is None:
+        return
+    table = ComplaintHeatmapCell.__table__
+    if delta < 0:
+        # A missing cell has nothing to take away (e.g. the cube was rebuilt meanwhile)
+        new_count = table.c.count + delta
+        connection.execute(
+            update(table)
+            .where(
+                table.c.bucket_date == created_at.date(),
+                table.c.hour == created_at.hour,
+                table.c.category == category,
+            )
+            .values(count=case((new_count < 0, 0), else_=new_count))
+        )
+        return
+    stmt = dialect_insert(connection, table).values(
+        bucket_date=created_at.date(),
+        day_of_week=created_at.weekday(),
+        hour=created_at.hour,
+        category=category,
+        count=delta,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["bucket_date", "hour", "category"],
+        set_={"count": table.c.count + stmt.excluded.count},
+    )
+    connection.execute(stmt)
+
+
+def _bump_heatmap_cells(connection, rows, sign: int):
+    """Move the counts of (created_at, category) rows, one statement per cell"""
+    cells = Counter(
+        (created_at.replace(minute=0, second=0, microsecond=0), category)
+        for created_at, category in rows
+        if created_at is not None
+    )
+    for (hour_start, category), count in cells.items():
+        bump_heatmap_cell(connection, hour_start, category, sign * count)
+
+
+@event.listens_for(Complaint, "after_insert")
+def _complaint_inserted(mapper, connection, target):
+    bump_heatmap_cell(connection, target.created_at, target.category, 1)
+
+
+@event.listens_for(Complaint, "after_update")
+def _complaint_updated(mapper, connection, target):
+    # Triage re-categorizes complaints and corrections move created_at; move the count with it
+    attrs = inspect(target).attrs
+    category, created_at = attrs.category.history, attrs.created_at.history
+    if not (category.has_changes() or created_at.has_changes()):
+        return
+    old_category = category.deleted[0] if category.deleted else target.category
+    old_created_at = created_at.deleted[0] if created_at.deleted else target.created_at
+    bump_heatmap_cell(connection, old_created_at, old_category, -1)
+    bump_heatmap_cell(connection, target.created_at, target.category, 1)
+
+
+@event.listens_for(Complaint, "after_delete")
+def _complaint_deleted(mapper, connection, target):
+    bump_heatmap_cell(connection, target.created_at, target.category, -1)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _complaint_bulk_statement(orm_execute_state):
+    # Bulk UPDATE/DELETE skips the mapper events above; move the counts of the rows it touches
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not Complaint:
+        return
+
+    touched = select(Complaint.id, Complaint.created_at, Complaint.category)
+    if orm_execute_state.is_executemany:
+        # Bulk UPDATE by primary key: one parameter set per complaint
+        ids = [params["id"] for params in orm_execute_state.parameters]
+        touched = touched.where(Complaint.id.in_(ids))
+    elif orm_execute_state.statement.whereclause is not None:
+        touched = touched.where(orm_execute_state.statement.whereclause)
+
+    connection = orm_execute_state.session.connection()
+    before = connection.execute(touched).all()
+    result = orm_execute_state.invoke_statement()
+    if not before:
+        return result
+
+    _bump_heatmap_cells(connection, [(row.created_at, row.category) for row in before], -1)
+    if orm_execute_state.is_update:
+        after = connection.execute(
+            select(Complaint.created_at, Complaint.category).where(
+                Complaint.id.in_([row.id for row in before])
+            )
+        ).all()
+        _bump_heatmap_cells(connection, after, 1)
+    logger.log_event(
+        "complaint_cube_bulk_adjusted",
+        level="DEBUG",
+        statement="update" if orm_execute_state.is_update else "delete",
+        complaints=len(before),
+    )
+    return result
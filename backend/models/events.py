@@ -3,7 +3,7 @@ Event Management Models
 Handles event creation, registration, leaderboards, and announcements
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Float, Boolean, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -93,6 +93,9 @@ class Event(Base):
     leaderboard = relationship("EventLeaderboard", back_populates="event", cascade="all, delete-orphan")
     announcements = relationship("EventAnnouncement", back_populates="event", cascade="all, delete-orphan")
 
+    # Keyset pagination order for event listings
+    __table_args__ = (Index("ix_events_start_date_id", "event_start_date", "id"),)
+
     def __repr__(self):
         return f"<Event(id={self.id}, name='{self.name}', category='{self.category}', status='{self.status}')>"
 
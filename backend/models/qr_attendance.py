@@ -3,9 +3,11 @@ QR-Based Attendance System Models with Geo-Fencing
 Ensures proxy-free attendance with location validation
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, Index
+from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta, timezone
+from backend.core.geo import geofence_check, haversine_m, within_radius
 from backend.database import Base
 import uuid
 import hashlib
@@ -70,11 +72,20 @@ class QRAttendanceSession(Base):
     # Metadata
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     closed_at = Column(DateTime(timezone=True), nullable=True)
+    proxy_analyzed_at = Column(DateTime(timezone=True), nullable=True)  # proxy-pattern job
+    stats_finalized_at = Column(DateTime(timezone=True), nullable=True)  # counted in subject stats
     notes = Column(Text, nullable=True)
     
     # Relationships
     attendance_records = relationship("QRAttendanceRecord", back_populates="session", cascade="all, delete-orphan")
 
+    # Keyset pagination order for a faculty member's sessions
+    __table_args__ = (
+        Index("ix_qr_attendance_sessions_faculty_created", "faculty_id", "created_at", "id"),
+        # Expiry sweeper: active sessions in qr_expires_at order
+        Index("ix_qr_attendance_sessions_active_expiry", "is_active", "qr_expires_at"),
+    )
+
     def __repr__(self):
         return f"<QRAttendanceSession(id={self.id}, subject='{self.subject_code}', faculty='{self.faculty_name}')>"
 
@@ -95,29 +106,29 @@ class QRAttendanceSession(Base):
 
     def calculate_distance(self, student_lat, student_lon):
         """Calculate distance between student and class center using Haversine formula"""
-        from math import radians, sin, cos, sqrt, atan2
-        
-        # Earth radius in meters
-        R = 6371000
-        
-        lat1 = radians(self.center_latitude)
-        lon1 = radians(self.center_longitude)
-        lat2 = radians(student_lat)
-        lon2 = radians(student_lon)
-        
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        
-        distance = R * c  # Distance in meters
-        return distance
+        return haversine_m(
+            self.center_latitude, self.center_longitude, student_lat, student_lon
+        )
 
     def is_within_geofence(self, student_lat, student_lon):
         """Check if student is within the geo-fenced area"""
-        distance = self.calculate_distance(student_lat, student_lon)
-        return distance <= self.geo_fence_radius_meters
+        return within_radius(
+            self.center_latitude,
+            self.center_longitude,
+            self.geo_fence_radius_meters,
+            student_lat,
+            student_lon,
+        )
+
+    def check_geofence(self, student_lat, student_lon):
+        """Distance from the class center and whether it is inside the fence, computed once"""
+        return geofence_check(
+            self.center_latitude,
+            self.center_longitude,
+            self.geo_fence_radius_meters,
+            student_lat,
+            student_lon,
+        )
 
     def generate_qr_hash(self):
         """Generate secure hash for QR validation"""
@@ -194,6 +205,11 @@ class QRAttendanceRecord(Base):
     # Relationships
     session = relationship("QRAttendanceSession", back_populates="attendance_records")
 
+    __table_args__ = (
+        # One record per student per session; also serves duplicate-scan lookups
+        Index("uq_qr_attendance_records_session_student", "session_id", "student_id", unique=True),
+    )
+
     def __repr__(self):
         return f"<QRAttendanceRecord(id={self.id}, student='{self.student_name}', status='{self.attendance_status}')>"
 
@@ -288,3 +304,69 @@ class DeviceFingerprint(Base):
 
     def __repr__(self):
         return f"<DeviceFingerprint(id={self.id}, student='{self.student_id}', device='{self.device_id}')>"
+
+
+class QRSubjectSessionsHeld(Base):
+    """
+    Closed, non-cancelled QR sessions per class cohort and subject
+    Maintained as sessions close so dashboards never count sessions
+    """
+    __tablename__ = "qr_subject_sessions_held"
+
+    id = Column(Integer, primary_key=True, index=True)
+    branch = Column(String(100), nullable=False)
+    semester = Column(String(20), nullable=False)
+    section = Column(String(50), nullable=False, default="")  # "" = whole branch/semester
+    subject_code = Column(String(50), nullable=False)
+    subject_name = Column(String(200), nullable=False)
+    held = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "branch", "semester", "section", "subject_code", name="uq_qr_subject_sessions_held"
+        ),
+    )
+
+
+class QRStudentSubjectStats(Base):
+    """
+    Sessions attended per student and subject, counted from closed sessions
+    """
+    __tablename__ = "qr_student_subject_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(String(50), nullable=False)
+    subject_code = Column(String(50), nullable=False)
+    subject_name = Column(String(200), nullable=False)
+    attended = Column(Integer, nullable=False, default=0)
+    late = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("student_id", "subject_code", name="uq_qr_student_subject_stats"),
+    )
+
+
+class QRClassRoster(Base):
+    """
+    Expected students per branch, semester and section
+    Loaded in bulk from CSV; absent lists are an anti-join against session records
+    """
+    __tablename__ = "qr_class_rosters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    branch = Column(String(100), nullable=False)
+    semester = Column(String(20), nullable=False)
+    section = Column(String(50), nullable=False, default="")  # "" = no section
+    roll_number = Column(String(50), nullable=False)
+    student_id = Column(String(50), nullable=False)
+    student_name = Column(String(200), nullable=False)
+    student_email = Column(String(200), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Also serves roster lookups by (branch, semester[, section])
+        UniqueConstraint(
+            "branch", "semester", "section", "roll_number", name="uq_qr_class_rosters_member"
+        ),
+    )
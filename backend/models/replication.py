@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer
+from backend.database import Base
+
+
+class ReplicationHeartbeat(Base):
+    """
+    Single-row clock written on the primary
+    Replicas serve their copy of it, so now - beat_at is their replication lag
+    """
+
+    __tablename__ = "replication_heartbeat"
+
+    id = Column(Integer, primary_key=True)
+    beat_at = Column(DateTime, nullable=False)
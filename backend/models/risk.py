@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from datetime import datetime
 from backend.database import Base
 
@@ -15,3 +15,9 @@ class RiskLog(Base):
     resolved = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Covers the GROUP BY behind /analytics/risk-distribution
+        Index("ix_risk_logs_resolved_type_severity", "resolved", "risk_type", "severity"),
+        Index("ix_risk_logs_student_resolved_type", "student_id", "resolved", "risk_type"),
+    )
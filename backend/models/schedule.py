@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from datetime import datetime
 from backend.database import Base
 
@@ -17,3 +17,10 @@ class Schedule(Base):
     is_active = Column(Integer, default=1)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        # Room-conflict lookups in SchedulerConflictAgent
+        Index(
+            "ix_schedules_location_active_window", "location", "is_active", "start_date", "end_date"
+        ),
+    )
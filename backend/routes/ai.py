@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from backend.database import get_db
+from backend.core.read_replicas import get_read_db
 from backend.schemas.ai import (
     AttendanceExplanationResponse,
     ComplaintSpikeExplanationResponse,
@@ -55,7 +55,7 @@ def ai_health_check():
 
 
 @router.get("/explain-attendance/{student_id}", response_model=AttendanceExplanationResponse)
-def explain_attendance_issues(student_id: int, days: int = 30, db: Session = Depends(get_db)):
+def explain_attendance_issues(student_id: int, days: int = 30, db: Session = Depends(get_read_db)):
     """
     Explain why a student's attendance has dropped
 
@@ -79,7 +79,7 @@ def explain_attendance_issues(student_id: int, days: int = 30, db: Session = Dep
 
 
 @router.get("/why-attendance-dropped/{student_id}")
-def why_attendance_dropped(student_id: int, days: int = 30, db: Session = Depends(get_db)):
+def why_attendance_dropped(student_id: int, days: int = 30, db: Session = Depends(get_read_db)):
     """
     Natural language explanation for why attendance dropped
     """
@@ -114,7 +114,7 @@ def why_attendance_dropped(student_id: int, days: int = 30, db: Session = Depend
 
 
 @router.get("/explain-complaints", response_model=ComplaintSpikeExplanationResponse)
-def explain_complaint_spike(days: int = 7, db: Session = Depends(get_db)):
+def explain_complaint_spike(days: int = 7, db: Session = Depends(get_read_db)):
     """
     Explain why complaints have increased
 
@@ -138,7 +138,7 @@ def explain_complaint_spike(days: int = 7, db: Session = Depends(get_db)):
 
 
 @router.get("/why-complaints-increased")
-def why_complaints_increased(days: int = 7, db: Session = Depends(get_db)):
+def why_complaints_increased(days: int = 7, db: Session = Depends(get_read_db)):
     """
     Natural language explanation for complaint spike
     """
@@ -172,7 +172,7 @@ def why_complaints_increased(days: int = 7, db: Session = Depends(get_db)):
 
 
 @router.get("/explain-risk/{risk_id}", response_model=RiskExplanationResponse)
-def explain_risk(risk_id: int, db: Session = Depends(get_db)):
+def explain_risk(risk_id: int, db: Session = Depends(get_read_db)):
     """
     Explain a risk and provide AI-driven insights
 
@@ -196,7 +196,7 @@ def explain_risk(risk_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/explain-risk-natural-language")
-def explain_risk_natural_language(risk_id: int, db: Session = Depends(get_db)):
+def explain_risk_natural_language(risk_id: int, db: Session = Depends(get_read_db)):
     """
     Natural language explanation for a specific risk
     """
@@ -324,7 +324,7 @@ def knowledge_base_info():
 
 
 @router.get("/insights/attendance-patterns")
-def attendance_patterns_insight(db: Session = Depends(get_db)):
+def attendance_patterns_insight(db: Session = Depends(get_read_db)):
     """
     Get AI insights about attendance patterns
     """
@@ -344,7 +344,7 @@ def attendance_patterns_insight(db: Session = Depends(get_db)):
 
 
 @router.get("/insights/complaint-patterns")
-def complaint_patterns_insight(db: Session = Depends(get_db)):
+def complaint_patterns_insight(db: Session = Depends(get_read_db)):
     """
     Get AI insights about complaint patterns
     """
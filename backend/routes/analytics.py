@@ -4,8 +4,10 @@ Trend detection, anomaly detection, and data analysis
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.core.read_replicas import get_read_db
 from backend.schemas.analytics import (
     AttendanceTrendResponse,
     ComplaintTrendResponse,
@@ -19,6 +21,7 @@ from backend.models.complaint import Complaint
 from backend.models.risk import RiskLog
 from backend.models.student import Student
 from backend.core.agents import TrendDetectionAgent, AnomalyDetectionAgent
+from backend.core.complaint_cube import load_heatmap, rebuild_complaint_cube
 from datetime import datetime, timedelta
 from typing import List, Dict
 from collections import defaultdict
@@ -27,7 +30,7 @@ router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 
 @router.get("/attendance-trends/{student_id}", response_model=AttendanceTrendResponse)
-def get_attendance_trends(student_id: int, days: int = 30, db: Session = Depends(get_db)):
+def get_attendance_trends(student_id: int, days: int = 30, db: Session = Depends(get_read_db)):
     """
     Get attendance trends for a specific student
     Includes daily data, moving average, and trend direction
@@ -50,68 +53,25 @@ def get_attendance_trends(student_id: int, days: int = 30, db: Session = Depends
 
 
 @router.get("/complaint-heatmap", response_model=ComplaintHeatmapResponse)
-def get_complaint_heatmap(days: int = 30, db: Session = Depends(get_db)):
+def get_complaint_heatmap(days: int = 30, db: Session = Depends(get_read_db)):
     """
     Get complaint filing patterns as heatmap
     Shows when complaints are filed most frequently (day/hour)
+    Served from the pre-aggregated cube; the window is rounded down to whole days
     """
     try:
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        since = (datetime.utcnow() - timedelta(days=days)).date()
+        heatmap = load_heatmap(db, since)
 
-        complaints = db.query(Complaint).filter(Complaint.created_at >= cutoff_date).all()
-
-        if not complaints:
+        if heatmap.total == 0:
             raise HTTPException(status_code=404, detail="No complaint data found")
 
-        # Build heatmap (day of week × hour of day)
-        heatmap_data = defaultdict(lambda: defaultdict(int))
-        category_counts = defaultdict(int)
-
-        for complaint in complaints:
-            day_of_week = complaint.created_at.strftime("%A")
-            hour = complaint.created_at.hour
-            heatmap_data[day_of_week][hour] += 1
-            category_counts[complaint.category] += 1
-
-        # Convert to list format with intensity
-        max_count = max(
-            [count for day_dict in heatmap_data.values() for count in day_dict.values()], default=1
-        )
-
-        heatmap_list = []
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-            for hour in range(24):
-                count = heatmap_data.get(day, {}).get(hour, 0)
-                intensity = count / max_count if max_count > 0 else 0
-                heatmap_list.append(
-                    {
-                        "day_of_week": day,
-                        "hour": hour,
-                        "count": count,
-                        "intensity": round(intensity, 2),
-                    }
-                )
-
-        # Find top complaint times
-        time_counts = defaultdict(int)
-        for complaint in complaints:
-            time_key = f"{complaint.created_at.strftime('%A')} {complaint.created_at.hour}:00"
-            time_counts[time_key] += 1
-
-        top_times = sorted(
-            [{"time": k, "count": v} for k, v in time_counts.items()],
-            key=lambda x: x["count"],
-            reverse=True,
-        )[:5]
-
         return {
             "period_days": days,
-            "total_complaints": len(complaints),
-            "heatmap": heatmap_list,
-            "top_categories": dict(
-                sorted(category_counts.items(), key=lambda x: x[1], reverse=True)
-            ),
-            "top_times": top_times,
+            "total_complaints": heatmap.total,
+            "heatmap": heatmap.cells(),
+            "top_categories": heatmap.top_categories(),
+            "top_times": heatmap.top_times(),
         }
     except HTTPException:
         raise
@@ -119,68 +79,30 @@ def get_complaint_heatmap(days: int = 30, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error generating heatmap: {str(e)}")
 
 
+@router.post("/complaint-heatmap/rebuild")
+def rebuild_complaint_heatmap(db: Session = Depends(get_db)):
+    """
+    Rebuild the complaint heatmap cube from the complaints table
+    Run after bulk or Core UPDATE/DELETE on complaints, which bypass the ORM
+    events that keep the cube current
+    """
+    try:
+        cells = rebuild_complaint_cube(db)
+        db.commit()
+        return {"status": "complaint heatmap rebuilt", "cells": cells}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error rebuilding heatmap: {str(e)}")
+
+
 @router.get("/risk-distribution", response_model=RiskDistributionResponse)
-def get_risk_distribution(db: Session = Depends(get_db)):
+def get_risk_distribution(db: Session = Depends(get_read_db)):
     """
     Get distribution of risks by type and severity
     Shows which risk types are most common
     """
     try:
-        all_risks = db.query(RiskLog).all()
-        unresolved_risks = db.query(RiskLog).filter(RiskLog.resolved == 0).all()
-        resolved_risks = db.query(RiskLog).filter(RiskLog.resolved == 1).all()
-
-        if not all_risks:
-            raise HTTPException(status_code=404, detail="No risk data found")
-
-        # Distribution by risk type
-        risk_type_counts = defaultdict(int)
-        risk_severity_breakdown = defaultdict(lambda: defaultdict(int))
-        severity_distribution = defaultdict(int)
-
-        for risk in all_risks:
-            risk_type_counts[risk.risk_type] += 1
-            risk_severity_breakdown[risk.risk_type][risk.severity] += 1
-            severity_distribution[risk.severity] += 1
-
-        # Build distribution list
-        total_risks = len(all_risks)
-        distribution = []
-        for risk_type, count in sorted(risk_type_counts.items(), key=lambda x: x[1], reverse=True):
-            percentage = (count / total_risks) * 100 if total_risks > 0 else 0
-            distribution.append(
-                {
-                    "risk_type": risk_type,
-                    "count": count,
-                    "percentage": round(percentage, 2),
-                    "severity_breakdown": dict(risk_severity_breakdown[risk_type]),
-                }
-            )
-
-        # Get top affected students
-        student_risk_counts = defaultdict(int)
-        for risk in all_risks:
-            if risk.student_id:
-                student_risk_counts[risk.student_id] += 1
-
-        top_students = []
-        for student_id, count in sorted(
-            student_risk_counts.items(), key=lambda x: x[1], reverse=True
-        )[:5]:
-            student = db.query(Student).filter(Student.id == student_id).first()
-            if student:
-                top_students.append(
-                    {"student_id": student_id, "student_name": student.name, "risk_count": count}
-                )
-
-        return {
-            "total_risks": total_risks,
-            "unresolved_risks": len(unresolved_risks),
-            "resolved_risks": len(resolved_risks),
-            "risk_distribution": distribution,
-            "severity_distribution": dict(severity_distribution),
-            "top_affected_students": top_students,
-        }
+        return _aggregate_risk_distribution(db)
     except HTTPException:
         raise
     except Exception as e:
@@ -188,7 +110,7 @@ def get_risk_distribution(db: Session = Depends(get_db)):
 
 
 @router.get("/complaint-trends", response_model=ComplaintTrendResponse)
-def get_complaint_trends(days: int = 30, db: Session = Depends(get_db)):
+def get_complaint_trends(days: int = 30, db: Session = Depends(get_read_db)):
     """
     Get complaint trends over time
     Weekly aggregation with moving averages
@@ -249,7 +171,7 @@ def detect_anomalies(db: Session = Depends(get_db)):
 
 
 @router.get("/anomalies", response_model=AnalyticsAnomalies)
-def get_recent_anomalies(days: int = 7, db: Session = Depends(get_db)):
+def get_recent_anomalies(days: int = 7, db: Session = Depends(get_read_db)):
     """
     Get recent anomalies detected by system
     """
@@ -301,67 +223,139 @@ def get_recent_anomalies(days: int = 7, db: Session = Depends(get_db)):
 
 
 @router.get("/summary")
-def get_analytics_summary(db: Session = Depends(get_db)):
+def get_analytics_summary(db: Session = Depends(get_read_db)):
     """
     Get overall analytics summary
     Key metrics and insights
     """
     try:
-        # Overall metrics
-        total_students = db.query(Student).count()
-        total_attendance_records = db.query(Attendance).count()
-        total_complaints = db.query(Complaint).count()
-        total_risks = db.query(RiskLog).count()
-
-        # Recent metrics (last 7 days)
         week_ago = datetime.utcnow() - timedelta(days=7)
-        week_attendance = db.query(Attendance).filter(Attendance.date >= week_ago).count()
-        week_complaints = db.query(Complaint).filter(Complaint.created_at >= week_ago).count()
-        week_risks = db.query(RiskLog).filter(RiskLog.created_at >= week_ago).count()
 
-        # Attendance stats
-        attendance_records = db.query(Attendance).all()
-        present_count = sum(1 for a in attendance_records if a.status == "Present")
-        absent_count = sum(1 for a in attendance_records if a.status == "Absent")
-        late_count = sum(1 for a in attendance_records if a.status == "Late")
-
-        # Risk stats
-        all_risks = db.query(RiskLog).all()
-        unresolved_risks = db.query(RiskLog).filter(RiskLog.resolved == 0).count()
-
-        # Complaint stats
-        pending_complaints = db.query(Complaint).filter(Complaint.status == "Pending").count()
-        resolved_complaints = db.query(Complaint).filter(Complaint.status == "Resolved").count()
+        # One aggregate pass per table; no ORM rows are materialized
+        total_students = db.query(func.count(Student.id)).scalar()
+
+        attendance_stats = db.query(
+            func.count(Attendance.id).label("total"),
+            _count_where(Attendance.date >= week_ago).label("week"),
+            _count_where(Attendance.status == "Present").label("present"),
+            _count_where(Attendance.status == "Absent").label("absent"),
+            _count_where(Attendance.status == "Late").label("late"),
+        ).one()
+
+        complaint_stats = db.query(
+            func.count(Complaint.id).label("total"),
+            _count_where(Complaint.created_at >= week_ago).label("week"),
+            _count_where(Complaint.status == "Pending").label("pending"),
+            _count_where(Complaint.status == "Resolved").label("resolved"),
+        ).one()
+
+        risk_stats = db.query(
+            func.count(RiskLog.id).label("total"),
+            _count_where(RiskLog.created_at >= week_ago).label("week"),
+            _count_where(RiskLog.resolved == 0).label("unresolved"),
+        ).one()
 
         return {
             "timestamp": datetime.utcnow(),
             "overall_metrics": {
                 "total_students": total_students,
-                "total_attendance_records": total_attendance_records,
-                "total_complaints": total_complaints,
-                "total_risks": total_risks,
+                "total_attendance_records": attendance_stats.total,
+                "total_complaints": complaint_stats.total,
+                "total_risks": risk_stats.total,
             },
             "weekly_metrics": {
-                "attendance_records": week_attendance,
-                "complaints": week_complaints,
-                "risks": week_risks,
+                "attendance_records": attendance_stats.week,
+                "complaints": complaint_stats.week,
+                "risks": risk_stats.week,
             },
             "attendance_breakdown": {
-                "present": present_count,
-                "absent": absent_count,
-                "late": late_count,
-                "total": len(attendance_records),
+                "present": attendance_stats.present,
+                "absent": attendance_stats.absent,
+                "late": attendance_stats.late,
+                "total": attendance_stats.total,
             },
             "complaint_breakdown": {
-                "pending": pending_complaints,
-                "resolved": resolved_complaints,
-                "total": total_complaints,
+                "pending": complaint_stats.pending,
+                "resolved": complaint_stats.resolved,
+                "total": complaint_stats.total,
             },
             "risk_summary": {
-                "total": total_risks,
-                "unresolved": unresolved_risks,
-                "resolved": total_risks - unresolved_risks,
+                "total": risk_stats.total,
+                "unresolved": risk_stats.unresolved,
+                "resolved": risk_stats.total - risk_stats.unresolved,
             },
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
+
+
+# ============== Helper Functions ==============
+
+
+def _count_where(condition):
+    """Conditional COUNT that renders portably (SUM over CASE) on SQLite and Postgres"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _aggregate_risk_distribution(db: Session, top_students: int = 5) -> dict:
+    """
+    Risk distribution from one GROUP BY (risk_type, severity, resolved) and one
+    batched top-students query, served by ix_risk_logs_resolved_type_severity
+    """
+    groups = (
+        db.query(RiskLog.risk_type, RiskLog.severity, RiskLog.resolved, func.count(RiskLog.id))
+        .group_by(RiskLog.resolved, RiskLog.risk_type, RiskLog.severity)
+        .all()
+    )
+
+    if not groups:
+        raise HTTPException(status_code=404, detail="No risk data found")
+
+    risk_type_counts = defaultdict(int)
+    risk_severity_breakdown = defaultdict(lambda: defaultdict(int))
+    severity_distribution = defaultdict(int)
+    unresolved_risks = 0
+
+    for risk_type, severity, resolved, count in groups:
+        risk_type_counts[risk_type] += count
+        risk_severity_breakdown[risk_type][severity] += count
+        severity_distribution[severity] += count
+        if resolved == 0:
+            unresolved_risks += count
+
+    total_risks = sum(risk_type_counts.values())
+    distribution = [
+        {
+            "risk_type": risk_type,
+            "count": count,
+            "percentage": round(count / total_risks * 100, 2),
+            "severity_breakdown": dict(risk_severity_breakdown[risk_type]),
+        }
+        for risk_type, count in sorted(risk_type_counts.items(), key=lambda x: x[1], reverse=True)
+    ]
+
+    per_student = (
+        db.query(RiskLog.student_id, func.count(RiskLog.id).label("risk_count"))
+        .filter(RiskLog.student_id.isnot(None))
+        .group_by(RiskLog.student_id)
+        .subquery()
+    )
+    top_affected = (
+        db.query(Student.id, Student.name, per_student.c.risk_count)
+        .join(per_student, per_student.c.student_id == Student.id)
+        .order_by(per_student.c.risk_count.desc(), Student.id)
+        .limit(top_students)
+        .all()
+    )
+
+    return {
+        "total_risks": total_risks,
+        "unresolved_risks": unresolved_risks,
+        "resolved_risks": total_risks - unresolved_risks,
+        "risk_distribution": distribution,
+        "severity_distribution": dict(severity_distribution),
+        "top_affected_students": [
+            {"student_id": student_id, "student_name": name, "risk_count": count}
+            for student_id, name, count in top_affected
+        ],
+    }
@@ -1,28 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from backend.database import get_db
-from backend.schemas.attendance import AttendanceCreate, AttendanceOut
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.database import get_async_db
+from backend.core.pagination import CursorParams, paginate_async
+from backend.schemas.attendance import (
+    AttendanceBulkCreate,
+    AttendanceBulkResult,
+    AttendanceCreate,
+    AttendanceOut,
+)
 from backend.models.attendance import Attendance
 from backend.core.event_bus import EventType, event_bus, Event
 from datetime import datetime
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
+VALID_STATUSES = ["Present", "Absent", "Late", "Excused"]
+
 
 @router.post("/", response_model=AttendanceOut, status_code=status.HTTP_201_CREATED)
-def record_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db)):
+async def record_attendance(attendance: AttendanceCreate, db: AsyncSession = Depends(get_async_db)):
     """Record attendance for a student"""
-    if attendance.status not in ["Present", "Absent", "Late", "Excused"]:
+    if attendance.status not in VALID_STATUSES:
         raise HTTPException(status_code=400, detail="Invalid attendance status")
 
     new_attendance = Attendance(
         student_id=attendance.student_id, status=attendance.status, remarks=attendance.remarks
     )
     db.add(new_attendance)
-    db.commit()
-    db.refresh(new_attendance)
+    await db.commit()
+    await db.refresh(new_attendance)
 
-    # Publish event to trigger agents
+    # Publish event to trigger agents (agents use sync sessions, keep them off the event loop)
     event = Event(
         EventType.ATTENDANCE_MARKED,
         {
@@ -31,58 +41,119 @@ def record_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db
             "attendance_id": new_attendance.id,
         },
     )
-    event_bus.publish(event)
+    await run_in_threadpool(event_bus.publish, event)
 
     return new_attendance
 
 
+@router.post("/bulk", response_model=AttendanceBulkResult, status_code=status.HTTP_201_CREATED)
+async def record_attendance_bulk(
+    roster: AttendanceBulkCreate, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Record attendance for a whole class in one transaction
+    Rows go in as a single executemany INSERT and the risk agent evaluates
+    the roster from one batched event
+    """
+    invalid = {r.status for r in roster.records} - set(VALID_STATUSES)
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid attendance status: {sorted(invalid)}")
+
+    student_ids = [r.student_id for r in roster.records]
+    if len(set(student_ids)) != len(student_ids):
+        raise HTTPException(status_code=400, detail="Duplicate student in roster")
+
+    now = datetime.utcnow()
+    marked_date = roster.date or now
+    await db.execute(
+        insert(Attendance),
+        [
+            {
+                "student_id": r.student_id,
+                "status": r.status,
+                "remarks": r.remarks,
+                "date": marked_date,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for r in roster.records
+        ],
+    )
+    await db.commit()
+
+    event = Event(
+        EventType.ATTENDANCE_BULK_MARKED,
+        {
+            "student_ids": student_ids,
+            "date": marked_date.isoformat(),
+            "class_name": roster.class_name,
+        },
+    )
+    await run_in_threadpool(event_bus.publish, event)
+
+    return AttendanceBulkResult(
+        inserted=len(student_ids), date=marked_date, class_name=roster.class_name
+    )
+
+
 @router.get("/", response_model=list[AttendanceOut])
-def get_all_attendance(db: Session = Depends(get_db)):
-    """Get all attendance records"""
-    return db.query(Attendance).all()
+async def get_all_attendance(
+    response: Response, page: CursorParams = Depends(), db: AsyncSession = Depends(get_async_db)
+):
+    """Get all attendance records (cursor paginated)"""
+    return await paginate_async(db, select(Attendance), (Attendance.id,), page, response)
 
 
 @router.get("/student/{student_id}", response_model=list[AttendanceOut])
-def get_student_attendance(student_id: int, db: Session = Depends(get_db)):
-    """Get attendance records for a specific student"""
-    records = db.query(Attendance).filter(Attendance.student_id == student_id).all()
-    if not records:
+async def get_student_attendance(
+    student_id: int,
+    response: Response,
+    page: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get attendance records for a specific student, newest first (cursor paginated)"""
+    stmt = select(Attendance).where(Attendance.student_id == student_id)
+    # (date, id) seeks along ix_attendance_student_date
+    records = await paginate_async(
+        db, stmt, (Attendance.date, Attendance.id), page, response, descending=True
+    )
+    if not records and not page.cursor:
         raise HTTPException(status_code=404, detail="No attendance records found")
     return records
 
 
 @router.get("/{attendance_id}", response_model=AttendanceOut)
-def get_attendance(attendance_id: int, db: Session = Depends(get_db)):
+async def get_attendance(attendance_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific attendance record"""
-    record = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    record = await db.get(Attendance, attendance_id)
     if not record:
         raise HTTPException(status_code=404, detail="Attendance record not found")
     return record
 
 
 @router.put("/{attendance_id}", response_model=AttendanceOut)
-def update_attendance(
-    attendance_id: int, attendance: AttendanceCreate, db: Session = Depends(get_db)
+async def update_attendance(
+    attendance_id: int, attendance: AttendanceCreate, db: AsyncSession = Depends(get_async_db)
 ):
     """Update an attendance record"""
-    record = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    record = await db.get(Attendance, attendance_id)
     if not record:
         raise HTTPException(status_code=404, detail="Attendance record not found")
 
     record.status = attendance.status
     record.remarks = attendance.remarks
     record.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(record)
+    await db.commit()
+    await db.refresh(record)
     return record
 
 
 @router.delete("/{attendance_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_attendance(attendance_id: int, db: Session = Depends(get_db)):
+async def delete_attendance(attendance_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete an attendance record"""
-    record = db.query(Attendance).filter(Attendance.id == attendance_id).first()
+    record = await db.get(Attendance, attendance_id)
     if not record:
         raise HTTPException(status_code=404, detail="Attendance record not found")
-    db.delete(record)
-    db.commit()
+    await db.delete(record)
+    await db.commit()
     return None
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.core.pagination import CursorParams, paginate
 from backend.models.club import Club, ClubActivity, ClubMember, ClubAttendance
 from backend.schemas.club import (
     ClubCreate,
@@ -41,10 +43,9 @@ def create_club(club: ClubCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[ClubResponse])
-def list_clubs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all clubs with pagination"""
-    clubs = db.query(Club).offset(skip).limit(limit).all()
-    return clubs
+def list_clubs(response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)):
+    """List all clubs (cursor paginated)"""
+    return paginate(db, select(Club), (Club.id,), page, response)
 
 
 @router.get("/{club_id}", response_model=ClubDetailResponse)
@@ -145,21 +146,18 @@ def create_activity(club_id: int, activity: ClubActivityCreate, db: Session = De
 
 @router.get("/{club_id}/activities", response_model=List[ClubActivityResponse])
 def list_club_activities(
-    club_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    club_id: int,
+    response: Response,
+    page: CursorParams = Depends(),
+    db: Session = Depends(get_db),
 ):
-    """List all activities for a club"""
+    """List all activities for a club (cursor paginated)"""
     club = db.query(Club).filter(Club.id == club_id).first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
-    activities = (
-        db.query(ClubActivity)
-        .filter(ClubActivity.club_id == club_id)
-        .offset(skip)
-        .limit(limit)
-        .all()
-    )
-    return activities
+    stmt = select(ClubActivity).where(ClubActivity.club_id == club_id)
+    return paginate(db, stmt, (ClubActivity.id,), page, response)
 
 
 @router.get("/activities/{activity_id}", response_model=ClubActivityDetailResponse)
@@ -257,16 +255,19 @@ def add_member(club_id: int, member: ClubMemberCreate, db: Session = Depends(get
 
 
 @router.get("/{club_id}/members", response_model=List[ClubMemberResponse])
-def list_club_members(club_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all members of a club"""
+def list_club_members(
+    club_id: int,
+    response: Response,
+    page: CursorParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    """List all members of a club (cursor paginated)"""
     club = db.query(Club).filter(Club.id == club_id).first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
-    members = (
-        db.query(ClubMember).filter(ClubMember.club_id == club_id).offset(skip).limit(limit).all()
-    )
-    return members
+    stmt = select(ClubMember).where(ClubMember.club_id == club_id)
+    return paginate(db, stmt, (ClubMember.id,), page, response)
 
 
 # ==================== CLUB ATTENDANCE (NEW) ====================
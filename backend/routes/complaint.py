@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.core.pagination import CursorParams, paginate
 from backend.schemas.complaint import ComplaintCreate, ComplaintOut, ComplaintUpdate
 from backend.models.complaint import Complaint
 from backend.core.event_bus import EventType, event_bus, Event
@@ -46,16 +48,24 @@ def file_complaint(complaint: ComplaintCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[ComplaintOut])
-def get_all_complaints(db: Session = Depends(get_db)):
-    """Get all complaints"""
-    return db.query(Complaint).all()
+def get_all_complaints(
+    response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)
+):
+    """Get all complaints (cursor paginated)"""
+    return paginate(db, select(Complaint), (Complaint.id,), page, response)
 
 
 @router.get("/student/{student_id}", response_model=list[ComplaintOut])
-def get_student_complaints(student_id: int, db: Session = Depends(get_db)):
-    """Get complaints filed by a specific student"""
-    complaints = db.query(Complaint).filter(Complaint.student_id == student_id).all()
-    if not complaints:
+def get_student_complaints(
+    student_id: int,
+    response: Response,
+    page: CursorParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    """Get complaints filed by a specific student (cursor paginated)"""
+    stmt = select(Complaint).where(Complaint.student_id == student_id)
+    complaints = paginate(db, stmt, (Complaint.id,), page, response)
+    if not complaints and not page.cursor:
         raise HTTPException(status_code=404, detail="No complaints found")
     return complaints
 
@@ -3,9 +3,15 @@ Dashboard API Routes
 Exposes aggregated data for frontend consumption
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from backend.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from backend.database import supports_window_functions
+from backend.core.read_replicas import get_async_read_db
+from backend.core.caching import cache_manager
+from backend.core.config import settings
 from backend.models.risk import RiskLog
 from backend.models.complaint import Complaint
 from backend.models.schedule import Schedule
@@ -17,6 +23,8 @@ from pydantic import BaseModel
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+RISK_SUMMARY_CACHE_PREFIX = "dashboard:risks:students"
+
 
 class RiskStudentSummary(BaseModel):
     student_id: int
@@ -44,83 +52,63 @@ class ScheduleConflictSummary(BaseModel):
 
 
 @router.get("/risks/students", response_model=List[RiskStudentSummary])
-def get_students_at_risk(db: Session = Depends(get_db)):
+async def get_students_at_risk(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    use_cache: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
     Get all students with active risk flags
-    Aggregates risk data for dashboard display
+    Aggregates risk data for dashboard display in a single query,
+    optionally served from the cache layer
     """
-    try:
-        # Get all unresolved risks grouped by student
-        unresolved_risks = db.query(RiskLog).filter(RiskLog.resolved == 0).all()
-
-        student_risks = {}
-        for risk in unresolved_risks:
-            if risk.student_id:
-                if risk.student_id not in student_risks:
-                    student_risks[risk.student_id] = []
-                student_risks[risk.student_id].append(risk)
-
-        # Build summary
-        summaries = []
-        for student_id, risks in student_risks.items():
-            student = db.query(Student).filter(Student.id == student_id).first()
-            if not student:
-                continue
-
-            # Count by severity
-            severity_counts = {
-                "High": sum(1 for r in risks if r.severity == "High"),
-                "Medium": sum(1 for r in risks if r.severity == "Medium"),
-                "Low": sum(1 for r in risks if r.severity == "Low"),
-            }
-
-            # Get latest risk
-            latest = max(risks, key=lambda x: x.created_at)
-
-            summaries.append(
-                RiskStudentSummary(
-                    student_id=student_id,
-                    student_name=student.name,
-                    risk_count=len(risks),
-                    risk_levels=severity_counts,
-                    latest_risk=latest.description,
-                    last_risk_date=latest.created_at,
-                )
-            )
+    cache_key = cache_manager.generate_key(RISK_SUMMARY_CACHE_PREFIX, skip=skip, limit=limit)
+    if use_cache:
+        cached_summaries = await cache_manager.get(cache_key)
+        if cached_summaries is not None:
+            return cached_summaries
 
-        # Sort by risk count (descending)
-        summaries.sort(key=lambda x: x.risk_count, reverse=True)
-        return summaries
+    try:
+        rows = (await db.execute(_students_at_risk_stmt(db.bind, skip, limit))).all()
+        summaries = _risk_summaries(rows)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching risks: {str(e)}")
 
+    if use_cache:
+        await cache_manager.set(
+            cache_key, jsonable_encoder(summaries), ttl=settings.DASHBOARD_CACHE_TTL
+        )
+    return summaries
+
 
 @router.get("/complaints/priority", response_model=ComplaintPrioritySummary)
-def get_complaints_by_priority(db: Session = Depends(get_db)):
+async def get_complaints_by_priority(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get complaint summary by priority and status
     Dashboard widget data
     """
     try:
-        all_complaints = db.query(Complaint).all()
-
-        summary = ComplaintPrioritySummary(
-            total=len(all_complaints),
-            critical=sum(1 for c in all_complaints if c.priority == "Urgent"),
-            high=sum(1 for c in all_complaints if c.priority == "High"),
-            medium=sum(1 for c in all_complaints if c.priority == "Normal"),
-            low=sum(1 for c in all_complaints if c.priority == "Low"),
-            pending=sum(1 for c in all_complaints if c.status == "Pending"),
-            resolved=sum(1 for c in all_complaints if c.status == "Resolved"),
-        )
-
-        return summary
+        counts = (
+            await db.execute(
+                select(
+                    func.count(Complaint.id).label("total"),
+                    _count_where(Complaint.priority, "Urgent").label("critical"),
+                    _count_where(Complaint.priority, "High").label("high"),
+                    _count_where(Complaint.priority, "Normal").label("medium"),
+                    _count_where(Complaint.priority, "Low").label("low"),
+                    _count_where(Complaint.status, "Pending").label("pending"),
+                    _count_where(Complaint.status, "Resolved").label("resolved"),
+                )
+            )
+        ).one()
+        return ComplaintPrioritySummary(**counts._asdict())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching complaints: {str(e)}")
 
 
 @router.get("/schedule/conflicts", response_model=ScheduleConflictSummary)
-def get_schedule_conflicts(db: Session = Depends(get_db)):
+async def get_schedule_conflicts(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get schedule conflict summary
     Lists all detected conflicts
@@ -128,12 +116,14 @@ def get_schedule_conflicts(db: Session = Depends(get_db)):
     try:
         # Get all conflict risk logs
         conflicts = (
-            db.query(RiskLog)
-            .filter(
-                RiskLog.risk_type == "Academic", RiskLog.resolved == 0, RiskLog.student_id == None
+            await db.scalars(
+                select(RiskLog).where(
+                    RiskLog.risk_type == "Academic",
+                    RiskLog.resolved == 0,
+                    RiskLog.student_id.is_(None),
+                )
             )
-            .all()
-        )
+        ).all()
 
         conflict_count = len(conflicts)
 
@@ -167,7 +157,9 @@ def get_schedule_conflicts(db: Session = Depends(get_db)):
 
 
 @router.get("/attendance/low-attendance")
-def get_low_attendance_students(threshold: float = 0.75, db: Session = Depends(get_db)):
+async def get_low_attendance_students(
+    threshold: float = 0.75, db: AsyncSession = Depends(get_async_read_db)
+):
     """
     Get students with attendance below threshold
     Useful for dean/admin dashboard
@@ -176,31 +168,37 @@ def get_low_attendance_students(threshold: float = 0.75, db: Session = Depends(g
         LOOKBACK_DAYS = 30
         cutoff_date = datetime.utcnow() - timedelta(days=LOOKBACK_DAYS)
 
-        students = db.query(Student).all()
-        low_attendance = []
-
-        for student in students:
-            records = (
-                db.query(Attendance)
-                .filter(Attendance.student_id == student.id, Attendance.date >= cutoff_date)
-                .all()
+        # One grouped query instead of a round trip per student
+        rows = (
+            await db.execute(
+                select(
+                    Student.id,
+                    Student.name,
+                    Student.department,
+                    func.count(Attendance.id).label("total"),
+                    func.sum(case((Attendance.status == "Present", 1), else_=0)).label("present"),
+                )
+                .join(Attendance, Attendance.student_id == Student.id)
+                .where(Attendance.date >= cutoff_date)
+                .group_by(Student.id, Student.name, Student.department)
             )
+        ).all()
+        low_attendance = []
 
-            if records:
-                present_count = sum(1 for r in records if r.status == "Present")
-                ratio = present_count / len(records)
-
-                if ratio < threshold:
-                    low_attendance.append(
-                        {
-                            "student_id": student.id,
-                            "student_name": student.name,
-                            "attendance_percentage": round(ratio * 100, 2),
-                            "total_classes": len(records),
-                            "classes_attended": present_count,
-                            "department": student.department,
-                        }
-                    )
+        for row in rows:
+            ratio = row.present / row.total
+
+            if ratio < threshold:
+                low_attendance.append(
+                    {
+                        "student_id": row.id,
+                        "student_name": row.name,
+                        "attendance_percentage": round(ratio * 100, 2),
+                        "total_classes": row.total,
+                        "classes_attended": row.present,
+                        "department": row.department,
+                    }
+                )
 
         # Sort by attendance percentage
         low_attendance.sort(key=lambda x: x["attendance_percentage"])
@@ -210,17 +208,21 @@ def get_low_attendance_students(threshold: float = 0.75, db: Session = Depends(g
 
 
 @router.get("/summary")
-def get_dashboard_summary(db: Session = Depends(get_db)):
+async def get_dashboard_summary(db: AsyncSession = Depends(get_async_read_db)):
     """
     Get overall dashboard summary statistics
     """
     try:
-        students_total = db.query(Student).count()
-        students_at_risk = (
-            db.query(RiskLog).filter(RiskLog.resolved == 0).distinct(RiskLog.student_id).count()
+        students_total = await db.scalar(select(func.count(Student.id)))
+        students_at_risk = await db.scalar(
+            select(func.count(func.distinct(RiskLog.student_id))).where(RiskLog.resolved == 0)
+        )
+        complaints_pending = await db.scalar(
+            select(func.count(Complaint.id)).where(Complaint.status == "Pending")
+        )
+        schedules_active = await db.scalar(
+            select(func.count(Schedule.id)).where(Schedule.is_active == 1)
         )
-        complaints_pending = db.query(Complaint).filter(Complaint.status == "Pending").count()
-        schedules_active = db.query(Schedule).filter(Schedule.is_active == 1).count()
 
         return {
             "total_students": students_total,
@@ -231,3 +233,97 @@ def get_dashboard_summary(db: Session = Depends(get_db)):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching summary: {str(e)}")
+
+
+# ============== Helper Functions ==============
+
+
+def _count_where(column, value):
+    """Rows where column == value, counted inside an aggregate SELECT (0 on no rows)"""
+    return func.coalesce(func.sum(case((column == value, 1), else_=0)), 0)
+
+
+def _students_at_risk_stmt(bind, skip: int, limit: int):
+    """
+    Per-student severity counts and latest unresolved risk in one round trip.
+    Uses ROW_NUMBER() to pick the latest risk where the database supports window
+    functions and a correlated subquery otherwise.
+    """
+    unresolved = and_(RiskLog.resolved == 0, RiskLog.student_id.isnot(None))
+
+    counts = (
+        select(
+            RiskLog.student_id.label("student_id"),
+            func.count(RiskLog.id).label("risk_count"),
+            func.sum(case((RiskLog.severity == "High", 1), else_=0)).label("high"),
+            func.sum(case((RiskLog.severity == "Medium", 1), else_=0)).label("medium"),
+            func.sum(case((RiskLog.severity == "Low", 1), else_=0)).label("low"),
+        )
+        .where(unresolved)
+        .group_by(RiskLog.student_id)
+        .subquery("risk_counts")
+    )
+
+    if supports_window_functions(bind):
+        ranked = (
+            select(
+                RiskLog.student_id.label("student_id"),
+                RiskLog.description.label("description"),
+                RiskLog.created_at.label("created_at"),
+                func.row_number()
+                .over(
+                    partition_by=RiskLog.student_id,
+                    order_by=(RiskLog.created_at.desc(), RiskLog.id.desc()),
+                )
+                .label("rank"),
+            )
+            .where(unresolved)
+            .subquery("ranked_risks")
+        )
+        latest_description = ranked.c.description
+        latest_created_at = ranked.c.created_at
+        latest_join = (ranked, and_(ranked.c.student_id == counts.c.student_id, ranked.c.rank == 1))
+    else:
+        latest_risk = aliased(RiskLog)
+        latest_id = (
+            select(RiskLog.id)
+            .where(unresolved, RiskLog.student_id == counts.c.student_id)
+            .order_by(RiskLog.created_at.desc(), RiskLog.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        latest_description = latest_risk.description
+        latest_created_at = latest_risk.created_at
+        latest_join = (latest_risk, latest_risk.id == latest_id)
+
+    return (
+        select(
+            Student.id,
+            Student.name,
+            counts.c.risk_count,
+            counts.c.high,
+            counts.c.medium,
+            counts.c.low,
+            latest_description,
+            latest_created_at,
+        )
+        .join(counts, counts.c.student_id == Student.id)
+        .join(*latest_join)
+        .order_by(counts.c.risk_count.desc(), Student.id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def _risk_summaries(rows) -> List[RiskStudentSummary]:
+    return [
+        RiskStudentSummary(
+            student_id=row.id,
+            student_name=row.name,
+            risk_count=row.risk_count,
+            risk_levels={"High": row.high, "Medium": row.medium, "Low": row.low},
+            latest_risk=row.description,
+            last_risk_date=row.created_at,
+        )
+        for row in rows
+    ]
@@ -3,13 +3,14 @@ Event Management API Routes
 Handles events, registrations, leaderboards, and announcements
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, select
 from typing import List, Optional
 from datetime import datetime
 
 from backend.database import get_db
+from backend.core.pagination import CursorParams, paginate
 from backend.models.events import (
     Event, EventRegistration, EventLeaderboard, EventAnnouncement,
     EventCategory, EventStatus, RegistrationStatus
@@ -73,24 +74,25 @@ def create_event(event_data: EventCreate, db: Session = Depends(get_db)):
 
 @router.get("/", response_model=List[EventSummary])
 def get_all_events(
+    response: Response,
     category: Optional[EventCategory] = None,
     status: Optional[EventStatus] = None,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db)
 ):
     """
-    Get all events with optional filtering
+    Get all events with optional filtering (cursor paginated, latest first)
     """
-    query = db.query(Event)
+    query = select(Event)
     
     if category:
-        query = query.filter(Event.category == category)
+        query = query.where(Event.category == category)
     if status:
-        query = query.filter(Event.status == status)
+        query = query.where(Event.status == status)
     
-    events = query.order_by(Event.event_start_date.desc()).offset(skip).limit(limit).all()
-    return events
+    return paginate(
+        db, query, (Event.event_start_date, Event.id), page, response, descending=True
+    )
 
 
 @router.get("/upcoming", response_model=List[EventSummary])
@@ -567,23 +569,23 @@ def create_announcement(announcement_data: AnnouncementCreate, db: Session = Dep
 
 @router.get("/announcements", response_model=List[AnnouncementResponse])
 def get_all_announcements(
+    response: Response,
     event_id: Optional[int] = None,
     active_only: bool = True,
-    skip: int = Query(0, ge=0),
-    limit: int = Query(20, ge=1, le=100),
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db)
 ):
     """
-    Get announcements with optional filtering
+    Get announcements with optional filtering (cursor paginated, pinned first)
     """
-    query = db.query(EventAnnouncement)
+    query = select(EventAnnouncement)
     
     if event_id:
-        query = query.filter(EventAnnouncement.event_id == event_id)
+        query = query.where(EventAnnouncement.event_id == event_id)
     
     if active_only:
         now = datetime.utcnow()
-        query = query.filter(
+        query = query.where(
             and_(
                 EventAnnouncement.is_active == True,
                 or_(
@@ -593,12 +595,8 @@ def get_all_announcements(
             )
         )
     
-    announcements = query.order_by(
-        EventAnnouncement.is_pinned.desc(),
-        EventAnnouncement.publish_date.desc()
-    ).offset(skip).limit(limit).all()
-    
-    return announcements
+    keys = (EventAnnouncement.is_pinned, EventAnnouncement.publish_date, EventAnnouncement.id)
+    return paginate(db, query, keys, page, response, descending=True)
 
 
 @router.get("/announcements/{announcement_id}", response_model=AnnouncementResponse)
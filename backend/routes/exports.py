@@ -0,0 +1,213 @@
+"""
+Bulk Export API Routes
+Streams attendance, complaint and risk data as NDJSON or CSV
+
+Rows are fetched through a server-side cursor (stream_results + yield_per) and
+written out one batch per chunk, so memory stays flat regardless of export size.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from backend.core.config import settings
+from backend.core.logging import get_logger
+from backend.core.read_replicas import read_router, wants_primary
+from backend.database import SessionLocal
+from backend.models.attendance import Attendance
+from backend.models.complaint import Complaint
+from backend.models.risk import RiskLog
+from backend.models.student import Student
+
+logger = get_logger("exports")
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+FORMAT_QUERY = Query("ndjson", pattern="^(ndjson|csv)$")
+RISK_STATUSES = {"resolved": 1, "unresolved": 0}
+
+
+@router.get("/attendance")
+def export_attendance(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    department: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Stream attendance records with student details"""
+    stmt = attendance_export_stmt(date_from, date_to, department, status)
+    return _export_response(request, "attendance", stmt, format)
+
+
+@router.get("/complaints")
+def export_complaints(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    department: Optional[str] = None,
+    status: Optional[str] = None,
+):
+    """Stream complaints with student details"""
+    stmt = complaints_export_stmt(date_from, date_to, department, status)
+    return _export_response(request, "complaints", stmt, format)
+
+
+@router.get("/risks")
+def export_risks(
+    request: Request,
+    format: str = FORMAT_QUERY,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    department: Optional[str] = None,
+    status: Optional[str] = Query(None, description="resolved or unresolved"),
+):
+    """Stream risk logs; system-wide risks (no student) are included unless filtering by department"""
+    if status and status not in RISK_STATUSES:
+        raise HTTPException(status_code=400, detail="status must be resolved or unresolved")
+    stmt = risks_export_stmt(date_from, date_to, department, status)
+    return _export_response(request, "risks", stmt, format)
+
+
+# ============== Helper Functions ==============
+
+
+def attendance_export_stmt(date_from=None, date_to=None, department=None, status=None):
+    stmt = (
+        select(
+            Attendance.id,
+            Attendance.student_id,
+            Student.roll_no,
+            Student.name.label("student_name"),
+            Student.department,
+            Attendance.status,
+            Attendance.date,
+            Attendance.remarks,
+        )
+        .join(Student, Student.id == Attendance.student_id)
+        .order_by(Attendance.id)
+    )
+    stmt = _apply_filters(stmt, Attendance.date, date_from, date_to, department)
+    if status:
+        stmt = stmt.where(Attendance.status == status)
+    return stmt
+
+
+def complaints_export_stmt(date_from=None, date_to=None, department=None, status=None):
+    stmt = (
+        select(
+            Complaint.id,
+            Complaint.student_id,
+            Student.roll_no,
+            Student.department,
+            Complaint.title,
+            Complaint.description,
+            Complaint.category,
+            Complaint.status,
+            Complaint.priority,
+            Complaint.created_at,
+        )
+        .join(Student, Student.id == Complaint.student_id)
+        .order_by(Complaint.id)
+    )
+    stmt = _apply_filters(stmt, Complaint.created_at, date_from, date_to, department)
+    if status:
+        stmt = stmt.where(Complaint.status == status)
+    return stmt
+
+
+def risks_export_stmt(date_from=None, date_to=None, department=None, status=None):
+    stmt = (
+        select(
+            RiskLog.id,
+            RiskLog.student_id,
+            Student.department,
+            RiskLog.risk_type,
+            RiskLog.severity,
+            RiskLog.description,
+            RiskLog.resolved,
+            RiskLog.created_at,
+        )
+        .outerjoin(Student, Student.id == RiskLog.student_id)
+        .order_by(RiskLog.id)
+    )
+    stmt = _apply_filters(stmt, RiskLog.created_at, date_from, date_to, department)
+    if status:
+        stmt = stmt.where(RiskLog.resolved == RISK_STATUSES[status])
+    return stmt
+
+
+def _apply_filters(stmt, date_column, date_from, date_to, department):
+    """Inclusive date range on `date_column` and the student's department"""
+    if date_from:
+        stmt = stmt.where(date_column >= datetime.combine(date_from, time.min))
+    if date_to:
+        stmt = stmt.where(date_column < datetime.combine(date_to + timedelta(days=1), time.min))
+    if department:
+        stmt = stmt.where(Student.department == department)
+    return stmt
+
+
+def _export_response(request: Request, name: str, stmt, fmt: str) -> StreamingResponse:
+    # Exports are heavy reads: use a fresh-enough replica unless the caller needs the primary
+    replica = None if wants_primary(request) else read_router.pick_replica()
+    session_factory = replica.session_factory if replica else SessionLocal
+
+    logger.log_event("export_started", level="INFO", export=name, format=fmt)
+    return StreamingResponse(
+        stream_rows(session_factory, stmt, fmt, settings.EXPORT_BATCH_SIZE),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}-export.{fmt}"'},
+    )
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(session_factory, stmt, fmt: str, batch_size: int) -> Iterator[str]:
+    """
+    Yield one encoded chunk per batch of rows
+
+    The session is opened here rather than through a dependency so it stays
+    alive for the whole response and is closed when streaming ends or the
+    client disconnects.
+    """
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        columns = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for batch in result.partitions():
+                writer.writerows(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for batch in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        {column: _json_value(value) for column, value in zip(columns, row)}
+                    )
+                    + "\n"
+                    for row in batch
+                )
+    finally:
+        db.close()
@@ -3,28 +3,52 @@ QR-Based Attendance API Routes with Geo-Fencing
 Faculty and Student panels with real-time validation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import (
+    APIRouter, Depends, File, Form, Header, HTTPException, status, Query, Request, Response,
+    UploadFile, WebSocket, WebSocketDisconnect
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, delete, func, desc, select
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
+import asyncio
+import numpy as np
 import uuid
 import hashlib
 import json
-import qrcode
-import io
-import base64
 
-from backend.database import get_db
+from backend.database import dialect_insert, get_db, get_async_db, get_async_session_factory
+from backend.core.attendance_stats import rebuild_attendance_stats, reopen_session_stats
+from backend.core.config import settings
+from backend.core.pagination import CursorParams, paginate
+from backend.core.device_registry import device_registry
+from backend.core.geo import haversine_many
+from backend.core.live_feed import live_feed
+from backend.core.qr_images import etag_matches, image_etag, qr_image_cache
+from backend.core.qr_session_cache import qr_session_cache
+from backend.core.qr_tokens import (
+    current_token, display_key, token_qr_data, verify_display_key, verify_scan_code
+)
+from backend.core.rosters import (
+    ABSENT_STATUS, absent_students_stmt, materialize_absentees_stmt, parse_roster_csv,
+    roster_delete_stmt, roster_size_stmt, roster_upsert
+)
+from backend.core.scan_dedup import scan_dedup
+from backend.core.write_behind import qr_session_counters, scan_log_buffer, scan_log_row
 from backend.models.qr_attendance import (
-    QRAttendanceSession, QRAttendanceRecord, QRAttendanceLog, DeviceFingerprint
+    QRAttendanceSession, QRAttendanceRecord, DeviceFingerprint,
+    QRStudentSubjectStats, QRSubjectSessionsHeld
 )
 from backend.schemas.qr_attendance import (
     QRSessionCreate, QRSessionResponse, QRSessionSummary, QRSessionUpdate,
     QRScanRequest, QRScanResponse, AttendanceRecordResponse, AttendanceRecordSummary,
     LiveAttendanceStats, StudentAttendanceHistory, FacultyDashboard, StudentDashboard,
     AbsentListResponse, AbsentStudentInfo, DeviceFingerprintResponse,
-    MessageResponse, QRCodeImage, ValidationResult
+    GeoAuditRecord, GeoAuditResponse, MessageResponse, QRCodeImage, QRRotatingToken,
+    RosterUploadResponse, SessionCloseResponse, SubjectAttendanceSummary, ValidationResult
 )
 
 router = APIRouter(prefix="/qr-attendance", tags=["QR Attendance System"])
@@ -88,7 +112,9 @@ def generate_qr_session(session_data: QRSessionCreate, db: Session = Depends(get
         center_longitude=session_data.center_longitude,
         geo_fence_radius_meters=session_data.geo_fence_radius_meters,
         location_name=session_data.location_name,
-        total_students_expected=session_data.total_students_expected,
+        total_students_expected=session_data.total_students_expected or db.scalar(
+            roster_size_stmt(session_data.branch, session_data.semester, session_data.section)
+        ),
         allow_screenshot_scan=session_data.allow_screenshot_scan,
         require_device_verification=session_data.require_device_verification,
         is_active=True
@@ -98,16 +124,18 @@ def generate_qr_session(session_data: QRSessionCreate, db: Session = Depends(get
     db.commit()
     db.refresh(new_session)
     
-    return new_session
+    return with_display_key(new_session)
 
 
 @router.post("/faculty/regenerate-qr/{session_id}", response_model=QRSessionResponse)
-def regenerate_qr_session(session_id: str, db: Session = Depends(get_db)):
+async def regenerate_qr_session(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Regenerate an existing QR session (extend expiry and update hash)
     Used for expired sessions or to refresh the QR code
     """
-    session = db.query(QRAttendanceSession).filter(QRAttendanceSession.session_id == session_id).first()
+    session = await db.scalar(
+        select(QRAttendanceSession).where(QRAttendanceSession.session_id == session_id)
+    )
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -134,69 +162,140 @@ def regenerate_qr_session(session_id: str, db: Session = Depends(get_db)):
     session.qr_expires_at = expires_at
     session.is_active = True
     session.is_expired = False
+    session.proxy_analyzed_at = None  # analyze again once the reopened session closes
+    await reopen_counted_session(db, session)
     
-    db.commit()
-    db.refresh(session)
+    # Absentees written at close are re-materialized when the session closes again
+    await db.execute(delete(QRAttendanceRecord).where(
+        QRAttendanceRecord.session_id == session.id,
+        QRAttendanceRecord.attendance_status == ABSENT_STATUS
+    ))
+    session.total_students_absent = 0
     
-    return session
+    await db.commit()
+    await db.refresh(session)
+    await qr_session_cache.invalidate(session_id)
+    publish_session_updated(session)
+    
+    return with_display_key(session)
 
 
-@router.get("/faculty/qr-image/{session_id}")
-def get_qr_code_image(session_id: str, db: Session = Depends(get_db)):
+@router.get("/faculty/qr-token/{session_id}", response_model=QRRotatingToken)
+async def get_rotating_qr_token(
+    session_id: str,
+    x_display_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Generate QR code image for display
-    Returns base64 encoded PNG image
+    Current rotating QR token for classroom displays
+    Computed from the session and the clock (no DB writes); displays refresh
+    at valid_until, every QR_TOKEN_STEP_SECONDS. Requires the session's
+    X-Display-Key from generate-qr.
     """
-    session = db.query(QRAttendanceSession).filter(QRAttendanceSession.session_id == session_id).first()
+    require_display_key(session_id, x_display_key)
+    session = await qr_session_cache.get(db, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
     if not session.is_qr_valid():
         raise HTTPException(status_code=400, detail="QR code has expired")
     
-    # Generate QR code image
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr.add_data(session.qr_code_data)
-    qr.make(fit=True)
+    token, valid_until = current_token(session)
+    return QRRotatingToken(
+        session_id=session_id,
+        token=token,
+        qr_data=token_qr_data(session, token, valid_until),
+        step_seconds=settings.QR_TOKEN_STEP_SECONDS,
+        valid_until=valid_until
+    )
+
+
+@router.get("/faculty/qr-image/{session_id}")
+async def get_qr_code_image(
+    session_id: str,
+    request: Request,
+    image_format: str = Query("png", alias="format", pattern="^(png|svg)$"),
+    rotating: bool = Query(False, description="Encode the current rotating token"),
+    x_display_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Generate QR code image for display
+    Returns base64 encoded PNG (or SVG) image, rendered once per QR hash
+    (or rotating token). Polling clients send If-None-Match and get 304
+    until the QR changes. Rotating images require the session's X-Display-Key.
+    """
+    if rotating:
+        require_display_key(session_id, x_display_key)
+    snapshot = await qr_session_cache.get(db, session_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if not snapshot.is_qr_valid():
+        raise HTTPException(status_code=400, detail="QR code has expired")
+    
+    code = current_token(snapshot)[0] if rotating else snapshot.qr_code_hash
+    etag = image_etag(code, image_format)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
+    
+    session = await db.get(QRAttendanceSession, snapshot.id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    img = qr.make_image(fill_color="black", back_color="white")
+    if rotating:
+        code, expires_at = current_token(session)
+        qr_data = token_qr_data(session, code, expires_at)
+    else:
+        code, qr_data = session.qr_code_hash, session.qr_code_data
+        expires_at = session.qr_expires_at
     
-    # Convert to base64
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_base64 = base64.b64encode(buffer.getvalue()).decode()
+    img_base64 = await qr_image_cache.get_or_render(code, qr_data, image_format, expires_at)
     
-    return QRCodeImage(
+    image = QRCodeImage(
         session_id=session_id,
         qr_code_base64=img_base64,
-        expires_at=session.qr_expires_at,
+        image_format=image_format,
+        expires_at=expires_at,
         metadata={
             "subject": session.subject_name,
             "branch": session.branch,
             "semester": session.semester,
-            "validity_minutes": session.qr_validity_minutes
+            "validity_minutes": session.qr_validity_minutes,
+            "rotating": rotating
         }
     )
+    return JSONResponse(
+        jsonable_encoder(image),
+        headers={"ETag": image_etag(code, image_format), "Cache-Control": "no-cache"}
+    )
 
 
 @router.get("/faculty/sessions", response_model=List[QRSessionSummary])
 def get_faculty_sessions(
     faculty_id: str,
+    response: Response,
     active_only: bool = False,
-    skip: int = 0,
-    limit: int = 50,
+    page: CursorParams = Depends(),
     db: Session = Depends(get_db)
 ):
     """
-    Get all QR sessions created by faculty
+    Get all QR sessions created by faculty (cursor paginated, newest first)
     """
-    query = db.query(QRAttendanceSession).filter(QRAttendanceSession.faculty_id == faculty_id)
+    query = select(QRAttendanceSession).where(QRAttendanceSession.faculty_id == faculty_id)
     
     if active_only:
-        query = query.filter(QRAttendanceSession.is_active == True)
+        # The sweeper clears is_active on expiry; the time check covers the gap between sweeps
+        query = query.where(
+            QRAttendanceSession.is_active == True,
+            QRAttendanceSession.qr_expires_at > datetime.now(timezone.utc)
+        )
     
-    sessions = query.order_by(desc(QRAttendanceSession.created_at)).offset(skip).limit(limit).all()
-    return sessions
+    keys = (QRAttendanceSession.created_at, QRAttendanceSession.id)
+    return paginate(db, query, keys, page, response, descending=True)
 
 
 @router.get("/faculty/session/{session_id}", response_model=QRSessionResponse)
@@ -212,11 +311,15 @@ def get_session_details(session_id: str, db: Session = Depends(get_db)):
 
 
 @router.patch("/faculty/session/{session_id}", response_model=QRSessionResponse)
-def update_session(session_id: str, update_data: QRSessionUpdate, db: Session = Depends(get_db)):
+async def update_session(
+    session_id: str, update_data: QRSessionUpdate, db: AsyncSession = Depends(get_async_db)
+):
     """
     Update QR session (cancel, deactivate, add notes)
     """
-    session = db.query(QRAttendanceSession).filter(QRAttendanceSession.session_id == session_id).first()
+    session = await db.scalar(
+        select(QRAttendanceSession).where(QRAttendanceSession.session_id == session_id)
+    )
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -227,8 +330,14 @@ def update_session(session_id: str, update_data: QRSessionUpdate, db: Session =
         session.closed_at = datetime.now(timezone.utc)
         session.is_active = False
     
-    db.commit()
-    db.refresh(session)
+    # Cancelled or reactivated sessions stop counting toward subject stats
+    if session.is_cancelled or session.is_qr_valid():
+        await reopen_counted_session(db, session)
+    
+    await db.commit()
+    await db.refresh(session)
+    await qr_session_cache.invalidate(session_id)
+    publish_session_updated(session)
     
     return session
 
@@ -242,45 +351,90 @@ def get_live_attendance(session_id: str, db: Session = Depends(get_db)):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Calculate statistics
-    total_present = session.total_students_present
-    total_expected = session.total_students_expected
-    total_absent = total_expected - total_present if total_expected > 0 else 0
-    
-    # Count late entries
-    total_late = db.query(QRAttendanceRecord).filter(
-        and_(
-            QRAttendanceRecord.session_id == session.id,
-            QRAttendanceRecord.is_late_entry == True
+    return live_attendance_stats(session)
+
+
+async def _live_snapshot(session_id: str) -> Optional[LiveAttendanceStats]:
+    """Current stats for a new live-feed subscriber (short-lived DB session)"""
+    async with get_async_session_factory()() as db:
+        session = await db.scalar(
+            select(QRAttendanceSession).where(QRAttendanceSession.session_id == session_id)
         )
-    ).count()
-    
-    # Calculate percentages
-    attendance_percentage = (total_present / total_expected * 100) if total_expected > 0 else 0
-    on_time_count = total_present - total_late
-    on_time_percentage = (on_time_count / total_expected * 100) if total_expected > 0 else 0
-    
-    # Time remaining
-    time_remaining = (session.qr_expires_at - datetime.utcnow()).total_seconds()
-    time_remaining_seconds = max(0, int(time_remaining))
-    
-    return LiveAttendanceStats(
-        session_id=session.id,
-        subject_name=session.subject_name,
-        branch=session.branch,
-        semester=session.semester,
-        total_expected=total_expected,
-        total_present=total_present,
-        total_absent=total_absent,
-        total_late=total_late,
-        attendance_percentage=round(attendance_percentage, 2),
-        on_time_percentage=round(on_time_percentage, 2),
-        qr_expires_at=session.qr_expires_at,
-        is_active=session.is_active,
-        time_remaining_seconds=time_remaining_seconds
+        return live_attendance_stats(session) if session else None
+
+
+@router.get("/faculty/live/{session_id}/stream")
+async def stream_live_attendance(session_id: str, request: Request):
+    """
+    Server-sent events feed for the faculty dashboard
+    Sends a `snapshot` event with current stats, then `attendance_marked` /
+    `session_updated` events as they happen (replaces polling live-attendance)
+    """
+    snapshot = await _live_snapshot(session_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    queue = live_feed.subscribe(session_id)
+
+    async def events():
+        try:
+            yield sse_message("snapshot", jsonable_encoder(snapshot))
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.LIVE_FEED_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse_message(message["event"], message["data"])
+        finally:
+            live_feed.unsubscribe(session_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+@router.websocket("/faculty/live/{session_id}/ws")
+async def live_attendance_websocket(websocket: WebSocket, session_id: str):
+    """
+    WebSocket variant of the live feed
+    Messages are {"event": ..., "data": ...}, starting with a snapshot
+    """
+    await websocket.accept()
+    snapshot = await _live_snapshot(session_id)
+    if snapshot is None:
+        await websocket.close(code=4404, reason="Session not found")
+        return
+
+    queue = live_feed.subscribe(session_id)
+
+    async def forward():
+        await websocket.send_json({"event": "snapshot", "data": jsonable_encoder(snapshot)})
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def watch():
+        # Clients send nothing; receive() returns the disconnect even while no events flow
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(watch())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        live_feed.unsubscribe(session_id, queue)
+
+
 @router.get("/faculty/attendance-records/{session_id}", response_model=List[AttendanceRecordSummary])
 def get_session_attendance_records(session_id: str, db: Session = Depends(get_db)):
     """
@@ -291,21 +445,94 @@ def get_session_attendance_records(session_id: str, db: Session = Depends(get_db
         raise HTTPException(status_code=404, detail="Session not found")
     
     records = db.query(QRAttendanceRecord).filter(
-        QRAttendanceRecord.session_id == session.id
+        QRAttendanceRecord.session_id == session.id,
+        QRAttendanceRecord.attendance_status != ABSENT_STATUS
     ).order_by(QRAttendanceRecord.marked_at.asc()).all()
     
     return records
 
 
+@router.get("/faculty/session/{session_id}/geo-audit", response_model=GeoAuditResponse)
+async def audit_session_geofence(
+    session_id: str,
+    outside_only: bool = Query(True, description="Only list records outside the fence"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Re-check every attendance record of a session against its geofence
+    Distances are computed in one vectorized pass, for proxy analysis over
+    sessions with thousands of records
+    """
+    session = (await db.execute(
+        select(QRAttendanceSession).where(QRAttendanceSession.session_id == session_id)
+    )).scalar_one_or_none()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    rows = (await db.execute(
+        select(
+            QRAttendanceRecord.id,
+            QRAttendanceRecord.roll_number,
+            QRAttendanceRecord.student_name,
+            QRAttendanceRecord.student_latitude,
+            QRAttendanceRecord.student_longitude,
+            QRAttendanceRecord.location_accuracy,
+            QRAttendanceRecord.distance_from_center,
+        ).where(
+            QRAttendanceRecord.session_id == session.id,
+            QRAttendanceRecord.attendance_status != ABSENT_STATUS
+        ).order_by(QRAttendanceRecord.id)
+    )).all()
+    
+    radius = session.geo_fence_radius_meters
+    distances = haversine_many(
+        session.center_latitude,
+        session.center_longitude,
+        [r.student_latitude for r in rows],
+        [r.student_longitude for r in rows],
+    )
+    accuracy = np.array([r.location_accuracy or 0.0 for r in rows], dtype=np.float64)
+    inside = distances <= radius
+    
+    records = [
+        GeoAuditRecord(
+            record_id=r.id,
+            roll_number=r.roll_number,
+            student_name=r.student_name,
+            student_latitude=r.student_latitude,
+            student_longitude=r.student_longitude,
+            location_accuracy=r.location_accuracy,
+            distance_from_center=round(float(distance), 2),
+            recorded_distance=r.distance_from_center,
+            is_within_geofence=bool(within)
+        )
+        for r, distance, within in zip(rows, distances, inside)
+        if not (outside_only and within)
+    ]
+    
+    return GeoAuditResponse(
+        session_id=session.id,
+        geo_fence_radius_meters=radius,
+        total_records=len(rows),
+        outside_geofence=int((~inside).sum()),
+        outside_beyond_accuracy=int((distances - accuracy > radius).sum()),
+        max_distance=round(float(distances.max()), 2) if rows else 0.0,
+        mean_distance=round(float(distances.mean()), 2) if rows else 0.0,
+        p95_distance=round(float(np.percentile(distances, 95)), 2) if rows else 0.0,
+        records=records
+    )
+
+
 @router.get("/faculty/absent-list/{session_id}", response_model=AbsentListResponse)
 def get_absent_list(
     session_id: str,
-    expected_students: List[dict],  # List of expected students
+    expected_students: Optional[List[dict]] = None,  # defaults to the stored class roster
     db: Session = Depends(get_db)
 ):
     """
     Generate auto-generated absent list
-    Compare expected students with those who marked attendance
+    Anti-joins the stored roster against the session's records in SQL; an
+    explicit expected_students list is still compared in Python
     """
     session = db.query(QRAttendanceSession).filter(QRAttendanceSession.session_id == session_id).first()
     if not session:
@@ -313,38 +540,162 @@ def get_absent_list(
     
     # Get roll numbers of students who attended
     present_roll_numbers = db.query(QRAttendanceRecord.roll_number).filter(
-        QRAttendanceRecord.session_id == session.id
+        QRAttendanceRecord.session_id == session.id,
+        QRAttendanceRecord.attendance_status != ABSENT_STATUS
     ).all()
     present_set = {r[0] for r in present_roll_numbers}
     
-    # Find absent students
-    absent_students = []
-    for student in expected_students:
-        if student.get('roll_number') not in present_set:
-            absent_students.append(AbsentStudentInfo(
-                roll_number=student['roll_number'],
-                student_name=student['name'],
-                branch=student.get('branch', session.branch),
-                semester=student.get('semester', session.semester),
-                section=student.get('section', session.section),
-                contact_email=student.get('email')
-            ))
+    if expected_students is None:
+        absent_students = [
+            AbsentStudentInfo(
+                roll_number=member.roll_number,
+                student_name=member.student_name,
+                branch=member.branch,
+                semester=member.semester,
+                section=member.section or None,
+                contact_email=member.student_email
+            )
+            for member in db.scalars(absent_students_stmt(session))
+        ]
+        total_expected = db.scalar(
+            roster_size_stmt(session.branch, session.semester, session.section)
+        )
+    else:
+        absent_students = []
+        for student in expected_students:
+            if student.get('roll_number') not in present_set:
+                absent_students.append(AbsentStudentInfo(
+                    roll_number=student['roll_number'],
+                    student_name=student['name'],
+                    branch=student.get('branch', session.branch),
+                    semester=student.get('semester', session.semester),
+                    section=student.get('section', session.section),
+                    contact_email=student.get('email')
+                ))
+        total_expected = len(expected_students)
     
     return AbsentListResponse(
         session_id=session.id,
         subject_name=session.subject_name,
         lecture_date=session.lecture_date,
-        total_expected=len(expected_students),
+        total_expected=total_expected,
         total_present=len(present_set),
         total_absent=len(absent_students),
         absent_students=absent_students
     )
 
 
+@router.post("/faculty/session/{session_id}/close", response_model=SessionCloseResponse)
+async def close_session(session_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Close a session and write an absent record for every roster member who did not scan
+    One INSERT ... SELECT regardless of class size; regenerating the QR removes them again
+    """
+    session = await db.scalar(
+        select(QRAttendanceSession).where(QRAttendanceSession.session_id == session_id)
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if session.is_cancelled:
+        raise HTTPException(status_code=400, detail="Cancelled sessions cannot be closed")
+    
+    now = datetime.now(timezone.utc)
+    result = await db.execute(materialize_absentees_stmt(db.bind, session, now))
+    total_absent = session.total_students_absent = result.rowcount + (
+        session.total_students_absent if session.closed_at else 0
+    )
+    total_present = await db.scalar(
+        select(func.count(QRAttendanceRecord.id)).where(
+            QRAttendanceRecord.session_id == session.id,
+            QRAttendanceRecord.attendance_status != ABSENT_STATUS
+        )
+    )
+    roster_size = await db.scalar(
+        roster_size_stmt(session.branch, session.semester, session.section)
+    )
+    if roster_size:
+        session.total_students_expected = roster_size
+    
+    session.is_active = False
+    session.closed_at = now
+    
+    await db.commit()
+    await qr_session_cache.invalidate(session_id)
+    scan_dedup.forget(session.id)
+    publish_session_updated(session)
+    
+    return SessionCloseResponse(
+        session_id=session.id,
+        closed_at=now,
+        total_expected=session.total_students_expected,
+        total_present=total_present,
+        total_absent=total_absent
+    )
+
+
+@router.post("/faculty/roster/upload", response_model=RosterUploadResponse)
+async def upload_roster(
+    file: UploadFile = File(..., description="CSV: roll_number, student_name, student_id, student_email"),
+    branch: str = Form(..., min_length=2),
+    semester: int = Form(..., ge=1, le=8),
+    section: Optional[str] = Form(None),
+    replace: bool = Form(False, description="Replace the roster instead of merging into it"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Load a class roster in bulk from CSV
+    Rows are upserted by roll number in chunked executemany statements
+    """
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Roster CSV must be UTF-8")
+    
+    rows, errors = parse_roster_csv(text)
+    if errors:
+        raise HTTPException(status_code=400, detail={"errors": errors[:20], "total_errors": len(errors)})
+    if not rows:
+        raise HTTPException(status_code=400, detail="Roster CSV has no students")
+    
+    if replace:
+        await db.execute(roster_delete_stmt(branch, str(semester), section))
+    stmt, chunks = roster_upsert(db.bind, branch, str(semester), section, rows)
+    for chunk in chunks:
+        await db.execute(stmt, chunk)
+    roster_size = await db.scalar(roster_size_stmt(branch, semester, section))
+    await db.commit()
+    
+    return RosterUploadResponse(
+        branch=branch,
+        semester=semester,
+        section=section,
+        students_loaded=len(rows),
+        replaced=replace,
+        roster_size=roster_size
+    )
+
+
+@router.post("/faculty/subject-stats/rebuild")
+def rebuild_subject_stats(db: Session = Depends(get_db)):
+    """
+    Recompute the attended/held subject counters from sessions and records
+    Migration 0006 backfills them once; this repairs them after manual data fixes
+    """
+    try:
+        result = rebuild_attendance_stats(db)
+        db.commit()
+        return {"status": "subject attendance stats rebuilt", **result}
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error rebuilding subject stats: {str(e)}")
+
+
 # ============== Student Panel - QR Scanning ==============
 
 @router.post("/student/scan-qr", response_model=QRScanResponse)
-def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = Depends(get_db)):
+async def scan_qr_code(
+    scan_request: QRScanRequest, request: Request, db: AsyncSession = Depends(get_async_db)
+):
     """
     Student scans QR code to mark attendance
     Performs comprehensive validation:
@@ -353,9 +704,8 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
     3. Device verification
     4. Time validation
     5. Anti-proxy checks
+    6. Duplicate scans (in memory, then the unique index)
     """
-    errors = []
-    warnings = []
     validation_results = {
         "qr_valid": False,
         "location_valid": False,
@@ -363,10 +713,8 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
         "time_valid": False
     }
     
-    # Find session
-    session = db.query(QRAttendanceSession).filter(
-        QRAttendanceSession.session_id == scan_request.session_id
-    ).first()
+    # Find session (cached snapshot; no SELECT while the session is hot)
+    session = await qr_session_cache.get(db, scan_request.session_id)
     
     if not session:
         return QRScanResponse(
@@ -377,10 +725,34 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
             errors=["Session not found"]
         )
     
+    # Repeated taps are rejected in memory while a scan is in flight or once marked
+    if not scan_dedup.claim(session.id, scan_request.student_id):
+        if scan_dedup.is_marked(session.id, scan_request.student_id):
+            return duplicate_scan_response(validation_results)
+        return scan_in_progress_response(validation_results)
+    try:
+        return await validate_and_mark_attendance(session, scan_request, request, db)
+    finally:
+        scan_dedup.release(session.id, scan_request.student_id)
+
+
+async def validate_and_mark_attendance(
+    session, scan_request: QRScanRequest, request: Request, db: AsyncSession
+) -> QRScanResponse:
+    """Validation and attendance insert for a claimed scan of a known session"""
+    errors = []
+    warnings = []
+    validation_results = {
+        "qr_valid": False,
+        "location_valid": False,
+        "device_valid": False,
+        "time_valid": False
+    }
+    
     # 1. QR Validity Check
     if not session.is_qr_valid():
         errors.append("QR code has expired or is no longer active")
-        log_scan_attempt(db, session.id, scan_request.student_id, "failed", "QR expired", scan_request.location)
+        log_scan_attempt(session.id, scan_request.student_id, "failed", "QR expired", scan_request.location)
         return QRScanResponse(
             success=False,
             message="QR code has expired. Please ask faculty to generate a new code.",
@@ -389,14 +761,16 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
             errors=errors
         )
     
-    # Verify QR hash (only if provided - allows manual entry without hash)
-    # Also ignore the dummy test hash for development troubleshooting
+    # Verify QR hash. While static hashes are accepted, a missing code (manual
+    # entry) or the dummy test hash skips the check; once rotating tokens are
+    # required, every scan must carry a valid code
     DUMMY_HASH = '0000000000000000000000000000000000000000000000000000000000000000'
-    if scan_request.qr_code_hash and \
-       scan_request.qr_code_hash != DUMMY_HASH and \
-       scan_request.qr_code_hash != session.qr_code_hash:
+    code = scan_request.qr_code_hash
+    skip_code_check = settings.QR_ACCEPT_STATIC_HASH and code in (None, DUMMY_HASH)
+    # The code is the static session hash or a rotating token (see core.qr_tokens)
+    if not skip_code_check and not verify_scan_code(session, code):
         errors.append("QR code hash mismatch - possible tampering detected")
-        log_scan_attempt(db, session.id, scan_request.student_id, "blocked", "Hash mismatch", scan_request.location)
+        log_scan_attempt(session.id, scan_request.student_id, "blocked", "Hash mismatch", scan_request.location)
         return QRScanResponse(
             success=False,
             message="Invalid QR code. Security check failed.",
@@ -408,12 +782,7 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
     validation_results["qr_valid"] = True
     
     # 2. Geo-Fencing Check
-    distance = session.calculate_distance(
-        scan_request.location.latitude,
-        scan_request.location.longitude
-    )
-    
-    is_within_geofence = session.is_within_geofence(
+    distance, is_within_geofence = session.check_geofence(
         scan_request.location.latitude,
         scan_request.location.longitude
     )
@@ -421,7 +790,7 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
     if not is_within_geofence:
         errors.append(f"You are {int(distance)} meters away from the classroom")
         errors.append(f"You must be within {int(session.geo_fence_radius_meters)} meters to mark attendance")
-        log_scan_attempt(db, session.id, scan_request.student_id, "denied", "Outside geofence", scan_request.location)
+        log_scan_attempt(session.id, scan_request.student_id, "denied", "Outside geofence", scan_request.location)
         return QRScanResponse(
             success=False,
             message="You are outside the allowed classroom area. Please move closer to the classroom.",
@@ -436,7 +805,9 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
     
     # 3. Device Verification
     if session.require_device_verification:
-        device_check = verify_device(db, scan_request.student_id, scan_request.device)
+        device_check = await verify_device(
+            db, scan_request.student_id, scan_request.device, scan_request.student_name
+        )
         if not device_check["valid"]:
             errors.append(device_check["message"])
             validation_results["device_valid"] = False
@@ -460,23 +831,6 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
     else:
         validation_results["time_valid"] = True
     
-    # 5. Check for duplicate attendance
-    existing_record = db.query(QRAttendanceRecord).filter(
-        and_(
-            QRAttendanceRecord.session_id == session.id,
-            QRAttendanceRecord.student_id == scan_request.student_id
-        )
-    ).first()
-    
-    if existing_record:
-        return QRScanResponse(
-            success=False,
-            message="Attendance already marked for this session.",
-            attendance_marked=False,
-            validation_results=validation_results,
-            errors=["Duplicate attendance attempt"]
-        )
-    
     # All checks passed - Mark attendance
     if all(validation_results.values()):
         # Calculate if late
@@ -494,8 +848,8 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
         # Determine status - Increase grace period to 15 minutes
         attendance_status = "late" if is_late and late_minutes > 15 else "present"
         
-        # Create attendance record
-        attendance_record = QRAttendanceRecord(
+        # Create attendance record; the unique (session_id, student_id) index rejects duplicates
+        attendance_record = dict(
             session_id=session.id,
             student_id=scan_request.student_id,
             roll_number=scan_request.roll_number,
@@ -525,22 +879,45 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
             time_validation_passed=True,
             scan_duration_ms=scan_request.scan_duration_ms
         )
+        attendance_record_id = await db.scalar(
+            dialect_insert(db.bind, QRAttendanceRecord.__table__)
+            .values(**attendance_record)
+            .on_conflict_do_nothing(index_elements=["session_id", "student_id"])
+            .returning(QRAttendanceRecord.id)
+        )
+        if attendance_record_id is None:
+            # Marked by another worker or before a restart. The rollback also
+            # discards a device registered by this scan, so drop any cached owner
+            await db.rollback()
+            device_registry.invalidate(scan_request.device.device_id)
+            scan_dedup.mark(session.id, scan_request.student_id)
+            return duplicate_scan_response(validation_results)
         
-        db.add(attendance_record)
+        await db.commit()
+        scan_dedup.mark(session.id, scan_request.student_id)
         
-        # Update session statistics
-        session.total_students_present += 1
-        if is_late:
-            session.total_late_entries += 1
+        # Device usage statistics are batched like the session counters
+        device_registry.record_use(scan_request.device.device_id, scan_request.student_name)
         
-        # Log successful scan
-        log_scan_attempt(db, session.id, scan_request.student_id, "success", "Attendance marked", scan_request.location)
+        # Push the new student and counter deltas to live dashboards
+        live_feed.publish(session.session_id, "attendance_marked", {
+            "student_id": scan_request.student_id,
+            "roll_number": scan_request.roll_number,
+            "student_name": scan_request.student_name,
+            "marked_at": scan_request.scan_timestamp.isoformat(),
+            "attendance_status": attendance_status,
+            "is_late_entry": is_late,
+            "late_by_minutes": late_minutes,
+            "delta": {"total_present": 1, "total_late": int(is_late)}
+        })
         
-        # Update device fingerprint
-        update_device_fingerprint(db, scan_request.student_id, scan_request.student_name, scan_request.device)
+        # Session statistics are buffered and applied off the scan path
+        qr_session_counters.add(
+            session.id, total_students_present=1, total_late_entries=int(is_late)
+        )
         
-        db.commit()
-        db.refresh(attendance_record)
+        # Log successful scan once the attendance is durable
+        log_scan_attempt(session.id, scan_request.student_id, "success", "Attendance marked", scan_request.location)
         
         success_message = "Attendance marked successfully!"
         if is_late:
@@ -555,7 +932,7 @@ def scan_qr_code(scan_request: QRScanRequest, request: Request, db: Session = De
                 "faculty": session.faculty_name,
                 "date": session.lecture_date.isoformat()
             },
-            attendance_record_id=attendance_record.id,
+            attendance_record_id=attendance_record_id,
             validation_results=validation_results,
             distance_from_center=round(distance, 2),
             is_within_geofence=True,
@@ -590,52 +967,79 @@ def get_student_dashboard(student_id: str, db: Session = Depends(get_db)):
     today_records = db.query(QRAttendanceRecord).filter(
         and_(
             QRAttendanceRecord.student_id == student_id,
+            QRAttendanceRecord.attendance_status != ABSENT_STATUS,
             func.date(QRAttendanceRecord.marked_at) == today
         )
     ).all()
     
-    # Overall attendance
-    total_records = db.query(QRAttendanceRecord).filter(
-        QRAttendanceRecord.student_id == student_id
-    ).count()
-    
-    # Get student info from first record
-    first_record = db.query(QRAttendanceRecord).filter(
+    # Recent attendance; the latest record also identifies the student's class
+    recent_records = db.query(QRAttendanceRecord).filter(
         QRAttendanceRecord.student_id == student_id
-    ).first()
+    ).order_by(desc(QRAttendanceRecord.marked_at)).limit(10).all()
     
-    if not first_record:
+    if not recent_records:
         raise HTTPException(status_code=404, detail="No attendance records found for student")
+    latest = recent_records[0]
     
-    # Calculate overall percentage (placeholder - should calculate based on total sessions)
-    overall_percentage = 85.0  # TODO: Calculate properly
+    # Subject-wise attended/held from the pre-aggregated counters (O(subjects))
+    section = latest.section or ""
+    held_rows = db.query(QRSubjectSessionsHeld).filter(
+        QRSubjectSessionsHeld.branch == latest.branch,
+        QRSubjectSessionsHeld.semester == latest.semester
+    ).all()
+    attended_rows = db.query(QRStudentSubjectStats).filter(
+        QRStudentSubjectStats.student_id == student_id
+    ).all()
     
-    # Attendance status
-    if overall_percentage >= 75:
-        attendance_status = "good"
-    elif overall_percentage >= 65:
-        attendance_status = "warning"
-    else:
-        attendance_status = "critical"
+    subject_names = {}
+    held = {}
+    for row in held_rows:
+        # Whole-class sessions plus the student's own section (every section if unknown)
+        if not section or row.section in ("", section):
+            held[row.subject_code] = held.get(row.subject_code, 0) + row.held
+            subject_names[row.subject_code] = row.subject_name
+    attended = {row.subject_code: row for row in attended_rows}
+    for row in attended_rows:
+        subject_names.setdefault(row.subject_code, row.subject_name)
     
-    # Low attendance subjects (placeholder)
-    low_attendance_subjects = []
+    subject_attendance = []
+    for subject_code in sorted(subject_names):
+        stats = attended.get(subject_code)
+        classes_attended = stats.attended if stats else 0
+        # Attending another cohort's session can exceed this cohort's count
+        classes_held = max(held.get(subject_code, 0), classes_attended)
+        percentage = attendance_percentage(classes_attended, classes_held)
+        subject_attendance.append(SubjectAttendanceSummary(
+            subject_code=subject_code,
+            subject_name=subject_names[subject_code],
+            classes_held=classes_held,
+            classes_attended=classes_attended,
+            late_entries=stats.late if stats else 0,
+            attendance_percentage=percentage,
+            status=attendance_status_for(percentage)
+        ))
     
-    # Recent attendance
-    recent_records = db.query(QRAttendanceRecord).filter(
-        QRAttendanceRecord.student_id == student_id
-    ).order_by(desc(QRAttendanceRecord.marked_at)).limit(10).all()
+    overall_percentage = attendance_percentage(
+        sum(s.classes_attended for s in subject_attendance),
+        sum(s.classes_held for s in subject_attendance)
+    )
+    attendance_status = attendance_status_for(overall_percentage)
+    
+    low_attendance_subjects = [
+        s.model_dump() for s in subject_attendance if s.status != "good"
+    ]
     
     return StudentDashboard(
         student_id=student_id,
-        student_name=first_record.student_name,
-        roll_number=first_record.roll_number,
+        student_name=latest.student_name,
+        roll_number=latest.roll_number,
         today_classes=len(today_records),
         today_attended=len(today_records),
         today_missed=0,
         overall_attendance_percentage=overall_percentage,
         attendance_status=attendance_status,
         low_attendance_subjects=low_attendance_subjects,
+        subject_attendance=subject_attendance,
         recent_attendance=[
             AttendanceRecordSummary(
                 id=r.id,
@@ -653,38 +1057,144 @@ def get_student_dashboard(student_id: str, db: Session = Depends(get_db)):
 
 # ============== Helper Functions ==============
 
-def log_scan_attempt(db: Session, session_id: int, student_id: str, status: str, reason: str, location):
-    """Log all scan attempts for audit trail"""
-    log_entry = QRAttendanceLog(
-        session_id=session_id,
-        student_id=student_id,
-        attempt_status=status,
-        failure_reason=reason if status != "success" else None,
-        latitude=location.latitude,
-        longitude=location.longitude
+def live_attendance_stats(session: QRAttendanceSession) -> LiveAttendanceStats:
+    """Live stats from the session row; no per-record queries"""
+    # Calculate statistics (stored counters plus increments not yet flushed)
+    pending = qr_session_counters.pending(session.id)
+    total_present = session.total_students_present + pending["total_students_present"]
+    total_late = session.total_late_entries + pending["total_late_entries"]
+    total_expected = session.total_students_expected
+    total_absent = total_expected - total_present if total_expected > 0 else 0
+    
+    # Calculate percentages
+    attendance_percentage = (total_present / total_expected * 100) if total_expected > 0 else 0
+    on_time_count = total_present - total_late
+    on_time_percentage = (on_time_count / total_expected * 100) if total_expected > 0 else 0
+    
+    # Time remaining
+    time_remaining = (session.qr_expires_at - datetime.utcnow()).total_seconds()
+    time_remaining_seconds = max(0, int(time_remaining))
+    
+    return LiveAttendanceStats(
+        session_id=session.id,
+        subject_name=session.subject_name,
+        branch=session.branch,
+        semester=session.semester,
+        total_expected=total_expected,
+        total_present=total_present,
+        total_absent=total_absent,
+        total_late=total_late,
+        attendance_percentage=round(attendance_percentage, 2),
+        on_time_percentage=round(on_time_percentage, 2),
+        qr_expires_at=session.qr_expires_at,
+        is_active=session.is_active,
+        time_remaining_seconds=time_remaining_seconds
+    )
+
+
+def attendance_percentage(attended: int, held: int) -> float:
+    """Attended share of held classes; nothing held yet means nothing missed"""
+    return round(attended / held * 100, 2) if held else 100.0
+
+
+def attendance_status_for(percentage: float) -> str:
+    if percentage >= 75:
+        return "good"
+    if percentage >= 65:
+        return "warning"
+    return "critical"
+
+
+async def reopen_counted_session(db: AsyncSession, session: QRAttendanceSession):
+    """Take a session out of the subject stats until it is closed (and counted) again"""
+    if session.stats_finalized_at is None:
+        return
+    await db.run_sync(lambda sync_db: reopen_session_stats(sync_db.connection(), session))
+    session.stats_finalized_at = None
+
+
+def publish_session_updated(session: QRAttendanceSession):
+    live_feed.publish(session.session_id, "session_updated", {
+        "qr_expires_at": session.qr_expires_at.isoformat(),
+        "is_active": session.is_active,
+        "is_cancelled": session.is_cancelled
+    })
+
+
+def with_display_key(session: QRAttendanceSession) -> QRSessionResponse:
+    """Session response carrying the display key, for the faculty member who created it"""
+    response = QRSessionResponse.model_validate(session)
+    response.display_key = display_key(session.session_id)
+    return response
+
+
+def require_display_key(session_id: str, key: Optional[str]):
+    if not verify_display_key(session_id, key):
+        raise HTTPException(status_code=403, detail="Missing or invalid X-Display-Key")
+
+
+def sse_message(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def duplicate_scan_response(validation_results: dict) -> QRScanResponse:
+    return QRScanResponse(
+        success=False,
+        message="Attendance already marked for this session.",
+        attendance_marked=False,
+        validation_results=validation_results,
+        errors=["Duplicate attendance attempt"]
+    )
+
+
+def scan_in_progress_response(validation_results: dict) -> QRScanResponse:
+    # The first scan may still fail validation, so this is not "already marked"
+    return QRScanResponse(
+        success=False,
+        message="Your previous scan is still being processed. Please try again.",
+        attendance_marked=False,
+        validation_results=validation_results,
+        errors=["Scan in progress"]
     )
-    db.add(log_entry)
 
 
-def verify_device(db: Session, student_id: str, device_data) -> dict:
-    """Verify device to prevent proxy"""
-    device = db.query(DeviceFingerprint).filter(
-        DeviceFingerprint.device_id == device_data.device_id
-    ).first()
+def log_scan_attempt(session_id: int, student_id: str, status: str, reason: str, location):
+    """Log all scan attempts for audit trail (buffered, written in bulk off the request path)"""
+    scan_log_buffer.enqueue(scan_log_row(session_id, student_id, status, reason, location))
+
+
+async def verify_device(
+    db: AsyncSession, student_id: str, device_data, student_name: str = ""
+) -> dict:
+    """Verify device to prevent proxy (one cached ownership lookup per scan)
+
+    A first-time device is registered inside the scan transaction, so it is
+    bound to the student only when attendance is marked; a scan that fails a
+    later check (or turns out to be a duplicate) rolls the registration back
+    and the device stays unclaimed until a scan succeeds.
+    """
+    device = await device_registry.lookup(db, device_data.device_id)
     
     if not device:
-        # New device - register it
-        new_device = DeviceFingerprint(
-            device_id=device_data.device_id,
-            student_id=student_id,
-            student_name="",  # Will be updated
-            device_model=device_data.device_model,
-            device_os=device_data.device_os,
-            browser=device_data.browser,
-            screen_resolution=device_data.screen_resolution
+        # New device - register it, unless a concurrent first scan just did.
+        # Not committed here: binding happens only on a successful mark
+        registered = await db.scalar(
+            dialect_insert(db.bind, DeviceFingerprint.__table__)
+            .values(
+                device_id=device_data.device_id,
+                student_id=student_id,
+                student_name=student_name,
+                device_model=device_data.device_model,
+                device_os=device_data.device_os,
+                browser=device_data.browser,
+                screen_resolution=device_data.screen_resolution
+            )
+            .on_conflict_do_nothing(index_elements=["device_id"])
+            .returning(DeviceFingerprint.id)
         )
-        db.add(new_device)
-        return {"valid": True, "message": "Device registered"}
+        if registered:
+            return {"valid": True, "message": "Device registered"}
+        device = await device_registry.lookup(db, device_data.device_id, use_cache=False)
     
     # Check if device belongs to same student
     if device.student_id != student_id:
@@ -700,19 +1210,5 @@ def verify_device(db: Session, student_id: str, device_data) -> dict:
             "message": f"Device is blocked. Reason: {device.block_reason}"
         }
     
-    # Device is valid
-    device.last_used = datetime.utcnow()
-    device.total_scans += 1
+    # Device is valid (usage statistics are recorded once attendance is marked)
     return {"valid": True, "message": "Device verified"}
-
-
-def update_device_fingerprint(db: Session, student_id: str, student_name: str, device_data):
-    """Update device usage statistics"""
-    device = db.query(DeviceFingerprint).filter(
-        DeviceFingerprint.device_id == device_data.device_id
-    ).first()
-    
-    if device:
-        device.last_used = datetime.utcnow()
-        device.total_scans += 1
-        device.student_name = student_name
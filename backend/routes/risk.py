@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.core.pagination import CursorParams, paginate
 from backend.schemas.risk import RiskLogCreate, RiskLogOut, RiskLogUpdate
 from backend.models.risk import RiskLog
 from datetime import datetime
@@ -37,22 +39,33 @@ def create_risk_log(risk: RiskLogCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[RiskLogOut])
-def get_all_risk_logs(db: Session = Depends(get_db)):
-    """Get all risk logs"""
-    return db.query(RiskLog).all()
+def get_all_risk_logs(
+    response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)
+):
+    """Get all risk logs (cursor paginated)"""
+    return paginate(db, select(RiskLog), (RiskLog.id,), page, response)
 
 
 @router.get("/unresolved", response_model=list[RiskLogOut])
-def get_unresolved_risks(db: Session = Depends(get_db)):
-    """Get all unresolved risk logs"""
-    return db.query(RiskLog).filter(RiskLog.resolved == 0).all()
+def get_unresolved_risks(
+    response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)
+):
+    """Get all unresolved risk logs (cursor paginated)"""
+    stmt = select(RiskLog).where(RiskLog.resolved == 0)
+    return paginate(db, stmt, (RiskLog.id,), page, response)
 
 
 @router.get("/student/{student_id}", response_model=list[RiskLogOut])
-def get_student_risk_logs(student_id: int, db: Session = Depends(get_db)):
-    """Get risk logs for a specific student"""
-    logs = db.query(RiskLog).filter(RiskLog.student_id == student_id).all()
-    if not logs:
+def get_student_risk_logs(
+    student_id: int,
+    response: Response,
+    page: CursorParams = Depends(),
+    db: Session = Depends(get_db),
+):
+    """Get risk logs for a specific student (cursor paginated)"""
+    stmt = select(RiskLog).where(RiskLog.student_id == student_id)
+    logs = paginate(db, stmt, (RiskLog.id,), page, response)
+    if not logs and not page.cursor:
         raise HTTPException(status_code=404, detail="No risk logs found")
     return logs
 
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.core.pagination import CursorParams, paginate
 from backend.schemas.schedule import ScheduleCreate, ScheduleOut, ScheduleUpdate
 from backend.models.schedule import Schedule
 from backend.core.event_bus import EventType, event_bus, Event
@@ -52,15 +54,20 @@ def create_schedule(schedule: ScheduleCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[ScheduleOut])
-def get_all_schedules(db: Session = Depends(get_db)):
-    """Get all schedules"""
-    return db.query(Schedule).all()
+def get_all_schedules(
+    response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)
+):
+    """Get all schedules (cursor paginated)"""
+    return paginate(db, select(Schedule), (Schedule.id,), page, response)
 
 
 @router.get("/active", response_model=list[ScheduleOut])
-def get_active_schedules(db: Session = Depends(get_db)):
-    """Get all active schedules"""
-    return db.query(Schedule).filter(Schedule.is_active == 1).all()
+def get_active_schedules(
+    response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)
+):
+    """Get all active schedules (cursor paginated)"""
+    stmt = select(Schedule).where(Schedule.is_active == 1)
+    return paginate(db, stmt, (Schedule.id,), page, response)
 
 
 @router.get("/{schedule_id}", response_model=ScheduleOut)
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from backend.database import get_db
+from backend.core.pagination import CursorParams, paginate
 from backend.schemas.student import StudentCreate, StudentOut
 from backend.models.student import Student
 
@@ -27,9 +29,11 @@ def add_student(student: StudentCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[StudentOut])
-def get_all_students(db: Session = Depends(get_db)):
-    """Get all students"""
-    return db.query(Student).all()
+def get_all_students(
+    response: Response, page: CursorParams = Depends(), db: Session = Depends(get_db)
+):
+    """Get all students (cursor paginated)"""
+    return paginate(db, select(Student), (Student.id,), page, response)
 
 
 @router.get("/{student_id}", response_model=StudentOut)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class AttendanceCreate(BaseModel):
@@ -9,6 +9,26 @@ class AttendanceCreate(BaseModel):
     remarks: Optional[str] = None
 
 
+class AttendanceBulkEntry(BaseModel):
+    student_id: int
+    status: str = Field(..., description="Present, Absent, Late, Excused")
+    remarks: Optional[str] = None
+
+
+class AttendanceBulkCreate(BaseModel):
+    """A class roster marked in one submission"""
+
+    class_name: Optional[str] = Field(None, description="Class/section label for the roster")
+    date: Optional[datetime] = Field(None, description="Lecture date; defaults to now")
+    records: List[AttendanceBulkEntry] = Field(..., min_length=1, max_length=5000)
+
+
+class AttendanceBulkResult(BaseModel):
+    inserted: int
+    date: datetime
+    class_name: Optional[str] = None
+
+
 class AttendanceOut(AttendanceCreate):
     id: int
     date: datetime
@@ -65,6 +65,8 @@ class QRSessionResponse(BaseModel):
     total_students_present: int
     
     created_at: datetime
+    # X-Display-Key for the rotating token/image endpoints; only set on generate/regenerate
+    display_key: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -264,6 +266,17 @@ class FacultyDashboard(BaseModel):
     today_attendance_stats: Optional[Dict[str, int]] = None
 
 
+class SubjectAttendanceSummary(BaseModel):
+    """Attended vs held sessions for one subject"""
+    subject_code: str
+    subject_name: str
+    classes_held: int
+    classes_attended: int
+    late_entries: int
+    attendance_percentage: float
+    status: str  # good, warning, critical
+
+
 class StudentDashboard(BaseModel):
     """Student dashboard overview"""
     student_id: str
@@ -278,6 +291,7 @@ class StudentDashboard(BaseModel):
     attendance_status: str  # good, warning, critical
     
     low_attendance_subjects: List[Dict[str, Any]]
+    subject_attendance: List[SubjectAttendanceSummary] = []
     recent_attendance: List[AttendanceRecordSummary]
 
 
@@ -323,6 +337,51 @@ class AbsentListResponse(BaseModel):
     absent_students: List[AbsentStudentInfo]
 
 
+class RosterUploadResponse(BaseModel):
+    """Result of a bulk roster CSV upload"""
+    branch: str
+    semester: int
+    section: Optional[str]
+    students_loaded: int
+    replaced: bool
+    roster_size: int
+
+
+class SessionCloseResponse(BaseModel):
+    """Session closed with its absentees written as attendance records"""
+    session_id: int
+    closed_at: datetime
+    total_expected: int
+    total_present: int
+    total_absent: int
+
+
+class GeoAuditRecord(BaseModel):
+    """One attendance record re-checked against the session geofence"""
+    record_id: int
+    roll_number: str
+    student_name: str
+    student_latitude: float
+    student_longitude: float
+    location_accuracy: Optional[float]
+    distance_from_center: float  # recomputed against the current fence
+    recorded_distance: float  # as stored when attendance was marked
+    is_within_geofence: bool
+
+
+class GeoAuditResponse(BaseModel):
+    """Post-hoc geofence audit of a session's attendance records"""
+    session_id: int
+    geo_fence_radius_meters: float
+    total_records: int
+    outside_geofence: int
+    outside_beyond_accuracy: int  # still outside after allowing for reported GPS accuracy
+    max_distance: float
+    mean_distance: float
+    p95_distance: float
+    records: List[GeoAuditRecord]
+
+
 # ============== Device Management Schemas ==============
 
 class DeviceFingerprintResponse(BaseModel):
@@ -355,6 +414,16 @@ class MessageResponse(BaseModel):
 class QRCodeImage(BaseModel):
     """QR code image data"""
     session_id: str
-    qr_code_base64: str  # Base64 encoded PNG image
+    qr_code_base64: str  # Base64 encoded PNG or SVG image
+    image_format: str = "png"
     expires_at: datetime
     metadata: Dict[str, Any]
+
+
+class QRRotatingToken(BaseModel):
+    """Current rotating QR token for a session"""
+    session_id: str
+    token: str  # Scanned into QRScanRequest.qr_code_hash
+    qr_data: str  # Payload to encode in the displayed QR
+    step_seconds: int
+    valid_until: datetime
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""
+Load test the sync (threadpool) and async (AsyncSession) request paths
+
+Serves the same attendance lookup from a sync `def` handler on a Session and
+from the async /attendance router on an AsyncSession, then fires --requests
+calls with --concurrency in flight through an in-process ASGI transport and
+reports throughput and latency percentiles for each.
+
+    python benchmarks/async_concurrency.py --concurrency 200 --threadpool 40
+    python benchmarks/async_concurrency.py --database-url postgresql://u:p@localhost/bench
+
+--database-url must name an empty scratch database: the run refuses to start if
+the students or attendance tables already exist, and drops them when it ends.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import anyio  # noqa: E402
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from backend.database import (  # noqa: E402
+    create_async_database_engine,
+    create_database_engine,
+    get_async_db,
+    get_pool_metrics,
+)
+from backend.models.attendance import Attendance  # noqa: E402
+from backend.models.student import Student  # noqa: E402
+from backend.routes import attendance  # noqa: E402
+from benchmarks.scratch_db import scratch_tables  # noqa: E402
+
+STATUSES = ["Present", "Absent", "Late", "Excused"]
+
+
+def seed(engine, students: int, records_per_student: int):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Student),
+            [
+                {"id": s, "name": f"Student {s}", "roll_no": f"R{s}", "department": "CSE"}
+                for s in range(1, students + 1)
+            ],
+        )
+        conn.execute(
+            insert(Attendance),
+            [
+                {"student_id": s, "status": STATUSES[(s + i) % len(STATUSES)]}
+                for s in range(1, students + 1)
+                for i in range(records_per_student)
+            ],
+        )
+
+
+def sync_app(engine) -> FastAPI:
+    SessionLocal = sessionmaker(bind=engine, autoflush=False)
+
+    def get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/attendance/student/{student_id}")
+    def get_student_attendance(student_id: int, db: Session = Depends(get_db)):
+        records = db.scalars(select(Attendance).where(Attendance.student_id == student_id)).all()
+        return [{"id": r.id, "status": r.status} for r in records]
+
+    return app
+
+
+def async_app(async_engine) -> FastAPI:
+    factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(attendance.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+async def load(app: FastAPI, requests: int, concurrency: int, students: int) -> dict:
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def call(i: int):
+            async with gate:
+                start = time.perf_counter()
+                response = await client.get(f"/attendance/student/{i % students + 1}")
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def report(label: str, result: dict, pool: dict):
+    print(
+        f"{label:<6} {result['rps']:>9.0f} req/s   p50 {result['p50_ms']:>7.1f} ms   "
+        f"p95 {result['p95_ms']:>7.1f} ms   max {result['max_ms']:>7.1f} ms   "
+        f"pool wait avg {pool.get('avg_checkout_wait_ms', 0):.2f} ms"
+    )
+
+
+async def run(args):
+    # Same cap FastAPI/Starlette apply to sync handlers and dependencies
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threadpool
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/async_bench.db"
+    engine = create_database_engine(url)
+    async_engine = create_async_database_engine(url)
+    try:
+        with scratch_tables(engine, [Student.__table__, Attendance.__table__]):
+            seed(engine, args.students, args.records)
+            print(
+                f"{args.requests:,} requests, {args.concurrency} in flight, "
+                f"threadpool {args.threadpool} ({url})"
+            )
+            try:
+                sync_result = await load(sync_app(engine), **_load_args(args))
+                report("sync", sync_result, get_pool_metrics(engine))
+                async_result = await load(async_app(async_engine), **_load_args(args))
+                report("async", async_result, get_pool_metrics(async_engine))
+            finally:
+                # Release pooled async connections before the tables are dropped
+                await async_engine.dispose()
+    finally:
+        engine.dispose()
+
+
+def _load_args(args) -> dict:
+    return {"requests": args.requests, "concurrency": args.concurrency, "students": args.students}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threadpool", type=int, default=40, help="sync handler thread limit")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--records", type=int, default=20, help="attendance rows per student")
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Benchmark POST /attendance/bulk against one POST /attendance/ per student
+
+Submits --classes rosters of --class-size students to the async attendance
+router on a throwaway SQLite (WAL) database (or the empty scratch database
+given by --database-url; tables that already exist are never touched), with the batched risk agent
+subscribed, and reports sustained rows per second for both paths.
+
+    python benchmarks/bulk_attendance.py --classes 50 --class-size 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from backend import database  # noqa: E402
+from backend.core.event_handlers import register_agents  # noqa: E402
+from backend.database import (  # noqa: E402
+    create_async_database_engine,
+    create_database_engine,
+    get_async_db,
+)
+from backend.models.attendance import Attendance  # noqa: E402
+from backend.models.risk import RiskLog  # noqa: E402
+from backend.models.student import Student  # noqa: E402
+from backend.routes import attendance  # noqa: E402
+from benchmarks.scratch_db import scratch_tables  # noqa: E402
+
+TABLES = [Student.__table__, Attendance.__table__, RiskLog.__table__]
+
+
+def seed(engine, students: int):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Student),
+            [
+                {"id": i, "name": f"Student {i}", "roll_no": f"R{i}", "department": "CSE"}
+                for i in range(1, students + 1)
+            ],
+        )
+
+
+def app_for(async_engine) -> FastAPI:
+    factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(attendance.router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+def roster(class_size: int, n: int) -> list:
+    # Every third student absent so the risk agent has work to do
+    return [
+        {"student_id": s, "status": "Absent" if (s + n) % 3 == 0 else "Present"}
+        for s in range(1, class_size + 1)
+    ]
+
+
+async def run(args):
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/bulk_bench.db"
+    engine = create_database_engine(url)
+    async_engine = create_async_database_engine(url)
+    try:
+        with scratch_tables(engine, TABLES):
+            seed(engine, args.class_size)
+            try:
+                await measure(args, engine, async_engine)
+            finally:
+                # Release pooled async connections before the tables are dropped
+                await async_engine.dispose()
+    finally:
+        engine.dispose()
+
+
+async def measure(args, engine, async_engine):
+    # Agents open sessions from backend.database.SessionLocal
+    database.SessionLocal = sessionmaker(bind=engine, autoflush=False)
+    register_agents()
+
+    transport = httpx.ASGITransport(app=app_for(async_engine))
+    rows = args.classes * args.class_size
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for n in range(args.classes):
+            r = await client.post("/attendance/bulk", json={"records": roster(args.class_size, n)})
+            r.raise_for_status()
+        bulk = time.perf_counter() - start
+        print(f"bulk    {rows / bulk:>9.0f} rows/s  ({rows:,} rows in {bulk:.2f}s)")
+
+        if not args.skip_single:
+            single_rows = min(rows, args.single_rows)
+            start = time.perf_counter()
+            for i, record in enumerate(roster(args.class_size, 0) * args.classes):
+                if i >= single_rows:
+                    break
+                (await client.post("/attendance/", json=record)).raise_for_status()
+            single = time.perf_counter() - start
+            print(f"single  {single_rows / single:>9.0f} rows/s  ({single_rows:,} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--classes", type=int, default=50)
+    parser.add_argument("--class-size", type=int, default=100)
+    parser.add_argument("--single-rows", type=int, default=1000, help="rows for the per-row run")
+    parser.add_argument("--skip-single", action="store_true")
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
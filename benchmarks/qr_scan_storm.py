@@ -0,0 +1,496 @@
+#!/usr/bin/env python
+"""
+Scan-storm load test for the QR attendance scan path
+
+Opens --sessions QR sessions through /faculty/generate-qr, then has --students
+students per session hit /student/scan-qr within --window seconds from phones
+scattered inside each geofence. Phones scan the rotating token their classroom
+display shows, fetched with the session's display key. The storm mixes in
+repeated taps (--duplicates), scans from outside the fence (--outside) and
+tampered codes (--mismatch). It reports throughput, latency percentiles, outcome
+counts against what the mix should produce, SQL statements by verb and
+lock-wait errors, then appends the run to benchmarks/results/qr_scan_storm.jsonl
+and compares it with the last run of the same configuration on the same dialect.
+
+In-process runs go through an ASGI transport with the write-behind flushes
+running as they do in the app; --base-url storms a running server instead
+(statement and lock counts are then only visible server-side).
+
+The committed baselines are SQLite only: they were recorded on a machine with
+no PostgreSQL server. The first --database-url postgresql://... run records
+the Postgres baseline, since runs are only compared within one dialect.
+
+    python benchmarks/qr_scan_storm.py --students 300 --window 60
+    python benchmarks/qr_scan_storm.py --sessions 4 --window 0 --concurrency 100
+    python benchmarks/qr_scan_storm.py --database-url postgresql://u:p@localhost/bench
+    python benchmarks/qr_scan_storm.py --base-url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+
+RESULTS_FILE = os.path.join(os.path.dirname(__file__), "results", "qr_scan_storm.jsonl")
+CAMPUS = (12.9716, 77.5946)
+METERS_PER_DEGREE = 111320.0
+LOCK_ERRORS = ("database is locked", "deadlock detected", "lock timeout", "could not obtain lock")
+
+# Expected outcome of each kind of scan in the mix
+KINDS = {
+    "valid": "marked",
+    "duplicate": "duplicate",
+    "outside": "outside_geofence",
+    "mismatch": "hash_mismatch",
+}
+
+
+def offset(lat: float, lon: float, meters: float, bearing: float):
+    """Point `meters` away from (lat, lon) on a bearing in radians"""
+    dlat = meters * math.cos(bearing) / METERS_PER_DEGREE
+    dlon = meters * math.sin(bearing) / (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+    return lat + dlat, lon + dlon
+
+
+def session_body(n: int, tag: str, radius: float, students: int) -> dict:
+    now = datetime.now(timezone.utc)
+    # Classrooms 200 m apart along a campus row
+    lat, lon = offset(*CAMPUS, 200.0 * n, math.pi / 2)
+    return {
+        "faculty_id": f"F{n}",
+        "faculty_name": f"Bench Faculty {n}",
+        "subject_code": f"BENCH{n}",
+        "subject_name": f"Benchmark Subject {n}",
+        "branch": f"BENCH-{tag}",
+        "semester": 1 + n % 8,
+        "section": "A",
+        "lecture_date": now.isoformat(),
+        "lecture_start_time": now.isoformat(),
+        "qr_validity_minutes": 10,
+        "center_latitude": lat,
+        "center_longitude": lon,
+        "geo_fence_radius_meters": radius,
+        "total_students_expected": students,
+    }
+
+
+def plan_storm(sessions: list, args, tag: str, rng: random.Random) -> list:
+    """(arrival second, kind, payload) for every scan, sorted by arrival"""
+    scans = []
+    for n, session in enumerate(sessions):
+        radius = session["geo_fence_radius_meters"]
+        for s in range(args.students):
+            student = f"{tag}-{n}-{s:04d}"
+            roll = rng.random()
+            if roll < args.outside:
+                kind, distance = "outside", radius * rng.uniform(1.5, 4.0)
+            elif roll < args.outside + args.mismatch:
+                kind, distance = "mismatch", radius * 0.8 * math.sqrt(rng.random())
+            else:
+                kind, distance = "valid", radius * 0.8 * math.sqrt(rng.random())
+            lat, lon = offset(
+                session["center_latitude"],
+                session["center_longitude"],
+                distance,
+                rng.uniform(0, 2 * math.pi),
+            )
+            payload = {
+                "session_id": session["session_id"],
+                # Replaced with the display's current token when the scan is sent
+                "qr_code_hash": uuid.uuid4().hex * 2,
+                "student_id": student,
+                "roll_number": f"R{student}",
+                "student_name": f"Student {student}",
+                "branch": session["branch"],
+                "semester": session["semester"],
+                "section": "A",
+                "location": {"latitude": lat, "longitude": lon, "accuracy": rng.uniform(3, 20)},
+                "device": {"device_id": f"device-{student}", "device_os": "Android"},
+            }
+            at = rng.uniform(0, args.window)
+            scans.append((at, kind, payload))
+            if kind == "valid" and rng.random() < args.duplicates:
+                # Impatient second tap a moment later
+                scans.append((at + rng.uniform(0.2, 3.0), "duplicate", payload))
+    scans.sort(key=lambda scan: scan[0])
+    return scans
+
+
+def classify(response: httpx.Response) -> str:
+    if response.status_code >= 500:
+        return "server_error"
+    if response.status_code != 200:
+        return f"http_{response.status_code}"
+    body = response.json()
+    if body.get("attendance_marked"):
+        return "marked"
+    errors = " ".join(body.get("errors") or []).lower()
+    if "duplicate" in errors:
+        return "duplicate"
+    if "scan in progress" in errors:
+        return "in_progress"
+    if "hash mismatch" in errors:
+        return "hash_mismatch"
+    if body.get("is_within_geofence") is False:
+        return "outside_geofence"
+    if "device" in errors or "proxy" in errors:
+        return "device_rejected"
+    return "rejected"
+
+
+class StatementCounter:
+    """SQL statements by verb and lock-wait errors seen by the app's engines"""
+
+    def __init__(self, engines):
+        self.statements = Counter()
+        self.lock_errors = 0
+        self.errors = Counter()
+        from sqlalchemy import event
+
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_execute)
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements[statement.lstrip().split(None, 1)[0].upper()] += 1
+
+    def _on_error(self, context):
+        message = str(context.original_exception).lower()
+        if any(marker in message for marker in LOCK_ERRORS):
+            self.lock_errors += 1
+        self.errors[type(context.original_exception).__name__] += 1
+
+    def reset(self):
+        self.statements.clear()
+        self.errors.clear()
+        self.lock_errors = 0
+
+
+async def flush_loop(interval: float, flushes):
+    while True:
+        await asyncio.sleep(interval)
+        for flush in flushes:
+            await flush()
+
+
+class Displays:
+    """Classroom displays: each session's rotating token, fetched once per step"""
+
+    def __init__(self, client: httpx.AsyncClient, sessions: list):
+        self.client = client
+        self.keys = {session["session_id"]: session["display_key"] for session in sessions}
+        self.locks = {session_id: asyncio.Lock() for session_id in self.keys}
+        self.tokens = {}
+
+    async def token(self, session_id: str) -> str:
+        async with self.locks[session_id]:
+            token, valid_until = self.tokens.get(session_id, (None, 0.0))
+            if time.time() >= valid_until:
+                response = await self.client.get(
+                    f"/qr-attendance/faculty/qr-token/{session_id}",
+                    headers={"X-Display-Key": self.keys[session_id]},
+                )
+                response.raise_for_status()
+                body = response.json()
+                token = body["token"]
+                valid_until = datetime.fromisoformat(
+                    body["valid_until"].replace("Z", "+00:00")
+                ).timestamp()
+                self.tokens[session_id] = (token, valid_until)
+            return token
+
+
+async def storm(client: httpx.AsyncClient, scans: list, concurrency: int, sessions: list) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    latencies, outcomes, unexpected = [], Counter(), Counter()
+    displays = Displays(client, sessions)
+    start = time.perf_counter()
+
+    async def fire(at: float, kind: str, payload: dict):
+        await asyncio.sleep(max(0.0, at - (time.perf_counter() - start)))
+        if kind != "mismatch":
+            payload = dict(payload, qr_code_hash=await displays.token(payload["session_id"]))
+        async with gate:
+            payload = dict(payload, scan_timestamp=datetime.now(timezone.utc).isoformat())
+            sent = time.perf_counter()
+            try:
+                response = await client.post("/qr-attendance/student/scan-qr", json=payload)
+                outcome = classify(response)
+            except httpx.HTTPError as e:
+                outcome = f"transport_{type(e).__name__}"
+            latencies.append(time.perf_counter() - sent)
+        outcomes[outcome] += 1
+        # A duplicate can overtake its first tap, or land while it is in flight and be
+        # told to retry; only the totals must then agree
+        expected = {KINDS[kind], "in_progress"} if kind == "duplicate" else {KINDS[kind]}
+        if outcome not in expected and {kind, outcome} != {"valid", "duplicate"}:
+            unexpected[f"{kind}->{outcome}"] += 1
+
+    await asyncio.gather(*(fire(*scan) for scan in scans))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scans": len(scans),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(scans) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "outcomes": dict(outcomes),
+        "unexpected": dict(unexpected),
+    }
+
+
+def expected_outcomes(scans: list) -> dict:
+    expected = Counter(KINDS[kind] for _, kind, _ in scans)
+    return dict(expected)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(result: dict, path: str, tolerance: float) -> list:
+    """Regressions against the last stored run with the same config and dialect"""
+    previous = []
+    if os.path.exists(path):
+        with open(path) as f:
+            previous = [json.loads(line) for line in f if line.strip()]
+    previous = [
+        run
+        for run in previous
+        if run["config"] == result["config"] and run["dialect"] == result["dialect"]
+    ]
+    if not previous:
+        print("no stored run with this configuration yet")
+        return []
+
+    baseline = previous[-1]
+    print(f"vs {baseline['revision']} ({baseline['timestamp']}):")
+    regressions = []
+    checks = [
+        ("rps", -1),
+        ("p95_ms", 1),
+        ("p99_ms", 1),
+        ("statements_per_scan", 1),
+        ("lock_errors", 1),
+    ]
+    for key, worse in checks:
+        old, new = baseline["metrics"].get(key), result["metrics"].get(key)
+        if old is None or new is None:
+            continue
+        change = (new - old) / old if old else (1.0 if new else 0.0)
+        flag = ""
+        if change * worse > tolerance:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"  {key:<20} {old:>10} -> {new:<10} ({change:+.1%}){flag}")
+    return regressions
+
+
+def report(result: dict):
+    m = result["metrics"]
+    print(
+        f"{m['scans']:,} scans in {m['elapsed_s']:.2f}s   {m['rps']:>7.0f} scans/s   "
+        f"p50 {m['p50_ms']:.1f} ms   p95 {m['p95_ms']:.1f} ms   p99 {m['p99_ms']:.1f} ms   "
+        f"max {m['max_ms']:.1f} ms"
+    )
+    print(f"outcomes  {m['outcomes']}")
+    print(f"expected  {result['expected']}")
+    if m["unexpected"]:
+        print(f"UNEXPECTED {m['unexpected']}")
+    if "statements" in m:
+        print(
+            f"sql       {m['statements_total']:,} statements "
+            f"({m['statements_per_scan']:.2f}/scan) {m['statements']}   "
+            f"lock errors {m['lock_errors']}   db errors {m['db_errors'] or 'none'}"
+        )
+    if "records" in m:
+        print(f"stored    {m['records']} attendance records, counters {m['counter_present']}")
+
+
+async def open_sessions(client: httpx.AsyncClient, args, tag: str) -> list:
+    sessions = []
+    for n in range(args.sessions):
+        body = session_body(n, tag, args.radius, args.students)
+        response = await client.post("/qr-attendance/faculty/generate-qr", json=body)
+        response.raise_for_status()
+        sessions.append(response.json())
+    return sessions
+
+
+async def run_remote(args, scans_for) -> dict:
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        sessions = await open_sessions(client, args, args.tag)
+        scans = scans_for(sessions)
+        return {"scans": scans, "metrics": await storm(client, scans, args.concurrency, sessions)}
+
+
+async def run_in_process(args, scans_for) -> dict:
+    # Imported once DATABASE_URL is set: the write-behind buffers, device registry
+    # and session cache all run against backend.database's engines
+    from fastapi import FastAPI
+    from sqlalchemy import func, select
+
+    from backend import database
+    from backend.core.device_registry import device_registry
+    from backend.core.write_behind import qr_session_counters, scan_log_buffer
+    from backend.migrations import run_migrations
+    from backend.models.qr_attendance import QRAttendanceRecord, QRAttendanceSession
+    from backend.routes import qr_attendance
+
+    run_migrations(database.engine)
+    async_engine = database.get_async_engine()
+    counter = StatementCounter([database.engine, async_engine.sync_engine])
+
+    app = FastAPI()
+    app.include_router(qr_attendance.router)
+    flushes = [
+        scan_log_buffer.flush_async,
+        qr_session_counters.flush_async,
+        device_registry.flush_async,
+    ]
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sessions = await open_sessions(client, args, args.tag)
+        scans = scans_for(sessions)
+        counter.reset()
+        flusher = asyncio.create_task(flush_loop(args.flush_interval, flushes))
+        try:
+            metrics = await storm(client, scans, args.concurrency, sessions)
+        finally:
+            flusher.cancel()
+        for flush in flushes:
+            await flush()
+
+    metrics.update(
+        statements=dict(counter.statements),
+        statements_total=sum(counter.statements.values()),
+        statements_per_scan=round(sum(counter.statements.values()) / len(scans), 3),
+        lock_errors=counter.lock_errors,
+        db_errors=dict(counter.errors),
+        pool=database.get_pool_metrics(async_engine),
+    )
+
+    pks = [session["id"] for session in sessions]
+    with database.engine.connect() as conn:
+        metrics["records"] = conn.scalar(
+            select(func.count(QRAttendanceRecord.id)).where(QRAttendanceRecord.session_id.in_(pks))
+        )
+        metrics["counter_present"] = conn.scalar(
+            select(func.sum(QRAttendanceSession.total_students_present)).where(
+                QRAttendanceSession.id.in_(pks)
+            )
+        )
+    await database.dispose_async_engine()
+    database.engine.dispose()
+    return {"scans": scans, "metrics": metrics}
+
+
+async def run(args) -> int:
+    rng = random.Random(args.seed)
+    args.tag = uuid.uuid4().hex[:8]
+
+    def scans_for(sessions):
+        return plan_storm(sessions, args, args.tag, rng)
+
+    if args.base_url:
+        dialect, target = "remote", args.base_url
+        outcome = await run_remote(args, scans_for)
+    else:
+        url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/qr_storm.db"
+        os.environ["DATABASE_URL"] = url
+        dialect, target = url.split(":", 1)[0].split("+", 1)[0], url.rsplit("@", 1)[-1]
+        outcome = await run_in_process(args, scans_for)
+
+    print(
+        f"{args.sessions} session(s) x {args.students} students, window {args.window:g}s, "
+        f"{args.concurrency} in flight ({target})"
+    )
+    config = {
+        key: getattr(args, key)
+        for key in (
+            "sessions",
+            "students",
+            "window",
+            "concurrency",
+            "duplicates",
+            "outside",
+            "mismatch",
+            "radius",
+            "seed",
+        )
+    }
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "dialect": dialect,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": config,
+        "expected": expected_outcomes(outcome["scans"]),
+        "metrics": outcome["metrics"],
+    }
+    report(result)
+
+    regressions = compare(result, args.results, args.tolerance)
+    if not args.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+        with open(args.results, "a") as f:
+            f.write(json.dumps(result, sort_keys=True) + "\n")
+        print(f"saved to {args.results}")
+
+    failed = bool(result["metrics"]["unexpected"]) or bool(regressions)
+    return 1 if failed and args.fail_on_regression else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--students", type=int, default=300, help="students per session")
+    parser.add_argument("--window", type=float, default=60.0, help="seconds the scans arrive over")
+    parser.add_argument("--concurrency", type=int, default=100, help="scans in flight at most")
+    parser.add_argument("--duplicates", type=float, default=0.15, help="share tapping twice")
+    parser.add_argument("--outside", type=float, default=0.05, help="share outside the fence")
+    parser.add_argument("--mismatch", type=float, default=0.03, help="share with a bad code")
+    parser.add_argument("--radius", type=float, default=50.0, help="geofence radius in meters")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="write-behind flushes")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--base-url", default=None, help="storm a running server instead")
+    parser.add_argument("--results", default=RESULTS_FILE)
+    parser.add_argument("--no-save", action="store_true", help="compare but do not store")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative change")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
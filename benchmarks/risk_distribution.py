@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Benchmark /analytics/risk-distribution against a large risk_logs table
+
+Seeds a throwaway SQLite database (or the empty scratch database given by
+--database-url; tables that already exist are never touched) with --rows risk
+logs and times the grouped aggregate implementation against the previous
+load-everything approach.
+
+    python benchmarks/risk_distribution.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from backend.models.risk import RiskLog  # noqa: E402
+from backend.models.student import Student  # noqa: E402
+from backend.routes.analytics import _aggregate_risk_distribution  # noqa: E402
+from benchmarks.scratch_db import scratch_tables  # noqa: E402
+
+RISK_TYPES = ["Academic", "Behavioral", "Health", "Attendance", "Other"]
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+
+
+def seed(engine, rows: int, students: int, batch_size: int = 50_000):
+    """Bulk insert students and risk logs"""
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Student),
+            [
+                {"id": i, "name": f"Student {i}", "roll_no": f"R{i}", "department": "CSE"}
+                for i in range(1, students + 1)
+            ],
+        )
+        for start in range(0, rows, batch_size):
+            conn.execute(
+                insert(RiskLog),
+                [
+                    {
+                        "student_id": rng.randint(1, students),
+                        "risk_type": rng.choice(RISK_TYPES),
+                        "severity": rng.choice(SEVERITIES),
+                        "description": "benchmark risk",
+                        "resolved": int(rng.random() < 0.3),
+                    }
+                    for _ in range(min(batch_size, rows - start))
+                ],
+            )
+
+
+def legacy_distribution(db):
+    """The previous implementation: three full loads plus a lookup per top student"""
+    all_risks = db.query(RiskLog).all()
+    unresolved = db.query(RiskLog).filter(RiskLog.resolved == 0).all()
+    resolved = db.query(RiskLog).filter(RiskLog.resolved == 1).all()
+    per_student = defaultdict(int)
+    for risk in all_risks:
+        if risk.student_id:
+            per_student[risk.student_id] += 1
+    for student_id, _ in sorted(per_student.items(), key=lambda x: x[1], reverse=True)[:5]:
+        db.query(Student).filter(Student.id == student_id).first()
+    return len(all_risks), len(unresolved), len(resolved)
+
+
+def timed(label, func, engine, repeat):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        durations = []
+        for _ in range(repeat):
+            session = sessionmaker(bind=engine)()
+            start = time.perf_counter()
+            func(session)
+            durations.append(time.perf_counter() - start)
+            session.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    best = min(durations)
+    print(f"{label:<12} best {best * 1000:10.1f} ms   statements/run {len(statements) // repeat}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the new query")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/risk_bench.db"
+    engine = create_engine(url)
+    with scratch_tables(engine, [Student.__table__, RiskLog.__table__]):
+        start = time.perf_counter()
+        seed(engine, args.rows, args.students)
+        print(f"seeded {args.rows:,} risk logs in {time.perf_counter() - start:.1f}s ({url})")
+
+        new = timed("aggregate", _aggregate_risk_distribution, engine, args.repeat)
+        if not args.skip_legacy:
+            old = timed("legacy", legacy_distribution, engine, 1)
+            print(f"speedup      {old / new:.1f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Scratch tables for benchmarks
+
+Benchmarks seed the tables they measure. They only create them where none of
+those tables exist yet (a fresh temporary SQLite file by default, or an empty
+database named by --database-url) and drop them again afterwards, so a run
+never touches tables it did not create.
+"""
+
+from contextlib import contextmanager
+
+from sqlalchemy import inspect
+
+from backend.database import Base
+
+
+@contextmanager
+def scratch_tables(engine, tables):
+    """Create `tables` for the duration of the block; refuse if any already exist"""
+    existing = sorted(set(inspect(engine).get_table_names()) & {t.name for t in tables})
+    if existing:
+        url = engine.url.render_as_string(hide_password=True)
+        raise SystemExit(
+            f"refusing to seed {url}: it already has {', '.join(existing)}. "
+            "Point --database-url at an empty scratch database."
+        )
+    Base.metadata.create_all(engine, tables=tables)
+    try:
+        yield
+    finally:
+        Base.metadata.drop_all(engine, tables=tables)
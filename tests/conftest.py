@@ -0,0 +1,73 @@
+"""
+Shared fixtures for the backend test suite
+Provides an isolated in-memory database per test
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import (  # noqa: F401 - register every table on Base.metadata
+    attendance,
+    club,
+    complaint,
+    events,
+    qr_attendance,
+    risk,
+    schedule,
+    schedule_feedback,
+    student,
+)
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine shared across connections"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    """Database session bound to the in-memory engine"""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class QueryCounter:
+    """Counts SQL statements issued against an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+@pytest.fixture
+def count_queries(engine):
+    """Context manager factory that records statements issued in its block"""
+    return lambda: QueryCounter(engine)
@@ -0,0 +1,121 @@
+"""
+Tests for the async engine profile and async dashboard queries
+"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.database import (
+    Base,
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    async_database_url,
+    create_async_database_engine,
+    engine_options,
+    get_pool_metrics,
+)
+from backend.models.complaint import Complaint
+from backend.models.risk import RiskLog
+from backend.models.student import Student
+from backend.routes import dashboard
+
+
+def test_async_url_and_profile():
+    assert async_database_url("sqlite:///./campus.db") == "sqlite+aiosqlite:///./campus.db"
+    assert async_database_url("postgresql+psycopg2://u:p@db/campus") == (
+        "postgresql+asyncpg://u:p@db/campus"
+    )
+
+    options = engine_options("postgresql+asyncpg://u:p@db/campus")
+    assert options["poolclass"] is InstrumentedAsyncQueuePool
+    assert options["connect_args"]["server_settings"] == {
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+    }
+    assert "check_same_thread" not in engine_options("sqlite+aiosqlite:///x.db")["connect_args"]
+    assert "poolclass" not in engine_options("sqlite+aiosqlite://")
+
+
+def test_pool_metrics_count_only_checkout_timeouts():
+    def refuse():
+        raise OSError("connection refused")
+
+    pool = InstrumentedQueuePool(refuse, pool_size=1, max_overflow=0, timeout=0.01)
+    with pytest.raises(OSError):
+        pool.connect()
+    assert pool.metrics.timeouts == 0
+
+    pool = InstrumentedQueuePool(lambda: object(), pool_size=1, max_overflow=0, timeout=0.01)
+    held = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    snapshot = pool.metrics.snapshot(pool)
+    assert snapshot["checkout_timeouts"] == 1 and snapshot["max_overflow"] == 0
+    held.invalidate()
+
+
+async def test_async_session_runs_students_at_risk_query(tmp_path):
+    engine = create_async_database_engine(f"sqlite:///{tmp_path / 'async.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+
+        async with AsyncSession(engine) as db:
+            db.add_all([Student(id=1, name="Asha", roll_no="R1", department="CSE")])
+            db.add_all(
+                RiskLog(
+                    student_id=1,
+                    risk_type="Attendance",
+                    severity=severity,
+                    description=f"risk {i}",
+                    created_at=datetime(2024, 1, 1, i),
+                )
+                for i, severity in enumerate(["High", "Low"])
+            )
+            await db.commit()
+
+            rows = (await db.execute(dashboard._students_at_risk_stmt(db.bind, 0, 50))).all()
+
+        [summary] = dashboard._risk_summaries(rows)
+        assert summary.risk_count == 2 and summary.latest_risk == "risk 1"
+        assert summary.risk_levels == {"High": 1, "Medium": 0, "Low": 1}
+        assert get_pool_metrics(engine)["checkouts"] >= 2
+    finally:
+        await engine.dispose()
+
+
+async def test_complaint_priority_summary_is_counted_in_sql(tmp_path):
+    engine = create_async_database_engine(f"sqlite:///{tmp_path / 'async.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine) as db:
+            empty = await dashboard.get_complaints_by_priority(db=db)
+            assert empty.total == 0 and empty.critical == 0 and empty.pending == 0
+
+            db.add_all(
+                Complaint(
+                    student_id=1, title="t", description="d", category="Other",
+                    priority=priority, status=status,
+                )
+                for priority, status in [
+                    ("Urgent", "Pending"), ("High", "Resolved"), ("Low", "Pending"),
+                ]
+            )
+            await db.commit()
+            summary = await dashboard.get_complaints_by_priority(db=db)
+
+        assert (summary.total, summary.critical, summary.high, summary.medium, summary.low) == (
+            3, 1, 1, 0, 1
+        )
+        assert (summary.pending, summary.resolved) == (2, 1)
+    finally:
+        await engine.dispose()
@@ -0,0 +1,121 @@
+"""
+Tests for the attended/held subject counters
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.core.attendance_stats import (
+    SessionStatsFinalizer,
+    rebuild_attendance_stats,
+    reopen_session_stats,
+)
+from backend.database import Base, create_database_engine
+from backend.models.qr_attendance import (
+    QRAttendanceRecord,
+    QRAttendanceSession,
+    QRStudentSubjectStats,
+    QRSubjectSessionsHeld,
+)
+
+
+def _add_session(db, pk, subject_code, attendees, expired=True, cancelled=False, section=None):
+    now = datetime.utcnow()
+    db.add(
+        QRAttendanceSession(
+            id=pk,
+            session_id=f"session-{pk}",
+            faculty_id="F1",
+            faculty_name="Prof X",
+            subject_code=subject_code,
+            subject_name=f"Subject {subject_code}",
+            branch="CSE",
+            semester="3",
+            section=section,
+            lecture_date=now,
+            lecture_start_time=now,
+            qr_code_data="{}",
+            qr_code_hash="h" * 64,
+            qr_expires_at=now + timedelta(minutes=-5 if expired else 5),
+            is_cancelled=cancelled,
+            center_latitude=12.0,
+            center_longitude=77.0,
+        )
+    )
+    for student_id, is_late in attendees:
+        db.add(
+            QRAttendanceRecord(
+                session_id=pk,
+                student_id=student_id,
+                roll_number=f"R{student_id}",
+                student_name=student_id,
+                branch="CSE",
+                semester="3",
+                is_late_entry=is_late,
+                student_latitude=12.0,
+                student_longitude=77.0,
+                distance_from_center=0.0,
+            )
+        )
+
+
+def _counters(db):
+    held = {
+        (r.section, r.subject_code): r.held for r in db.scalars(select(QRSubjectSessionsHeld))
+    }
+    students = {
+        (r.student_id, r.subject_code): (r.attended, r.late)
+        for r in db.scalars(select(QRStudentSubjectStats))
+        if r.attended or r.late
+    }
+    return held, students
+
+
+def test_finalize_reopen_and_rebuild_agree(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        _add_session(db, 1, "CS101", [("S1", False), ("S2", True)])
+        _add_session(db, 2, "CS101", [("S1", True)], section="A")
+        _add_session(db, 3, "MA201", [("S2", False)])
+        _add_session(db, 4, "MA201", [("S1", False)], expired=False)  # still open
+        _add_session(db, 5, "MA201", [("S1", False)], cancelled=True)
+        db.commit()
+
+    finalizer = SessionStatsFinalizer(bind=engine)
+    assert finalizer.run() == 3
+    assert finalizer.run() == 0
+
+    expected = (
+        {("", "CS101"): 1, ("A", "CS101"): 1, ("", "MA201"): 1},
+        {
+            ("S1", "CS101"): (2, 1),
+            ("S2", "CS101"): (1, 1),
+            ("S2", "MA201"): (1, 0),
+        },
+    )
+    with Session(engine) as db:
+        assert _counters(db) == expected
+        assert db.get(QRAttendanceSession, 4).stats_finalized_at is None
+
+        # Reopening (e.g. regenerate) takes the session back out until it closes again
+        session = db.get(QRAttendanceSession, 2)
+        assert reopen_session_stats(db.connection(), session)
+        session.stats_finalized_at = None
+        db.commit()
+        held, students = _counters(db)
+        assert held[("A", "CS101")] == 0
+        assert students[("S1", "CS101")] == (1, 0)
+
+    assert finalizer.run() == 1
+    with Session(engine) as db:
+        assert _counters(db) == expected
+        result = rebuild_attendance_stats(db)
+        db.commit()
+        assert result == {"sessions_counted": 3, "cohort_subjects": 3, "student_subjects": 3}
+        assert _counters(db) == expected
+        assert db.get(QRAttendanceSession, 4).stats_finalized_at is None
+        assert db.get(QRAttendanceSession, 5).stats_finalized_at is None
+    engine.dispose()
@@ -0,0 +1,44 @@
+"""
+Tests for scheduled task logging
+"""
+
+from backend.core import background_tasks
+from backend.core.background_tasks import ScheduledTask
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.events = []
+
+    def log_event(self, event, level="INFO", **kwargs):
+        self.events.append((event, level))
+
+    def log_error(self, event, error, **kwargs):
+        self.events.append((event, "ERROR"))
+
+
+async def test_idle_runs_log_at_debug_and_working_runs_at_info(monkeypatch):
+    log = RecordingLogger()
+    monkeypatch.setattr(background_tasks, "logger", log)
+    results = iter([0, 12])
+
+    async def flush():
+        return next(results)
+
+    def failing():
+        raise RuntimeError("boom")
+
+    task = ScheduledTask("flush", flush, interval=1)
+    await task.execute()
+    assert log.events == [
+        ("scheduled_task_started", "DEBUG"),
+        ("scheduled_task_completed", "DEBUG"),
+    ]
+
+    log.events.clear()
+    await task.execute()
+    assert log.events[-1] == ("scheduled_task_completed", "INFO")
+
+    log.events.clear()
+    await ScheduledTask("failing", failing, interval=1).execute()
+    assert log.events[-1] == ("scheduled_task_failed", "ERROR")
@@ -0,0 +1,39 @@
+"""
+Tests for batched risk evaluation of bulk attendance
+"""
+
+from datetime import datetime, timedelta
+
+from backend.core.agents import AttendanceRiskAgent
+from backend.core.event_bus import Event, EventType
+from backend.models.attendance import Attendance
+from backend.models.risk import RiskLog
+
+
+def _mark(db, student_id, statuses):
+    now = datetime.utcnow()
+    db.add_all(
+        Attendance(student_id=student_id, status=s, date=now - timedelta(days=i))
+        for i, s in enumerate(statuses)
+    )
+
+
+def test_bulk_event_flags_students_below_threshold_in_one_pass(db_session, count_queries):
+    _mark(db_session, 1, ["Present"] * 4)  # 100%
+    _mark(db_session, 2, ["Present", "Absent", "Absent", "Present"])  # 50% -> High
+    _mark(db_session, 3, ["Present", "Present", "Absent", "Present", "Absent"])  # 60% -> Medium
+    _mark(db_session, 4, ["Absent"])  # already flagged
+    db_session.add(RiskLog(student_id=4, risk_type="Attendance", severity="High", description="x"))
+    db_session.commit()
+
+    event = Event(EventType.ATTENDANCE_BULK_MARKED, {"student_ids": [1, 2, 3, 4]})
+    with count_queries() as counter:
+        AttendanceRiskAgent.handle_attendance_bulk_marked(event, db_session)
+
+    flagged = {
+        r.student_id: r.severity
+        for r in db_session.query(RiskLog).filter(RiskLog.description != "x")
+    }
+    assert flagged == {2: "High", 3: "Medium"}
+    # ratios + existing risks + risk-log INSERT(s), independent of roster size
+    assert counter.count <= 2 + len(flagged)
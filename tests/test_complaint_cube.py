@@ -0,0 +1,125 @@
+"""
+Tests for the pre-aggregated complaint heatmap cube
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import func, select, update
+
+from backend.core.complaint_cube import load_heatmap, rebuild_complaint_cube
+from backend.models.complaint import Complaint, ComplaintHeatmapCell
+
+
+def _complaint(created_at, category="Academic"):
+    return Complaint(
+        student_id=1, title="Broken", description="Projector broken", category=category,
+        created_at=created_at,
+    )
+
+
+def _cells(db):
+    rows = db.execute(
+        select(
+            ComplaintHeatmapCell.bucket_date,
+            ComplaintHeatmapCell.hour,
+            ComplaintHeatmapCell.category,
+            ComplaintHeatmapCell.count,
+        ).where(ComplaintHeatmapCell.count != 0)
+    ).all()
+    return {(d, h, c): n for d, h, c, n in rows}
+
+
+def test_cube_tracks_insert_recategorize_and_delete(db_session):
+    monday_9 = datetime(2024, 1, 1, 9, 30)
+    first, second = _complaint(monday_9), _complaint(monday_9, "Other")
+    db_session.add_all([first, second])
+    db_session.commit()
+    assert _cells(db_session) == {
+        (date(2024, 1, 1), 9, "Academic"): 1,
+        (date(2024, 1, 1), 9, "Other"): 1,
+    }
+
+    second.category = "Academic"
+    db_session.commit()
+    assert _cells(db_session) == {(date(2024, 1, 1), 9, "Academic"): 2}
+
+    db_session.delete(first)
+    db_session.commit()
+    assert _cells(db_session) == {(date(2024, 1, 1), 9, "Academic"): 1}
+
+
+def test_heatmap_grid_and_rankings(db_session):
+    db_session.add_all(
+        [
+            _complaint(datetime(2024, 1, 1, 9)),  # Monday
+            _complaint(datetime(2024, 1, 8, 9), "Health"),  # Monday, next week
+            _complaint(datetime(2024, 1, 3, 14)),  # Wednesday
+            _complaint(datetime(2023, 12, 1, 14)),  # outside the window
+        ]
+    )
+    db_session.commit()
+
+    heatmap = load_heatmap(db_session, since=date(2024, 1, 1))
+
+    assert heatmap.total == 3
+    assert heatmap.grid[0, 9] == 2 and heatmap.grid[2, 14] == 1
+    assert heatmap.top_times() == [
+        {"time": "Monday 9:00", "count": 2},
+        {"time": "Wednesday 14:00", "count": 1},
+    ]
+    assert heatmap.top_categories() == {"Academic": 2, "Health": 1}
+    cells = heatmap.cells()
+    assert len(cells) == 7 * 24
+    assert cells[9] == {"day_of_week": "Monday", "hour": 9, "count": 2, "intensity": 1.0}
+
+
+def test_rebuild_matches_incremental_cube(db_session):
+    db_session.add_all([_complaint(datetime(2024, 1, 1, h % 24)) for h in range(30)])
+    db_session.commit()
+    incremental = _cells(db_session)
+
+    db_session.execute(ComplaintHeatmapCell.__table__.delete())
+    db_session.commit()
+    assert rebuild_complaint_cube(db_session) == 24
+
+    assert _cells(db_session) == incremental
+
+
+def test_bulk_update_and_delete_move_the_counts_of_matched_rows(db_session):
+    db_session.add_all([_complaint(datetime(2024, 1, 1, h)) for h in (9, 9, 14)])
+    db_session.commit()
+
+    db_session.execute(
+        update(Complaint).where(Complaint.created_at >= datetime(2024, 1, 1, 14)).values(
+            category="Health", created_at=datetime(2024, 1, 2, 8)
+        )
+    )
+    db_session.query(Complaint).filter(Complaint.created_at < datetime(2024, 1, 1, 10)).delete()
+    db_session.commit()
+
+    assert _cells(db_session) == {(date(2024, 1, 2), 8, "Health"): 1}
+
+
+def test_moving_created_at_moves_the_count(db_session):
+    filed = _complaint(datetime(2024, 1, 1, 9, 30))
+    db_session.add(filed)
+    db_session.commit()
+
+    filed.created_at = datetime(2024, 1, 3, 14)
+    db_session.commit()
+    assert _cells(db_session) == {(date(2024, 1, 3), 14, "Academic"): 1}
+
+
+def test_decrementing_a_missing_cell_never_goes_negative(db_session):
+    filed = _complaint(datetime(2024, 1, 1, 9))
+    db_session.add(filed)
+    db_session.commit()
+    db_session.execute(ComplaintHeatmapCell.__table__.delete())
+
+    db_session.delete(filed)
+    db_session.commit()
+    assert db_session.scalar(select(func.min(ComplaintHeatmapCell.count))) is None
+
+    db_session.add(_complaint(datetime(2024, 1, 1, 9)))
+    db_session.commit()
+    assert _cells(db_session) == {(date(2024, 1, 1), 9, "Academic"): 1}
@@ -0,0 +1,128 @@
+"""
+Tests for the set-based dashboard aggregations
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.models.risk import RiskLog
+from backend.models.student import Student
+from backend.routes import dashboard
+
+
+def _seed_risks(db, students: int, risks_per_student: int):
+    base = datetime(2024, 1, 1)
+    for i in range(students):
+        db.add(Student(id=i + 1, name=f"Student {i + 1}", roll_no=f"R{i + 1}", department="CSE"))
+    for i in range(students):
+        for j in range(risks_per_student + i):
+            db.add(
+                RiskLog(
+                    student_id=i + 1,
+                    risk_type="Attendance",
+                    severity=["High", "Medium", "Low"][j % 3],
+                    description=f"risk {i + 1}-{j}",
+                    created_at=base + timedelta(hours=j),
+                )
+            )
+    # Resolved and student-less rows must be ignored
+    db.add(RiskLog(student_id=1, risk_type="Other", severity="High", description="old", resolved=1))
+    db.add(RiskLog(student_id=None, risk_type="Academic", severity="High", description="conflict"))
+    db.commit()
+
+
+def _students_at_risk(db, skip: int, limit: int):
+    rows = db.execute(dashboard._students_at_risk_stmt(db.get_bind(), skip, limit)).all()
+    return dashboard._risk_summaries(rows)
+
+
+@pytest.mark.parametrize("window_functions", [True, False])
+def test_students_at_risk_aggregates_counts_and_latest(db_session, monkeypatch, window_functions):
+    monkeypatch.setattr(dashboard, "supports_window_functions", lambda bind: window_functions)
+    _seed_risks(db_session, students=3, risks_per_student=2)
+
+    summaries = _students_at_risk(db_session, skip=0, limit=50)
+
+    assert [s.student_id for s in summaries] == [3, 2, 1]
+    top = summaries[0]
+    assert top.risk_count == 4
+    assert top.risk_levels == {"High": 2, "Medium": 1, "Low": 1}
+    assert top.latest_risk == "risk 3-3"
+    assert top.last_risk_date == datetime(2024, 1, 1, 3)
+
+
+def test_students_at_risk_paginates(db_session):
+    _seed_risks(db_session, students=5, risks_per_student=1)
+
+    page = _students_at_risk(db_session, skip=1, limit=2)
+
+    assert [s.student_id for s in page] == [4, 3]
+
+
+def test_students_at_risk_query_count_is_constant(db_session, count_queries):
+    _seed_risks(db_session, students=2, risks_per_student=1)
+    with count_queries() as small:
+        _students_at_risk(db_session, skip=0, limit=500)
+
+    extra_students = [
+        Student(id=100 + i, name=f"Extra {i}", roll_no=f"X{i}", department="ECE")
+        for i in range(40)
+    ]
+    db_session.add_all(extra_students)
+    db_session.add_all(
+        RiskLog(student_id=100 + i, risk_type="Health", severity="Low", description="extra")
+        for i in range(40)
+    )
+    db_session.commit()
+    with count_queries() as large:
+        summaries = _students_at_risk(db_session, skip=0, limit=500)
+
+    assert len(summaries) == 42
+    assert small.count == large.count == 1
+
+
+def test_analytics_summary_uses_aggregate_queries(db_session, count_queries):
+    from backend.models.attendance import Attendance
+    from backend.models.complaint import Complaint
+    from backend.routes.analytics import get_analytics_summary
+
+    _seed_risks(db_session, students=2, risks_per_student=1)
+    old = datetime.utcnow() - timedelta(days=30)
+    for i, status in enumerate(["Present", "Present", "Absent", "Late", "Excused"]):
+        db_session.add(Attendance(student_id=1, status=status, date=old if i == 0 else datetime.utcnow()))
+    db_session.add(Complaint(student_id=1, title="t", description="d", category="Other"))
+    db_session.add(
+        Complaint(student_id=2, title="t", description="d", category="Other", status="Resolved")
+    )
+    db_session.commit()
+
+    with count_queries() as counter:
+        summary = get_analytics_summary(db=db_session)
+
+    assert counter.count == 4
+    assert summary["overall_metrics"]["total_students"] == 2
+    assert summary["weekly_metrics"]["attendance_records"] == 4
+    assert summary["attendance_breakdown"] == {"present": 2, "absent": 1, "late": 1, "total": 5}
+    assert summary["complaint_breakdown"] == {"pending": 1, "resolved": 1, "total": 2}
+    assert summary["risk_summary"] == {"total": 5, "unresolved": 4, "resolved": 1}
+
+
+def test_risk_distribution_groups_in_two_queries(db_session, count_queries):
+    from backend.routes.analytics import _aggregate_risk_distribution
+
+    _seed_risks(db_session, students=6, risks_per_student=1)
+
+    with count_queries() as counter:
+        result = _aggregate_risk_distribution(db_session)
+
+    assert counter.count == 2
+    assert result["total_risks"] == 23
+    assert result["unresolved_risks"] == 22 and result["resolved_risks"] == 1
+    assert result["risk_distribution"][0] == {
+        "risk_type": "Attendance",
+        "count": 21,
+        "percentage": 91.3,
+        "severity_breakdown": {"High": 9, "Medium": 7, "Low": 5},
+    }
+    assert [s["student_id"] for s in result["top_affected_students"]] == [6, 5, 4, 3, 1]
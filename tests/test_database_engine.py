@@ -0,0 +1,49 @@
+"""
+Tests for engine profiles and pool metrics
+"""
+
+from sqlalchemy import text
+
+from backend.core.config import settings
+from backend.database import (
+    InstrumentedQueuePool,
+    create_database_engine,
+    engine_options,
+    get_pool_metrics,
+)
+
+
+def test_postgres_profile_applies_pool_and_statement_timeout():
+    options = engine_options("postgresql://user:pass@db/campus")
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE
+    assert options["pool_size"] + options["max_overflow"] <= settings.MAX_POOL_SIZE
+    assert options["connect_args"]["options"] == (
+        f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    )
+
+
+def test_in_memory_sqlite_keeps_default_pool():
+    assert "poolclass" not in engine_options("sqlite://")
+    assert "poolclass" not in engine_options("sqlite:///:memory:")
+
+
+def test_sqlite_file_engine_sets_pragmas_and_records_checkouts(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == (
+                settings.SQLITE_BUSY_TIMEOUT_MS
+            )
+            in_use = get_pool_metrics(engine)
+
+        idle = get_pool_metrics(engine)
+        assert in_use["checked_out"] == 1 and in_use["saturation"] > 0
+        assert idle["checked_out"] == 0 and idle["checkouts"] == 1
+        assert idle["peak_saturation"] == in_use["saturation"]
+    finally:
+        engine.dispose()
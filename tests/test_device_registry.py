@@ -0,0 +1,82 @@
+"""
+Tests for the cached device registry and batched device statistics
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.device_registry import DeviceRegistry
+from backend.database import Base, create_async_database_engine, create_database_engine
+from backend.models.qr_attendance import DeviceFingerprint
+
+
+@pytest.fixture
+async def async_engine(tmp_path):
+    engine = create_async_database_engine(f"sqlite:///{tmp_path / 'devices.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db:
+        db.add_all(
+            DeviceFingerprint(device_id=f"device-{i}", student_id=f"S{i}", student_name="")
+            for i in range(2)
+        )
+        await db.commit()
+    yield engine
+    await engine.dispose()
+
+
+def _statements(sync_engine) -> list:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def test_ownership_is_looked_up_once_until_invalidated(async_engine):
+    registry = DeviceRegistry(ttl=60)
+    async with AsyncSession(async_engine) as db:
+        statements = _statements(async_engine.sync_engine)
+        for _ in range(10):
+            entry = await registry.lookup(db, "device-0")
+        assert (entry.student_id, entry.is_blocked) == ("S0", False)
+        assert await registry.lookup(db, "unknown-device") is None
+        assert statements == ["SELECT", "SELECT"]
+
+        await db.execute(
+            update(DeviceFingerprint)
+            .where(DeviceFingerprint.device_id == "device-0")
+            .values(is_blocked=True, block_reason="lost")
+        )
+        await db.commit()
+        registry.invalidate("device-0")
+        assert (await registry.lookup(db, "device-0")).is_blocked
+    assert registry.metrics()["hits"] == 9
+
+
+async def test_usage_stats_are_coalesced_into_one_update(async_engine, tmp_path):
+    sync_engine = create_database_engine(f"sqlite:///{tmp_path / 'devices.db'}")
+    registry = DeviceRegistry(bind=sync_engine)
+    start = datetime(2026, 1, 5, 9, 0)
+    for i in range(30):
+        registry.record_use(f"device-{i % 2}", f"Name {i % 2}", start + timedelta(seconds=i))
+    registry.record_use("never-registered", "Nobody")
+
+    statements = _statements(sync_engine)
+    assert registry.flush() == 3
+    assert statements == ["UPDATE"]
+    assert registry.flush() == 0
+    sync_engine.dispose()
+
+    async with AsyncSession(async_engine) as db:
+        device = await db.get(DeviceFingerprint, 2)
+    assert (device.total_scans, device.student_name) == (15, "Name 1")
+    assert device.last_used == start + timedelta(seconds=29)
@@ -0,0 +1,73 @@
+"""
+Tests for the streaming export endpoints
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.attendance import Attendance
+from backend.models.risk import RiskLog
+from backend.models.student import Student
+from backend.routes import exports
+
+
+def _seed(db):
+    db.add_all(
+        [
+            Student(id=1, name="Asha", roll_no="R1", department="CSE"),
+            Student(id=2, name="Ravi", roll_no="R2", department="ECE"),
+        ]
+    )
+    for day in range(1, 6):
+        for student_id in (1, 2):
+            db.add(
+                Attendance(
+                    student_id=student_id,
+                    status="Present" if day % 2 else "Absent",
+                    date=datetime(2024, 1, day, 9),
+                )
+            )
+    db.add(RiskLog(student_id=None, risk_type="Academic", severity="High", description="clash"))
+    db.commit()
+
+
+def _export(engine, stmt, fmt, batch_size=2):
+    chunks = list(exports.stream_rows(sessionmaker(bind=engine), stmt, fmt, batch_size))
+    return chunks, "".join(chunks)
+
+
+def test_ndjson_export_streams_in_batches_with_filters(engine, db_session):
+    _seed(db_session)
+    stmt = exports.attendance_export_stmt(date(2024, 1, 2), date(2024, 1, 4), department="CSE")
+
+    chunks, body = _export(engine, stmt, "ndjson")
+
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert [r["date"] for r in rows] == [
+        "2024-01-02T09:00:00",
+        "2024-01-03T09:00:00",
+        "2024-01-04T09:00:00",
+    ]
+    assert {r["department"] for r in rows} == {"CSE"} and rows[0]["student_name"] == "Asha"
+    assert len(chunks) == 2  # batches of 2 rows
+
+
+def test_csv_export_has_header_and_keeps_student_less_risks(engine, db_session):
+    _seed(db_session)
+
+    _, body = _export(engine, exports.risks_export_stmt(status="unresolved"), "csv")
+
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert len(rows) == 1
+    assert rows[0]["risk_type"] == "Academic" and rows[0]["student_id"] == ""
+
+
+def test_empty_csv_export_still_sends_header(engine, db_session):
+    _, body = _export(engine, exports.attendance_export_stmt(status="Late"), "csv")
+    assert body.strip() == (
+        "id,student_id,roll_no,student_name,department,status,date,remarks"
+    )
@@ -0,0 +1,35 @@
+"""
+Tests for geofence distance helpers
+"""
+
+import numpy as np
+
+from backend.core.geo import geofence_check, haversine_m, haversine_many, within_radius
+
+CENTER = (12.9716, 77.5946)
+
+
+def test_vectorized_haversine_matches_scalar():
+    rng = np.random.default_rng(7)
+    lats = CENTER[0] + rng.uniform(-0.01, 0.01, 2000)
+    lons = CENTER[1] + rng.uniform(-0.01, 0.01, 2000)
+
+    distances = haversine_many(*CENTER, lats, lons)
+    expected = [haversine_m(*CENTER, lat, lon) for lat, lon in zip(lats, lons)]
+    np.testing.assert_allclose(distances, expected, rtol=1e-9)
+    assert haversine_m(*CENTER, *CENTER) == 0.0
+    assert abs(haversine_m(0.0, 0.0, 0.0, 1.0) - 111194.93) < 0.01
+
+
+def test_precheck_agrees_with_exact_fence_decision():
+    radius = 100.0
+    # Points on a ring crossing the fence boundary, including within the margin band
+    for distance in (10, 98.9, 99.5, 99.99, 100.01, 100.5, 101.2, 500, 5000):
+        for bearing in np.linspace(0, 2 * np.pi, 16, endpoint=False):
+            lat = CENTER[0] + np.degrees(distance * np.cos(bearing) / 6371000.0)
+            lon = CENTER[1] + np.degrees(
+                distance * np.sin(bearing) / (6371000.0 * np.cos(np.radians(CENTER[0])))
+            )
+            exact_distance, inside = geofence_check(*CENTER, radius, lat, lon)
+            assert within_radius(*CENTER, radius, lat, lon) == inside
+            assert inside == (exact_distance <= radius)
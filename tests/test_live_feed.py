@@ -0,0 +1,89 @@
+"""
+Tests for the live attendance pub/sub hub
+"""
+
+import asyncio
+import json
+
+from backend.core.live_feed import LiveFeedHub
+from backend.routes import qr_attendance
+from backend.routes.qr_attendance import sse_message
+
+
+async def test_publish_fans_out_per_session_and_drops_oldest_for_slow_consumers():
+    hub = LiveFeedHub(queue_size=2)
+    first, second = hub.subscribe("s1"), hub.subscribe("s1")
+    other = hub.subscribe("s2")
+
+    for i in range(3):
+        hub.publish("s1", "attendance_marked", {"student_id": f"S{i}"})
+
+    for queue in (first, second):
+        received = [queue.get_nowait()["data"]["student_id"] for _ in range(queue.qsize())]
+        assert received == ["S1", "S2"]
+    assert other.empty()
+    assert hub.metrics()["dropped"] == 2
+
+    hub.unsubscribe("s1", first)
+    hub.unsubscribe("s1", second)
+    hub.publish("s1", "session_updated", {"is_active": False})
+    assert hub.metrics()["subscribers"] == 1
+
+
+async def test_remote_messages_skip_their_origin_worker():
+    hub = LiveFeedHub()
+    queue = hub.subscribe("s1")
+    message = {"event": "attendance_marked", "data": {"student_id": "S1"}}
+
+    def remote(origin):
+        return json.dumps({"origin": origin, "session_id": "s1", "message": message})
+
+    hub._handle_remote(remote(hub.worker_id))
+    assert queue.empty()
+    hub._handle_remote(remote("other-worker"))
+    assert queue.get_nowait() == message and hub.remote_received == 1
+
+
+def test_sse_framing():
+    assert sse_message("snapshot", {"total_present": 3}) == (
+        'event: snapshot\ndata: {"total_present": 3}\n\n'
+    )
+
+
+
+class IdleWebSocket:
+    """Client that never sends and disconnects when told to"""
+
+    def __init__(self):
+        self.sent = []
+        self.gone = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "websocket.disconnect", "code": 1000}
+
+
+async def test_websocket_subscriber_is_dropped_when_an_idle_client_disconnects(monkeypatch):
+    hub = LiveFeedHub()
+
+    async def snapshot(session_id):
+        return {"total_present": 0}
+
+    monkeypatch.setattr(qr_attendance, "live_feed", hub)
+    monkeypatch.setattr(qr_attendance, "_live_snapshot", snapshot)
+    websocket = IdleWebSocket()
+    handler = asyncio.create_task(qr_attendance.live_attendance_websocket(websocket, "s1"))
+    await asyncio.sleep(0.01)
+    assert websocket.sent[0]["event"] == "snapshot"
+    assert hub.metrics()["subscribers"] == 1
+
+    # No event is published after the disconnect, so only the receive watcher notices it
+    websocket.gone.set()
+    await asyncio.wait_for(handler, timeout=1)
+    assert hub.metrics()["subscribers"] == 0
@@ -0,0 +1,193 @@
+"""
+Tests for the migration runner and the hot-path index set
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.exc import IntegrityError
+
+from backend.migrations import (
+    applied_revisions,
+    discover_migrations,
+    run_migrations,
+    schema_migrations,
+)
+from backend.models import events, replication, schedule_feedback, student  # noqa: F401
+from backend.models.attendance import Attendance
+from backend.models.club import ClubAttendance
+from backend.models.complaint import Complaint, ComplaintHeatmapCell
+from backend.models.qr_attendance import QRAttendanceRecord, QRAttendanceSession
+from backend.models.risk import RiskLog
+from backend.models.schedule import Schedule
+
+NOW = datetime(2024, 1, 1)
+
+HOT_QUERIES = {
+    "ix_attendance_student_date": select(Attendance).where(
+        Attendance.student_id == 1, Attendance.date >= NOW
+    ),
+    "ix_complaints_created_at": select(func.count(Complaint.id)).where(
+        Complaint.created_at >= NOW
+    ),
+    "ix_complaints_status": select(func.count(Complaint.id)).where(Complaint.status == "Pending"),
+    "ix_risk_logs_student_resolved_type": select(RiskLog).where(
+        RiskLog.student_id == 1, RiskLog.resolved == 0, RiskLog.risk_type == "Attendance"
+    ),
+    "ix_risk_logs_resolved_type_severity": select(
+        RiskLog.risk_type, RiskLog.severity, RiskLog.resolved, func.count(RiskLog.id)
+    ).group_by(RiskLog.resolved, RiskLog.risk_type, RiskLog.severity),
+    "ix_schedules_location_active_window": select(Schedule).where(
+        Schedule.location == "Room 1",
+        Schedule.is_active == 1,
+        Schedule.start_date < NOW,
+        Schedule.end_date > NOW,
+    ),
+    "uq_qr_attendance_records_session_student": select(QRAttendanceRecord.id).where(
+        QRAttendanceRecord.session_id == 1, QRAttendanceRecord.student_id == "S1"
+    ),
+    "ix_qr_attendance_sessions_active_expiry": select(QRAttendanceSession.id)
+    .where(QRAttendanceSession.is_active.is_(True), QRAttendanceSession.qr_expires_at <= NOW)
+    .order_by(QRAttendanceSession.qr_expires_at),
+    "ix_club_attendance_club_date": select(ClubAttendance).where(
+        ClubAttendance.club_id == 1, ClubAttendance.attendance_date >= NOW
+    ),
+}
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+def _query_plan(engine, stmt) -> str:
+    compiled = stmt.compile(dialect=sqlite.dialect(paramstyle="named"))
+    params = {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in compiled.params.items()
+    }
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"), params).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_migrations_apply_once(migrated_engine):
+    expected = [m.revision for m in discover_migrations()]
+    assert applied_revisions(migrated_engine) == expected
+    assert run_migrations(migrated_engine) == []
+
+
+def test_revision_claimed_by_another_worker_is_skipped(migrated_engine, monkeypatch):
+    # Simulate a worker that read schema_migrations before a concurrent run committed
+    monkeypatch.setattr("backend.migrations.applied_revisions", lambda engine: [])
+    assert run_migrations(migrated_engine) == []
+
+
+def _schema(engine) -> dict:
+    inspector = inspect(engine)
+    return {
+        table: (
+            sorted(column["name"] for column in inspector.get_columns(table)),
+            sorted(index["name"] for index in inspector.get_indexes(table)),
+            sorted(uq["name"] or "" for uq in inspector.get_unique_constraints(table)),
+        )
+        for table in inspector.get_table_names()
+        if table != "schema_migrations"
+    }
+
+
+def test_migrated_schema_matches_models(migrated_engine, tmp_path):
+    from backend.database import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'models.db'}")
+    Base.metadata.create_all(engine)
+    assert _schema(migrated_engine) == _schema(engine)
+    engine.dispose()
+
+
+def test_baseline_deployment_gets_backfilled_complaint_cube(tmp_path):
+    baseline = discover_migrations()[0]
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    applied_revisions(engine)
+    with engine.begin() as conn:
+        baseline.upgrade(conn)
+        conn.execute(schema_migrations.insert().values(revision=baseline.revision, applied_at=NOW))
+        conn.exec_driver_sql(
+            "INSERT INTO students (id, name, roll_no, department) VALUES (1, 'A', 'R1', 'CSE')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO complaints"
+            " (student_id, title, description, category, status, priority, created_at)"
+            " VALUES (1, 't', 'd', 'Academic', 'Pending', 'Low', '2024-01-01 09:15:00'),"
+            " (1, 't', 'd', 'Academic', 'Pending', 'Low', '2024-01-01 09:45:00')"
+        )
+    assert "complaint_heatmap_cube" not in inspect(engine).get_table_names()
+
+    assert "0009_complaint_heatmap_cube" in run_migrations(engine)
+
+    with engine.connect() as conn:
+        cells = conn.execute(select(ComplaintHeatmapCell.hour, ComplaintHeatmapCell.count)).all()
+    assert cells == [(9, 2)]
+    engine.dispose()
+
+
+def test_migrations_upgrade_database_created_without_indexes(tmp_path):
+    from backend.database import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index_name in HOT_QUERIES:
+            conn.exec_driver_sql(f"DROP INDEX {index_name}")
+        conn.exec_driver_sql(
+            "INSERT INTO qr_attendance_records (session_id, student_id, roll_number, student_name,"
+            " branch, semester, student_latitude, student_longitude, distance_from_center)"
+            " VALUES (1, 'S1', 'R1', 'A', 'CSE', '1', 0, 0, 0), (1, 'S1', 'R1', 'A', 'CSE', '1', 0, 0, 0)"
+        )
+
+    run_migrations(engine)
+
+    index_names = {ix["name"] for ix in inspect(engine).get_indexes("qr_attendance_records")}
+    assert "uq_qr_attendance_records_session_student" in index_names
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM qr_attendance_records").scalar() == 1
+    engine.dispose()
+
+
+def test_migrations_add_columns_missing_from_older_schema(tmp_path):
+    from backend.database import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE qr_attendance_sessions DROP COLUMN proxy_analyzed_at")
+
+    run_migrations(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("qr_attendance_sessions")}
+    assert "proxy_analyzed_at" in columns
+    engine.dispose()
+
+
+def test_qr_record_unique_per_session_and_student(migrated_engine):
+    insert = (
+        "INSERT INTO qr_attendance_records (session_id, student_id, roll_number, student_name,"
+        " branch, semester, student_latitude, student_longitude, distance_from_center)"
+        " VALUES (1, 'S1', 'R1', 'A', 'CSE', '1', 0, 0, 0)"
+    )
+    with migrated_engine.begin() as conn:
+        conn.exec_driver_sql(insert)
+    with pytest.raises(IntegrityError):
+        with migrated_engine.begin() as conn:
+            conn.exec_driver_sql(insert)
+
+
+@pytest.mark.parametrize("index_name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(migrated_engine, index_name):
+    plan = _query_plan(migrated_engine, HOT_QUERIES[index_name])
+    assert f"INDEX {index_name}" in plan, plan
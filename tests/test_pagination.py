@@ -0,0 +1,144 @@
+"""
+Tests for keyset (cursor) pagination
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+
+from backend.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    CursorParams,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from backend.models.attendance import Attendance
+from backend.models.events import EventAnnouncement
+from backend.models.student import Student
+
+
+def _pages(db, stmt, keys, limit, descending=False):
+    pages, cursor = [], None
+    while True:
+        response = Response()
+        params = CursorParams(cursor=cursor, limit=limit, count=None, skip=None)
+        page = paginate(db, stmt, keys, params, response, descending)
+        pages.append([row.id for row in page])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_roundtrip_and_rejects_garbage():
+    values = [datetime(2024, 1, 1, 9, 30), 42]
+    assert decode_cursor(encode_cursor(values), 2) == values
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", 2)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor([1]), 2)
+
+
+def test_pages_cover_every_row_once(db_session):
+    db_session.add_all(
+        Student(id=i, name=f"S{i}", roll_no=f"R{i}", department="CSE") for i in range(1, 8)
+    )
+    db_session.commit()
+
+    assert _pages(db_session, select(Student), (Student.id,), limit=3) == [
+        [1, 2, 3],
+        [4, 5, 6],
+        [7],
+    ]
+
+
+def test_descending_pages_break_sort_key_ties_by_id(db_session):
+    same_day = datetime(2024, 1, 2)
+    dates = [datetime(2024, 1, 1), same_day, same_day, same_day, datetime(2024, 1, 3)]
+    db_session.add_all(
+        Attendance(id=i + 1, student_id=1, status="Present", date=d) for i, d in enumerate(dates)
+    )
+    db_session.commit()
+
+    pages = _pages(
+        db_session,
+        select(Attendance).where(Attendance.student_id == 1),
+        (Attendance.date, Attendance.id),
+        limit=2,
+        descending=True,
+    )
+
+    assert pages == [[5, 4], [3, 2], [1]]
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_null_sort_keys_are_paged_across_page_boundaries(db_session, descending):
+    day = datetime(2024, 1, 1)
+    rows = [
+        (1, True, day),
+        (2, False, day + timedelta(days=1)),
+        (3, False, None),
+        (4, False, None),
+        (5, False, day),
+        (6, True, None),
+        (7, True, None),
+        (8, False, day + timedelta(days=2)),
+    ]
+    db_session.add_all(
+        EventAnnouncement(id=i, title=f"A{i}", message="m", is_pinned=pinned, publish_date=date)
+        for i, pinned, date in rows
+    )
+    db_session.commit()
+    keys = (EventAnnouncement.is_pinned, EventAnnouncement.publish_date, EventAnnouncement.id)
+
+    pages = _pages(db_session, select(EventAnnouncement), keys, limit=3, descending=descending)
+
+    # Unpublished (NULL publish_date) announcements rank highest within each pin group
+    expected = [7, 6, 1, 4, 3, 8, 2, 5] if descending else [5, 2, 8, 3, 4, 1, 6, 7]
+    assert [i for page in pages for i in page] == expected
+    assert [len(page) for page in pages] == [3, 3, 2]
+
+
+def test_exact_total_count_header(db_session):
+    db_session.add_all(
+        Student(id=i, name=f"S{i}", roll_no=f"R{i}", department="ECE") for i in range(1, 6)
+    )
+    db_session.commit()
+
+    response = Response()
+    page = paginate(
+        db_session,
+        select(Student).where(Student.id > 1),
+        (Student.id,),
+        CursorParams(cursor=None, limit=2, count="exact", skip=None),
+        response,
+    )
+
+    assert [s.id for s in page] == [2, 3]
+    assert response.headers[TOTAL_COUNT_HEADER] == "4"
+
+
+def test_deprecated_skip_pages_by_offset_then_hands_over_a_cursor(db_session):
+    db_session.add_all(
+        Student(id=i, name=f"S{i}", roll_no=f"R{i}", department="ECE") for i in range(1, 6)
+    )
+    db_session.commit()
+
+    response = Response()
+    params = CursorParams(cursor=None, limit=2, count=None, skip=1)
+    page = paginate(db_session, select(Student), (Student.id,), params, response)
+    assert [s.id for s in page] == [2, 3]
+
+    params = CursorParams(
+        cursor=response.headers[NEXT_CURSOR_HEADER], limit=2, count=None, skip=None
+    )
+    page = paginate(db_session, select(Student), (Student.id,), params, Response())
+    assert [s.id for s in page] == [4, 5]
+
+    with pytest.raises(HTTPException):
+        CursorParams(cursor=encode_cursor([1]), limit=2, count=None, skip=1)
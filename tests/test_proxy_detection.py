@@ -0,0 +1,116 @@
+"""
+Tests for the proxy-pattern detection job
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.core.proxy_detection import ProxyDetector, find_proxy_clusters
+from backend.database import Base, create_database_engine
+from backend.models.qr_attendance import QRAttendanceRecord, QRAttendanceSession
+
+T0 = datetime(2024, 1, 1, 9, 0, 0)
+# ~1.1 m of latitude
+STEP = 0.00001
+
+
+def _row(record_id, student_id, ip="10.0.0.1", dlat=0.0, seconds=0):
+    return SimpleNamespace(
+        id=record_id,
+        student_id=student_id,
+        ip_address=ip,
+        student_latitude=12.0 + dlat,
+        student_longitude=77.0,
+        marked_at=T0 + timedelta(seconds=seconds),
+    )
+
+
+def test_clusters_need_shared_ip_proximity_and_timing():
+    rows = [
+        # Chain straddling grid lines: each scan is ~1.1 m and a few seconds from the last
+        _row(1, "S1", dlat=0 * STEP, seconds=0),
+        _row(2, "S2", dlat=1 * STEP, seconds=4),
+        _row(3, "S3", dlat=2 * STEP, seconds=8),
+        _row(4, "S4", dlat=3 * STEP, seconds=12),
+        # Same spot and time but another network
+        _row(5, "S5", ip="10.0.0.2", seconds=2),
+        # Same network and spot, minutes later
+        _row(6, "S6", seconds=300),
+        # One student scanning twice does not make a cluster of three
+        _row(7, "S7", ip="10.0.0.9", seconds=0),
+        _row(8, "S7", ip="10.0.0.9", seconds=1),
+        _row(9, "S8", ip="10.0.0.9", seconds=2),
+        # No IP recorded
+        _row(10, "S9", ip=None),
+    ]
+
+    clusters = find_proxy_clusters(rows, grid_meters=3.0, window_seconds=15, min_cluster=3)
+    assert [sorted(c) for c in clusters] == [[1, 2, 3, 4]]
+    assert find_proxy_clusters(rows, grid_meters=3.0, window_seconds=15, min_cluster=5) == []
+
+
+def test_job_flags_closed_sessions_once(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'proxy.db'}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+
+    with Session(engine) as db:
+        for pk, expires_at in ((1, now - timedelta(minutes=5)), (2, now + timedelta(minutes=5))):
+            db.add(
+                QRAttendanceSession(
+                    id=pk,
+                    session_id=f"session-{pk}",
+                    faculty_id="F1",
+                    faculty_name="Prof X",
+                    subject_code="CS101",
+                    subject_name="Intro CS",
+                    branch="CSE",
+                    semester="3",
+                    lecture_date=now,
+                    lecture_start_time=now,
+                    qr_code_data="{}",
+                    qr_code_hash="h" * 64,
+                    qr_expires_at=expires_at,
+                    center_latitude=12.0,
+                    center_longitude=77.0,
+                )
+            )
+            for n in range(4):
+                db.add(
+                    QRAttendanceRecord(
+                        session_id=pk,
+                        student_id=f"S{n}",
+                        roll_number=f"R{n}",
+                        student_name=f"Student {n}",
+                        branch="CSE",
+                        semester="3",
+                        marked_at=T0 + timedelta(seconds=n),
+                        student_latitude=12.0,
+                        student_longitude=77.0,
+                        distance_from_center=0.0,
+                        # Only three students share the proxy phone's network
+                        ip_address="10.0.0.1" if n < 3 else "10.0.0.2",
+                    )
+                )
+        db.commit()
+
+    detector = ProxyDetector(bind=engine)
+    assert detector.run() == 3
+    assert detector.run() == 0
+
+    with Session(engine) as db:
+        flagged = db.execute(
+            select(QRAttendanceRecord.session_id, QRAttendanceRecord.student_id).where(
+                QRAttendanceRecord.is_proxy_suspected.is_(True)
+            )
+        ).all()
+        assert sorted(flagged) == [(1, "S0"), (1, "S1"), (1, "S2")]
+        open_session, closed_session = db.get(QRAttendanceSession, 2), db.get(QRAttendanceSession, 1)
+        assert closed_session.proxy_analyzed_at is not None
+        assert open_session.proxy_analyzed_at is None
+
+    assert detector.metrics()["sessions_analyzed"] == 1
+    engine.dispose()
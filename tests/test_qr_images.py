@@ -0,0 +1,48 @@
+"""
+Tests for cached QR image rendering
+"""
+
+import base64
+from datetime import datetime, timedelta, timezone
+
+from backend.core import qr_images
+from backend.core.qr_images import QRImageCache, etag_matches, image_etag, render_qr_image
+
+
+def test_png_and_pillow_free_svg_rendering():
+    assert render_qr_image("payload").startswith(b"\x89PNG")
+    assert b"<svg" in render_qr_image("payload", "svg")
+
+
+async def test_images_are_rendered_once_per_hash_until_expiry(monkeypatch):
+    rendered = []
+
+    def fake_render(data, fmt="png"):
+        rendered.append((data, fmt))
+        return f"{data}:{fmt}".encode()
+
+    monkeypatch.setattr(qr_images, "render_qr_image", fake_render)
+    cache = QRImageCache()
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=3)
+
+    for _ in range(5):
+        image = await cache.get_or_render("hash-1", "data-1", "png", expires_at)
+    await cache.get_or_render("hash-1", "data-1", "svg", expires_at)
+    await cache.get_or_render("hash-2", "data-2", "png", expires_at)
+    assert base64.b64decode(image) == b"data-1:png"
+    assert rendered == [("data-1", "png"), ("data-1", "svg"), ("data-2", "png")]
+
+    # Naive timestamps (SQLite) are treated as UTC; expired images are re-rendered
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    cache.put("hash-3", "png", expired, "stale")
+    assert cache.get("hash-3", "png") is None
+    assert cache.metrics() == {"cached_images": 3, "max_entries": 500, "hits": 4, "renders": 3}
+
+
+def test_etag_matching():
+    etag = image_etag("a" * 64, "png")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(image_etag("a" * 64, "svg"), etag)
+    assert not etag_matches(None, etag)
@@ -0,0 +1,137 @@
+"""
+Tests for the QR session snapshot cache used by the scan path
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.qr_session_cache import CachedQRSession, QRSessionCache
+from backend.database import Base, create_async_database_engine
+from backend.models.qr_attendance import QRAttendanceSession
+
+
+@pytest.fixture
+async def async_engine(tmp_path):
+    engine = create_async_database_engine(f"sqlite:///{tmp_path / 'qr.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def _selects(engine) -> list:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+async def _add_session(db, **overrides) -> QRAttendanceSession:
+    now = datetime.utcnow()
+    values = dict(
+        session_id=str(uuid.uuid4()),
+        faculty_id="F1",
+        faculty_name="Prof X",
+        subject_code="CS101",
+        subject_name="Intro CS",
+        branch="CSE",
+        semester="3",
+        lecture_date=now,
+        lecture_start_time=now,
+        qr_code_data="{}",
+        qr_code_hash="h1",
+        qr_expires_at=now + timedelta(minutes=3),
+        center_latitude=12.0,
+        center_longitude=77.0,
+    )
+    values.update(overrides)
+    session = QRAttendanceSession(**values)
+    db.add(session)
+    await db.commit()
+    return session
+
+
+async def test_hot_session_is_selected_once_and_reloaded_after_invalidate(async_engine):
+    cache = QRSessionCache(local_ttl=60, shared_ttl=60)
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        row = await _add_session(db)
+        selects = _selects(async_engine)
+
+        for _ in range(20):
+            snapshot = await cache.get(db, row.session_id)
+        assert len(selects) == 1
+        assert snapshot.qr_code_hash == "h1" and snapshot.is_qr_valid()
+        assert snapshot.is_within_geofence(12.0001, 77.0001)
+        assert not snapshot.is_within_geofence(12.01, 77.0)
+
+        await db.execute(
+            update(QRAttendanceSession)
+            .where(QRAttendanceSession.id == row.id)
+            .values(qr_code_hash="h2", is_cancelled=True)
+        )
+        await db.commit()
+        assert (await cache.get(db, row.session_id)).qr_code_hash == "h1"
+
+        await cache.invalidate(row.session_id)
+        snapshot = await cache.get(db, row.session_id)
+        assert snapshot.qr_code_hash == "h2" and not snapshot.is_qr_valid()
+        assert len(selects) == 2
+        assert await cache.get(db, "missing") is None
+
+    metrics = cache.metrics()
+    assert metrics["local_hits"] == 20 and metrics["misses"] == 3
+    assert metrics["invalidations"] == 1
+
+
+async def test_shared_tier_serves_other_workers(async_engine, monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_CACHING", True)
+    worker_a, worker_b = QRSessionCache(local_ttl=60), QRSessionCache(local_ttl=60)
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        row = await _add_session(db)
+        selects = _selects(async_engine)
+
+        await worker_a.get(db, row.session_id)
+        snapshot = await worker_b.get(db, row.session_id)
+        assert len(selects) == 1 and worker_b.shared_hits == 1
+        assert isinstance(snapshot, CachedQRSession)
+        assert snapshot.qr_expires_at == row.qr_expires_at
+
+        await worker_a.invalidate(row.session_id)
+        worker_b.clear_local()
+        await worker_b.get(db, row.session_id)
+        assert len(selects) == 2
+
+
+async def test_local_tier_is_bounded_and_invalidations_leave_no_generations(async_engine):
+    cache = QRSessionCache(local_ttl=60, max_entries=2)
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        rows = [await _add_session(db) for _ in range(3)]
+        for row in rows:
+            await cache.get(db, row.session_id)
+        assert list(cache._local) == [rows[1].session_id, rows[2].session_id]
+
+        for row in rows:
+            await cache.invalidate(row.session_id)
+        assert cache._generations == {} and cache._loading == {}
+        assert cache.metrics()["local_entries"] == 0
+
+        # A load that overlaps an invalidate must not cache what it read
+        snapshot = await cache.get(db, rows[0].session_id)
+        await cache.invalidate(rows[0].session_id)
+        generation = cache._begin_load(rows[0].session_id)
+        await cache.invalidate(rows[0].session_id)
+        cache._put_local(snapshot, generation)
+        cache._end_load(rows[0].session_id)
+        assert rows[0].session_id not in cache._local and cache._generations == {}
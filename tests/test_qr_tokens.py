@@ -0,0 +1,78 @@
+"""
+Tests for rotating HMAC QR tokens
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core import qr_tokens
+from backend.core.config import settings
+from backend.core.qr_tokens import (
+    current_token,
+    display_key,
+    rotating_token,
+    time_step,
+    token_qr_data,
+    verify_display_key,
+    verify_rotating_token,
+    verify_scan_code,
+)
+from backend.routes import qr_attendance
+
+SESSION = SimpleNamespace(session_id="session-1", qr_code_hash="a" * 64)
+
+
+def test_tokens_rotate_each_step_and_verify_within_skew(monkeypatch):
+    monkeypatch.setattr(settings, "QR_TOKEN_STEP_SECONDS", 15)
+    monkeypatch.setattr(settings, "QR_TOKEN_SKEW_STEPS", 1)
+    now = 1_800_000_000.0
+
+    token, valid_until = current_token(SESSION, at=now)
+    assert len(token) == 64
+    assert valid_until.timestamp() == (time_step(now) + 1) * 15
+    assert current_token(SESSION, at=now + 15)[0] != token
+
+    assert verify_rotating_token(SESSION, token, at=now)
+    assert verify_rotating_token(SESSION, token, at=now + 15)  # one step of skew
+    assert not verify_rotating_token(SESSION, token, at=now + 30)
+    assert not verify_rotating_token(SESSION, token, at=now - 30)
+
+    # Regenerating the session (new qr_code_hash) revokes outstanding tokens
+    regenerated = SimpleNamespace(session_id="session-1", qr_code_hash="b" * 64)
+    assert not verify_rotating_token(regenerated, token, at=now)
+
+
+def test_static_hash_is_only_accepted_when_enabled(monkeypatch):
+    monkeypatch.setattr(qr_tokens.time, "time", lambda: 1_800_000_000.0)
+    token = rotating_token(SESSION.session_id, SESSION.qr_code_hash, time_step())
+    assert not verify_scan_code(SESSION, SESSION.qr_code_hash)  # off by default
+
+    monkeypatch.setattr(settings, "QR_ACCEPT_STATIC_HASH", True)
+    assert verify_scan_code(SESSION, SESSION.qr_code_hash)
+    assert verify_scan_code(SESSION, token)
+    assert not verify_scan_code(SESSION, "f" * 64)
+
+    monkeypatch.setattr(settings, "QR_ACCEPT_STATIC_HASH", False)
+    assert not verify_scan_code(SESSION, SESSION.qr_code_hash)
+    assert verify_scan_code(SESSION, token)
+
+
+def test_non_ascii_and_missing_codes_are_rejected_not_raised():
+    for code in ("é" * 64, "ff" * 31 + "ü✓", "", None):
+        assert not verify_scan_code(SESSION, code)
+        assert not verify_rotating_token(SESSION, code or "")
+
+
+async def test_display_key_gates_the_token_endpoint_and_never_enters_the_qr():
+    key = display_key(SESSION.session_id)
+    assert verify_display_key(SESSION.session_id, key)
+    assert not verify_display_key("session-2", key)
+    assert not verify_display_key(SESSION.session_id, None)
+    assert key not in token_qr_data(SESSION, *current_token(SESSION))
+
+    for bad_key in (None, display_key("session-2")):
+        with pytest.raises(HTTPException) as excinfo:
+            await qr_attendance.get_rotating_qr_token(SESSION.session_id, bad_key, db=None)
+        assert excinfo.value.status_code == 403
@@ -0,0 +1,94 @@
+"""
+Tests for read-replica routing, using two SQLite files as primary and replica
+"""
+
+from datetime import timedelta
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.core import read_replicas
+from backend.core.read_replicas import ReplicaRouter, get_read_db
+from backend.database import create_database_engine
+from backend.migrations import run_migrations
+from backend.models.replication import ReplicationHeartbeat
+from backend.models.student import Student
+
+
+def _replicate_heartbeat(primary, replica, age=timedelta(0)):
+    """Stand-in for replication: copy the primary's heartbeat, aged by `age`"""
+    with primary.connect() as conn:
+        beat_at = conn.execute(select(ReplicationHeartbeat.beat_at)).scalar_one()
+    with replica.begin() as conn:
+        conn.execute(ReplicationHeartbeat.__table__.delete())
+        conn.execute(insert(ReplicationHeartbeat).values(id=1, beat_at=beat_at - age))
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = create_database_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    run_migrations(primary)
+    router = ReplicaRouter(primary, [f"sqlite:///{tmp_path / 'replica.db'}"], max_lag_seconds=5)
+    replica = router.replicas[0].engine
+    run_migrations(replica)
+    yield primary, router
+    primary.dispose()
+    replica.dispose()
+
+
+def test_router_uses_replica_only_within_lag_tolerance(databases):
+    primary, router = databases
+    replica = router.replicas[0]
+    router.write_heartbeat()
+
+    # Nothing replicated yet
+    assert router.pick_replica() is None
+    assert replica.error == "no heartbeat replicated yet"
+
+    _replicate_heartbeat(primary, replica.engine)
+    router.refresh(force=True)
+    assert router.pick_replica() is replica
+    assert replica.lag_seconds < 5
+
+    _replicate_heartbeat(primary, replica.engine, age=timedelta(seconds=30))
+    router.refresh(force=True)
+    assert router.pick_replica() is None
+    assert router.status()["primary_fallbacks"] == 2 and router.status()["replica_reads"] == 1
+
+
+def test_unreachable_replica_falls_back_to_primary(tmp_path):
+    primary = create_database_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    router = ReplicaRouter(primary, [f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"])
+    try:
+        assert router.pick_replica() is None
+        assert router.replicas[0].healthy is False and router.replicas[0].error
+    finally:
+        primary.dispose()
+
+
+def test_read_dependency_honours_strong_consistency(databases, monkeypatch):
+    primary, router = databases
+    router.write_heartbeat()
+    _replicate_heartbeat(primary, router.replicas[0].engine)
+    with router.replicas[0].engine.begin() as conn:
+        conn.execute(
+            insert(Student).values(name="Replica", roll_no="R1", department="CSE")
+        )
+    monkeypatch.setattr(read_replicas, "read_router", router)
+    monkeypatch.setattr(read_replicas, "SessionLocal", sessionmaker(bind=primary))
+
+    app = FastAPI()
+
+    @app.get("/students/count")
+    def count_students(db: Session = Depends(get_read_db)):
+        return db.scalar(select(func.count(Student.id)))
+
+    client = TestClient(app)
+    replica_read = client.get("/students/count")
+    primary_read = client.get("/students/count", headers={"X-Consistency": "strong"})
+
+    assert (replica_read.json(), replica_read.headers["X-Read-Source"]) == (1, "replica")
+    assert (primary_read.json(), primary_read.headers["X-Read-Source"]) == (0, "primary")
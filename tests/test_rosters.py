@@ -0,0 +1,118 @@
+"""
+Tests for class rosters, the absent-list anti-join and absentee materialization
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from backend.core.rosters import (
+    absent_students_stmt,
+    materialize_absentees_stmt,
+    parse_roster_csv,
+    roster_size_stmt,
+    roster_upsert,
+)
+from backend.database import Base, create_database_engine
+from backend.models.qr_attendance import QRAttendanceRecord, QRAttendanceSession
+
+
+def test_parse_roster_csv():
+    rows, errors = parse_roster_csv(
+        "Roll_Number, Student_Name ,student_email\nR1,Asha,a@x.edu\nR2,,\nR1,Dup,\nR3,Ravi,\n"
+    )
+    assert rows == [
+        {"roll_number": "R1", "student_id": "R1", "student_name": "Asha", "student_email": "a@x.edu"},
+        {"roll_number": "R3", "student_id": "R3", "student_name": "Ravi", "student_email": None},
+    ]
+    assert errors == [
+        "Line 3: roll_number and student_name are required",
+        "Line 4: duplicate roll_number R1",
+    ]
+    assert parse_roster_csv("name\nAsha\n")[1] == ["Missing column(s): roll_number, student_name"]
+
+
+def test_absentees_are_one_anti_join_and_one_insert(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'roster.db'}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+
+    with engine.begin() as conn:
+        for section in ("A", "B"):
+            rows = [
+                {
+                    "roll_number": f"{section}{n:03d}",
+                    "student_id": f"S{section}{n:03d}",
+                    "student_name": f"Student {section}{n}",
+                    "student_email": None,
+                }
+                for n in range(300)
+            ]
+            stmt, chunks = roster_upsert(conn, "CSE", "3", section, rows)
+            for chunk in chunks:
+                conn.execute(stmt, chunk)
+
+    with Session(engine, expire_on_commit=False) as db:
+        session = QRAttendanceSession(
+            session_id="session-1",
+            faculty_id="F1",
+            faculty_name="Prof X",
+            subject_code="CS101",
+            subject_name="Intro CS",
+            branch="CSE",
+            semester="3",
+            section="A",
+            lecture_date=now,
+            lecture_start_time=now,
+            qr_code_data="{}",
+            qr_code_hash="h" * 64,
+            qr_expires_at=now + timedelta(minutes=3),
+            center_latitude=12.0,
+            center_longitude=77.0,
+        )
+        db.add(session)
+        db.flush()
+        for n in range(10):
+            db.add(
+                QRAttendanceRecord(
+                    session_id=session.id,
+                    student_id=f"SA{n:03d}",
+                    roll_number=f"A{n:03d}",
+                    student_name=f"Student A{n}",
+                    branch="CSE",
+                    semester="3",
+                    student_latitude=12.0,
+                    student_longitude=77.0,
+                    distance_from_center=0.0,
+                )
+            )
+        db.commit()
+
+        assert db.scalar(roster_size_stmt("CSE", 3, "A")) == 300
+        assert db.scalar(roster_size_stmt("CSE", 3, None)) == 600
+
+        statements = []
+        event.listen(
+            engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+        absent = db.scalars(absent_students_stmt(session)).all()
+        assert len(statements) == 1
+        assert len(absent) == 290 and absent[0].roll_number == "A010"
+
+        statements.clear()
+        inserted = db.execute(materialize_absentees_stmt(db.bind, session, now)).rowcount
+        db.commit()
+        assert inserted == 290 and len(statements) == 1
+
+        # Materialized absentees do not count as present, and closing again adds nothing
+        assert len(db.scalars(absent_students_stmt(session)).all()) == 290
+        assert db.execute(materialize_absentees_stmt(db.bind, session, now)).rowcount == 0
+        statuses = dict(
+            db.execute(
+                select(QRAttendanceRecord.attendance_status, func.count())
+                .group_by(QRAttendanceRecord.attendance_status)
+            ).all()
+        )
+        assert statuses == {"absent": 290, "present": 10}
+    engine.dispose()
@@ -0,0 +1,201 @@
+"""
+Tests for duplicate-scan rejection on the QR scan path
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.device_registry import DeviceRegistry
+from backend.core.qr_session_cache import QRSessionCache
+from backend.core.scan_dedup import ScanDeduplicator
+from backend.core.write_behind import CounterBuffer, WriteBehindBuffer
+from backend.database import Base, create_async_database_engine, create_database_engine
+from backend.models.qr_attendance import (
+    DeviceFingerprint,
+    QRAttendanceLog,
+    QRAttendanceRecord,
+    QRAttendanceSession,
+)
+from backend.routes import qr_attendance
+from backend.schemas.qr_attendance import QRScanRequest
+
+SESSION_ID = "session-0000000001"
+REQUEST = SimpleNamespace(client=None)
+
+
+def test_claims_until_released_or_marked():
+    dedup = ScanDeduplicator(max_sessions=2)
+    assert dedup.claim(1, "S1") and not dedup.claim(1, "S1")
+    dedup.release(1, "S1")
+    assert dedup.claim(1, "S1")
+    dedup.mark(1, "S1")
+    dedup.release(1, "S1")
+    assert not dedup.claim(1, "S1") and dedup.claim(1, "S2")
+    assert dedup.is_marked(1, "S1") and not dedup.is_marked(1, "S2")
+
+    dedup.claim(2, "S1")
+    dedup.claim(3, "S1")  # evicts session 1, the least recently used
+    assert dedup.claim(1, "S1")
+    assert dedup.metrics()["sessions"] == 2
+
+
+@pytest.fixture
+async def scan_env(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'scan.db'}"
+    engine, sync_engine = create_async_database_engine(url), create_database_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.utcnow()
+    async with AsyncSession(engine) as db:
+        db.add(
+            QRAttendanceSession(
+                session_id=SESSION_ID,
+                faculty_id="F1",
+                faculty_name="Prof X",
+                subject_code="CS101",
+                subject_name="Intro CS",
+                branch="CSE",
+                semester="3",
+                lecture_date=now,
+                lecture_start_time=now,
+                qr_code_data="{}",
+                qr_code_hash="h" * 64,
+                qr_expires_at=now + timedelta(minutes=3),
+                center_latitude=12.0,
+                center_longitude=77.0,
+            )
+        )
+        await db.commit()
+
+    monkeypatch.setattr(settings, "QR_ACCEPT_STATIC_HASH", True)  # scans send the static hash
+    monkeypatch.setattr(qr_attendance, "qr_session_cache", QRSessionCache(local_ttl=60))
+    monkeypatch.setattr(qr_attendance, "scan_dedup", ScanDeduplicator())
+    monkeypatch.setattr(qr_attendance, "device_registry", DeviceRegistry(bind=sync_engine))
+    monkeypatch.setattr(
+        qr_attendance,
+        "qr_session_counters",
+        CounterBuffer(QRAttendanceSession, ("total_students_present", "total_late_entries")),
+    )
+    scan_logs = WriteBehindBuffer(QRAttendanceLog, bind=sync_engine)
+    monkeypatch.setattr(qr_attendance, "scan_log_buffer", scan_logs)
+    yield engine
+    await engine.dispose()
+    sync_engine.dispose()
+
+
+async def _scan(engine, student_id="S1", latitude=12.0, code="h" * 64):
+    scan_request = QRScanRequest(
+        session_id=SESSION_ID,
+        qr_code_hash=code,
+        student_id=student_id,
+        roll_number=f"R{student_id}",
+        student_name=f"Name {student_id}",
+        branch="CSE",
+        semester=3,
+        location={"latitude": latitude, "longitude": 77.0, "accuracy": 5},
+        device={"device_id": f"device-{student_id}-0001"},
+        scan_timestamp=datetime.utcnow(),
+    )
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        return await qr_attendance.scan_qr_code(scan_request, REQUEST, db)
+
+
+async def _records(engine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count(QRAttendanceRecord.id)))).scalar()
+
+
+async def test_simultaneous_scans_from_one_student_mark_once(scan_env):
+    await _scan(scan_env, student_id="warmup")  # loads the session snapshot
+
+    inserts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO qr_attendance_records"):
+            inserts.append(statement)
+
+    event.listen(scan_env.sync_engine, "before_cursor_execute", record)
+    responses = await asyncio.gather(*(_scan(scan_env) for _ in range(300)))
+
+    assert sum(r.attendance_marked for r in responses) == 1
+    # Taps that raced the first scan are told to retry, later ones that it is marked
+    rejected = {tuple(r.errors) for r in responses if not r.attendance_marked}
+    assert rejected <= {("Scan in progress",), ("Duplicate attendance attempt",)}
+    retry = await _scan(scan_env)
+    assert retry.errors == ["Duplicate attendance attempt"]
+    assert len(inserts) == 1
+    assert await _records(scan_env) == 2
+    assert qr_attendance.qr_session_counters.pending(1)["total_students_present"] == 2
+    assert qr_attendance.device_registry.flush() == 2
+
+
+async def test_tap_during_a_scan_that_then_fails_is_told_to_retry(scan_env):
+    await _scan(scan_env, student_id="warmup")  # loads the session snapshot
+    assert qr_attendance.scan_dedup.claim(1, "S1")  # first scan still in flight
+
+    response = await _scan(scan_env)
+    assert not response.attendance_marked and response.errors == ["Scan in progress"]
+
+    qr_attendance.scan_dedup.release(1, "S1")  # ...and it failed validation
+    assert (await _scan(scan_env)).attendance_marked
+
+
+async def test_unique_index_catches_duplicates_from_other_workers(scan_env, monkeypatch):
+    assert (await _scan(scan_env, latitude=12.01)).attendance_marked is False  # outside geofence
+    assert (await _scan(scan_env)).attendance_marked  # failed scan released its claim
+
+    # A fresh process has no memory of the first scan
+    monkeypatch.setattr(qr_attendance, "scan_dedup", ScanDeduplicator())
+    response = await _scan(scan_env)
+    assert not response.attendance_marked
+    assert response.errors == ["Duplicate attendance attempt"]
+    assert not qr_attendance.scan_dedup.claim(1, "S1")
+    assert await _records(scan_env) == 1
+
+
+async def test_non_ascii_code_is_a_hash_mismatch(scan_env):
+    response = await _scan(scan_env, code="é" * 64)
+    assert not response.attendance_marked
+    assert response.errors == ["QR code hash mismatch - possible tampering detected"]
+
+
+async def test_missing_or_dummy_code_needs_a_token_when_static_hashes_are_off(
+    scan_env, monkeypatch
+):
+    monkeypatch.setattr(settings, "QR_ACCEPT_STATIC_HASH", False)
+    for student_id, code in (("S1", None), ("S2", "0" * 64), ("S3", "h" * 64)):
+        response = await _scan(scan_env, student_id=student_id, code=code)
+        assert not response.attendance_marked
+        assert response.errors == ["QR code hash mismatch - possible tampering detected"]
+
+    monkeypatch.setattr(settings, "QR_ACCEPT_STATIC_HASH", True)
+    assert (await _scan(scan_env, student_id="S1", code=None)).attendance_marked
+    assert (await _scan(scan_env, student_id="S2", code="0" * 64)).attendance_marked
+
+
+async def test_registration_rolled_back_with_a_duplicate_is_not_cached(scan_env, monkeypatch):
+    assert (await _scan(scan_env, student_id="S9")).attendance_marked
+    async with scan_env.begin() as conn:
+        await conn.execute(DeviceFingerprint.__table__.delete())
+
+    # Another worker's memory: the record exists but this process has not seen it
+    monkeypatch.setattr(qr_attendance, "scan_dedup", ScanDeduplicator())
+    registry = qr_attendance.device_registry
+    registry.invalidate("device-S9-0001")
+    response = await _scan(scan_env, student_id="S9")
+
+    assert response.errors == ["Duplicate attendance attempt"]
+    assert registry._cached("device-S9-0001") is None
+    async with scan_env.connect() as conn:
+        devices = await conn.execute(select(func.count(DeviceFingerprint.id)))
+        assert devices.scalar() == 0
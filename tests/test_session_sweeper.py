@@ -0,0 +1,73 @@
+"""
+Tests for the QR session expiry sweeper
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.core.event_bus import EventType, event_bus
+from backend.core.session_sweeper import SessionSweeper
+from backend.database import Base, create_database_engine
+from backend.models.qr_attendance import QRAttendanceSession, QRSubjectSessionsHeld
+
+
+async def test_sweeper_expires_overdue_sessions_and_announces_them(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'sweep.db'}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+
+    with Session(engine) as db:
+        for pk, minutes, active in ((1, -10, True), (2, -1, True), (3, 5, True), (4, -10, False)):
+            db.add(
+                QRAttendanceSession(
+                    id=pk,
+                    session_id=f"session-{pk}",
+                    faculty_id="F1",
+                    faculty_name="Prof X",
+                    subject_code="CS101",
+                    subject_name="Intro CS",
+                    branch="CSE",
+                    semester="3",
+                    lecture_date=now,
+                    lecture_start_time=now,
+                    qr_code_data="{}",
+                    qr_code_hash="h" * 64,
+                    qr_expires_at=now + timedelta(minutes=minutes),
+                    is_active=active,
+                    center_latitude=12.0,
+                    center_longitude=77.0,
+                )
+            )
+        db.commit()
+
+    closed_events = []
+
+    def on_closed(event):
+        closed_events.append(event.data["session_id"])
+
+    event_bus.subscribe(EventType.QR_SESSION_CLOSED, on_closed)
+    try:
+        sweeper = SessionSweeper(batch_size=1, bind=engine)
+        assert await sweeper.run_async() == 1  # oldest first
+        assert await sweeper.run_async() == 1
+        assert await sweeper.run_async() == 0
+    finally:
+        event_bus.get_subscribers(EventType.QR_SESSION_CLOSED).remove(on_closed)
+
+    assert closed_events == ["session-1", "session-2"]
+    with Session(engine) as db:
+        states = {
+            s.id: (s.is_active, s.is_expired, s.stats_finalized_at is not None)
+            for s in db.scalars(select(QRAttendanceSession))
+        }
+        assert states == {
+            1: (False, True, True),
+            2: (False, True, True),
+            3: (True, False, False),
+            4: (False, False, False),  # closed before the sweeper; left to the stats job
+        }
+        assert db.scalar(select(QRSubjectSessionsHeld.held)) == 2
+    assert sweeper.metrics()["sessions_expired"] == 2
+    engine.dispose()
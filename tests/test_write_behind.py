@@ -0,0 +1,117 @@
+"""
+Tests for the write-behind audit log buffer
+"""
+
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.core.write_behind import CounterBuffer, WriteBehindBuffer, scan_log_row
+from backend.models.qr_attendance import QRAttendanceLog, QRAttendanceSession
+
+LOCATION = SimpleNamespace(latitude=12.0, longitude=77.0)
+
+
+def _logged(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count(QRAttendanceLog.id))).scalar()
+
+
+def test_flushes_in_bulk_at_size_threshold(engine, count_queries):
+    buffer = WriteBehindBuffer(QRAttendanceLog, capacity=100, flush_size=5, bind=engine)
+
+    with count_queries() as counter:
+        for i in range(4):
+            buffer.enqueue(scan_log_row(1, f"S{i}", "denied", "Outside geofence", LOCATION))
+        assert _logged(engine) == 0 and buffer.depth == 4
+
+        buffer.enqueue(scan_log_row(1, "S4", "success", "Attendance marked", LOCATION))
+
+    assert _logged(engine) == 5 and buffer.depth == 0
+    inserts = [s for s in counter.statements if s.startswith("INSERT")]
+    assert len(inserts) == 1
+    metrics = buffer.metrics()
+    assert metrics["flushes"] == 1 and metrics["flushed"] == 5 and metrics["dropped"] == 0
+
+
+async def test_size_triggered_flush_task_is_held_until_done(engine):
+    buffer = WriteBehindBuffer(QRAttendanceLog, capacity=100, flush_size=2, bind=engine)
+    for i in range(2):
+        buffer.enqueue(scan_log_row(1, f"S{i}", "success", "Attendance marked", LOCATION))
+
+    (task,) = buffer._pending_flushes
+    assert await task == 2
+    assert not buffer._pending_flushes and _logged(engine) == 2
+
+
+def test_overflow_drops_oldest_and_failed_flush_keeps_rows(engine):
+    buffer = WriteBehindBuffer(QRAttendanceLog, capacity=3, flush_size=100, bind=engine)
+    for i in range(5):
+        buffer.enqueue(scan_log_row(1, f"S{i}", "failed", "QR expired", LOCATION))
+    assert buffer.depth == 3 and buffer.dropped == 2
+
+    QRAttendanceLog.__table__.drop(engine)
+    assert buffer.flush() == 0
+    assert buffer.depth == 3 and buffer.metrics()["flush_failures"] == 1
+
+    QRAttendanceLog.__table__.create(engine)
+    assert buffer.flush() == 3
+    with engine.connect() as conn:
+        students = conn.execute(select(QRAttendanceLog.student_id)).scalars().all()
+    assert students == ["S2", "S3", "S4"]
+
+
+def _qr_session(db, session_id: str) -> QRAttendanceSession:
+    now = datetime.utcnow()
+    session = QRAttendanceSession(
+        session_id=session_id,
+        faculty_id="F1",
+        faculty_name="Prof X",
+        subject_code="CS101",
+        subject_name="Intro CS",
+        branch="CSE",
+        semester="3",
+        lecture_date=now,
+        lecture_start_time=now,
+        qr_code_data="{}",
+        qr_code_hash="h",
+        qr_expires_at=now + timedelta(minutes=3),
+        center_latitude=12.0,
+        center_longitude=77.0,
+    )
+    db.add(session)
+    db.commit()
+    return session
+
+
+def test_concurrent_counter_increments_are_not_lost(engine, db_session, count_queries):
+    first, second = _qr_session(db_session, "a"), _qr_session(db_session, "b")
+    counters = CounterBuffer(
+        QRAttendanceSession, ("total_students_present", "total_late_entries"), bind=engine
+    )
+
+    def scan(i):
+        counters.add(first.id, total_students_present=1, total_late_entries=i % 2)
+        counters.add(second.id, total_students_present=1)
+
+    threads = [threading.Thread(target=scan, args=(i,)) for i in range(200)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counters.pending(first.id) == {"total_students_present": 200, "total_late_entries": 100}
+
+    with count_queries() as counter:
+        assert counters.flush() == 2
+    assert [s.split()[0] for s in counter.statements] == ["UPDATE"]
+    assert counters.pending(first.id) == {"total_students_present": 0, "total_late_entries": 0}
+
+    db_session.expire_all()
+    assert (first.total_students_present, first.total_late_entries) == (200, 100)
+    assert (second.total_students_present, second.total_late_entries) == (200, 0)
+
+    with pytest.raises(ValueError):
+        counters.add(first.id, total_students_absent=1)